@@ -0,0 +1,142 @@
+# ruff: noqa: D100, D103
+import moocore
+import numpy as np
+import pytest
+
+import mooplot
+from conftest import make_eaf, record_size
+
+
+@pytest.mark.parametrize("n_points", [100, 1000, 5000])
+@pytest.mark.parametrize("type", ["fill", "lines", "points"])
+def test_eaf_points_per_set(benchmark, n_points, type):
+    eaf = make_eaf(n_points, n_sets=10, percentiles=[0, 25, 50, 75, 100])
+    fig = benchmark(mooplot.plot_eaf, eaf, type=type)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_sets", [5, 20, 50])
+def test_eaf_number_of_sets(benchmark, n_sets):
+    eaf = make_eaf(200, n_sets=n_sets, percentiles=[0, 50, 100])
+    fig = benchmark(mooplot.plot_eaf, eaf)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_percentiles", [1, 5, 21])
+@pytest.mark.parametrize("eaf_data", [False, True])
+def test_eaf_percentiles(benchmark, n_percentiles, eaf_data):
+    # All levels are computed, so that plot_eaf has to select the requested
+    # percentiles from the full EAF.
+    eaf = make_eaf(500, n_sets=20)
+    percentiles = np.unique(eaf[:, -1])
+    idx = np.linspace(0, len(percentiles) - 1, n_percentiles).round()
+    percentiles = percentiles[idx.astype(int)].tolist()
+    if eaf_data:
+        eaf = mooplot.EAFData(eaf)
+    fig = benchmark(mooplot.plot_eaf, eaf, percentiles=percentiles)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_algorithms", [1, 2, 8])
+@pytest.mark.parametrize("type", ["fill", "lines"])
+def test_eaf_dict_interface(benchmark, n_algorithms, type):
+    eafs = {
+        f"Alg {i}": make_eaf(500, 10, percentiles=[0, 50, 100], seed=i)
+        for i in range(n_algorithms)
+    }
+    fig = benchmark(mooplot.plot_eaf, eafs, type=type)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize(
+    "name", ["input1.dat", "wrots_l10w100_dat.xz", "wrots_l100w10_dat.xz"]
+)
+def test_eaf_datasets(benchmark, dataset, name):
+    x = dataset(name)
+    eaf = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 25, 50, 75, 100])
+    fig = benchmark(mooplot.plot_eaf, eaf)
+    record_size(benchmark, fig)
+
+
+def test_eaf_wrots_comparison(benchmark, dataset):
+    eafs = {}
+    for name in ["wrots_l10w100_dat.xz", "wrots_l100w10_dat.xz"]:
+        x = dataset(name)
+        eafs[name] = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 50, 100])
+    fig = benchmark(mooplot.plot_eaf, eafs, type=["fill", "lines"])
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("summarize", [None, "rays"])
+def test_eaf_summarize(benchmark, summarize):
+    eaf = make_eaf(5000, 20, percentiles=[0, 25, 50, 75, 100])
+    fig = benchmark(mooplot.plot_eaf, eaf, type="lines", summarize=summarize)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("coord_dtype", [None, "float32"])
+def test_eaf_coord_dtype(benchmark, coord_dtype):
+    eaf = make_eaf(5000, 20, percentiles=[0, 25, 50, 75, 100])
+    fig = benchmark(
+        mooplot.plot_eaf, eaf, type="lines", coord_dtype=coord_dtype
+    )
+    benchmark.extra_info["trace_bytes"] = sum(
+        t.x.nbytes + t.y.nbytes for t in fig.data
+    )
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("normalize", [None, "minmax", "ideal-nadir"])
+def test_eaf_normalize(benchmark, normalize):
+    # Two algorithms whose second objective is 1000 times larger.
+    eaf = make_eaf(5000, 20, percentiles=[0, 25, 50, 75, 100])
+    eaf[:, 1] *= 1000
+    eafs = {"A": eaf, "B": eaf.copy()}
+    fig = benchmark(mooplot.plot_eaf, eafs, type="lines", normalize=normalize)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("log", [False, True])
+def test_eaf_log_axes(benchmark, log):
+    eaf = make_eaf(5000, 20, percentiles=[0, 25, 50, 75, 100])
+    fig = benchmark(mooplot.plot_eaf, eaf, log_x=log, log_y=log)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("report", [False, True])
+def test_eaf_report_60_figures(benchmark, report):
+    figures = [
+        mooplot.plot_eaf(
+            make_eaf(1000, 10, percentiles=[0, 25, 50, 75, 100], seed=i),
+            type="fill" if i % 2 else "lines",
+        )
+        for i in range(60)
+    ]
+    if report:
+        page = benchmark(mooplot.report, {"EAF": figures})
+    else:
+        page = benchmark(
+            lambda: "".join(f.to_html(include_plotlyjs=True) for f in figures)
+        )
+    benchmark.extra_info["html_bytes"] = len(page)
+
+
+@pytest.mark.parametrize("n_points", [1000, 5000])
+def test_eaf_export_json(benchmark, n_points):
+    fig = mooplot.plot_eaf(make_eaf(n_points, 20, percentiles=[0, 50, 100]))
+    payload = benchmark(fig.to_json)
+    benchmark.extra_info["json_bytes"] = len(payload)
+
+
+@pytest.mark.parametrize("n_points", [1000, 5000])
+@pytest.mark.parametrize("batch", [False, True])
+def test_eaf_matplotlib_png(benchmark, tmp_path, n_points, batch):
+    from mooplot.matplotlib import BatchRenderer, plot_eaf
+
+    eaf = make_eaf(n_points, 20, percentiles=[0, 25, 50, 75, 100])
+    fname = tmp_path / "eaf.png"
+    if batch:
+        renderer = BatchRenderer()
+        benchmark(renderer.plot_eaf, eaf, fname=fname)
+    else:
+        benchmark(lambda: plot_eaf(eaf).savefig(fname))
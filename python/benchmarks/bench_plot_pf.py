@@ -0,0 +1,136 @@
+# ruff: noqa: D100, D103
+import numpy as np
+import pytest
+
+import mooplot
+from conftest import make_sets, record_size
+
+
+@pytest.mark.parametrize("n_points", [100, 1000, 10000])
+@pytest.mark.parametrize("type", ["points", "lines"])
+def test_pf_points_per_set(benchmark, n_points, type):
+    data = make_sets(n_points, n_sets=5)
+    fig = benchmark(mooplot.plot_pf, data, type=type)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_sets", [1, 10, 100])
+@pytest.mark.parametrize("type", ["points", "lines"])
+def test_pf_number_of_sets(benchmark, n_sets, type):
+    data = make_sets(200, n_sets=n_sets)
+    fig = benchmark(mooplot.plot_pf, data, type=type)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("filter_dominated", [True, False])
+def test_pf_filter_dominated(benchmark, filter_dominated):
+    data = make_sets(2000, n_sets=20)
+    fig = benchmark(
+        mooplot.plot_pf, data, type="lines", filter_dominated=filter_dominated
+    )
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("type", ["points", "surface", "cube"])
+@pytest.mark.parametrize("n_points", [50, 500])
+def test_pf_3d(benchmark, type, n_points):
+    data = make_sets(n_points, n_sets=3, dim=3)
+    fig = benchmark(mooplot.plot_pf, data, type=type)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize(
+    "name", ["input1.dat", "wrots_l10w100_dat.xz", "wrots_l100w10_dat.xz"]
+)
+@pytest.mark.parametrize("type", ["points", "lines"])
+def test_pf_datasets(benchmark, dataset, name, type):
+    fig = benchmark(mooplot.plot_pf, dataset(name), type=type)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_points", [10000, 100000])
+@pytest.mark.parametrize("type", ["points", "density"])
+def test_pf_all_points(benchmark, n_points, type):
+    # All evaluated solutions instead of fronts.
+    data = make_sets(n_points, n_sets=10)
+    fig = benchmark(mooplot.plot_pf, data, type=type, filter_dominated=False)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("coord_dtype", [None, "float32"])
+def test_pf_coord_dtype(benchmark, coord_dtype):
+    # One million vertices.
+    data = make_sets(100000, n_sets=10)
+    fig = benchmark(
+        mooplot.plot_pf,
+        data,
+        type="points",
+        filter_dominated=False,
+        coord_dtype=coord_dtype,
+    )
+    benchmark.extra_info["trace_bytes"] = sum(
+        t.x.nbytes + t.y.nbytes for t in fig.data
+    )
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_points", [1000, 10000])
+def test_pf_export_json(benchmark, n_points):
+    fig = mooplot.plot_pf(make_sets(n_points, n_sets=10), type="lines")
+    payload = benchmark(fig.to_json)
+    benchmark.extra_info["json_bytes"] = len(payload)
+
+
+@pytest.mark.parametrize("dtype", [None, "float32"])
+def test_front_set_many_runs(benchmark, dtype):
+    # Archive of 10000 runs with 20 points each.
+    data = make_sets(20, n_sets=10000)
+
+    def _():
+        fronts = mooplot.FrontSet(data, dtype=dtype)
+        return fronts.filter_dominated()
+
+    fronts = benchmark(_)
+    benchmark.extra_info["nbytes"] = fronts.nbytes
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2, 4, -1])
+def test_filter_dominated_n_jobs(benchmark, n_jobs):
+    # Archive of 2000 runs with 500 points each.
+    fronts = mooplot.FrontSet(make_sets(500, n_sets=2000))
+    # The first call starts the processes.
+    fronts.filter_dominated(n_jobs=n_jobs)
+    benchmark(fronts.filter_dominated, n_jobs=n_jobs)
+
+
+@pytest.mark.parametrize("by", ["hv", "igd+"])
+def test_pf_select_sets(benchmark, by):
+    # Median of 2000 runs with 100 points each.
+    data = make_sets(100, n_sets=2000)
+    fig = benchmark(
+        mooplot.plot_pf, data, type="lines", select_sets="median", by=by
+    )
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_points", [1000, 10000])
+def test_pf_reference(benchmark, n_points):
+    # Hover text of 10 sets against a reference front of 1000 points.
+    t = np.linspace(0, 1, 1000)
+    reference = np.column_stack([t, 1 - np.sqrt(t)])
+    data = make_sets(n_points, n_sets=10)
+    fig = benchmark(mooplot.plot_pf, data, type="points", reference=reference)
+    record_size(benchmark, fig)
+
+
+@pytest.mark.parametrize("n_generations", [10, 100])
+def test_pf_animation(benchmark, n_generations):
+    # 10 runs of 2000 evaluations spread over the generations.
+    data = make_sets(2000, n_sets=10)
+    rng = np.random.default_rng(42)
+    generation = rng.integers(0, n_generations, size=len(data))
+    data = np.column_stack([data[:, :-1], generation, data[:, -1]])
+    fig = benchmark(
+        mooplot.plot_pf_animation, data, frame_column=2, type="lines"
+    )
+    record_size(benchmark, fig)
@@ -0,0 +1,51 @@
+# ruff: noqa: D100, D103
+import moocore
+import numpy as np
+import pytest
+
+
+def make_sets(n_points, n_sets, dim=2, seed=42):
+    """Return ``n_sets`` synthetic fronts in :func:`moocore.read_datasets` format.
+
+    Half of each set lies on a nondominated simplex, the other half is
+    uniformly random and mostly dominated, so that filtering has some work
+    to do.
+
+    """
+    rng = np.random.default_rng(seed)
+    n_front = max(n_points // 2, 1)
+    n_random = n_points - n_front
+    sets = []
+    for s in range(n_sets):
+        front = moocore.generate_ndset(n_front, dim, "simplex", seed=rng)
+        front = front * (1.0 + 0.05 * s)
+        rest = 0.5 + rng.random((n_random, dim))
+        points = np.vstack([front, rest])
+        sets.append(np.hstack([points, np.full((n_points, 1), s + 1.0)]))
+    return np.vstack(sets)
+
+
+def make_eaf(n_points, n_sets, percentiles=None, seed=42):
+    """Return the EAF of synthetic fronts, optionally for given percentiles."""
+    data = make_sets(n_points, n_sets, seed=seed)
+    kwargs = {} if percentiles is None else {"percentiles": percentiles}
+    return moocore.eaf(data[:, :-1], data[:, -1], **kwargs)
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    """Return a cached :func:`moocore.get_dataset` loader."""
+    cache = {}
+
+    def _(name):
+        if name not in cache:
+            cache[name] = moocore.get_dataset(name)
+        return cache[name]
+
+    return _
+
+
+def record_size(benchmark, fig):
+    """Store the exported JSON size of ``fig`` in the benchmark results."""
+    benchmark.extra_info["n_traces"] = len(fig.data)
+    benchmark.extra_info["json_bytes"] = len(fig.to_json())
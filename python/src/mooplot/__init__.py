@@ -1,12 +1,75 @@
 # ruff: noqa: D104
-from ._plot import plot_pf, plot_eaf
+from __future__ import annotations
+
+import importlib
+from importlib.metadata import version as _metadata_version
+from typing import TYPE_CHECKING
 
 __all__ = [
     "plot_pf",
     "plot_eaf",
+    "plot_eaf_async",
+    "plot_pf_animation",
+    "PlotStyle",
+    "EAFData",
+    "FrontSet",
+    "EAFDiff",
+    "plot_eafdiff",
+    "choose_eafdiffplot",
+    "StaircasePyramid",
+    "handle_relayout",
+    "FigureCache",
+    "report",
 ]
 
-from importlib.metadata import version as _metadata_version
+# Submodule that defines each public name. Submodules are imported when one
+# of their names is first used, thus importing mooplot, e.g., to run the
+# command-line interface, does not import plotly or pandas.
+_exports = {
+    "plot_pf": "_plot",
+    "plot_eaf": "_plot",
+    "plot_eaf_async": "_async",
+    "plot_pf_animation": "_animation",
+    "PlotStyle": "_style",
+    "EAFData": "_data",
+    "FrontSet": "_data",
+    "EAFDiff": "_eafdiff",
+    "plot_eafdiff": "_eafdiff",
+    "choose_eafdiffplot": "_eafdiff",
+    "StaircasePyramid": "_pyramid",
+    "handle_relayout": "_pyramid",
+    "FigureCache": "_cache",
+    "report": "_report",
+}
+
+_submodules = ("colour", "matplotlib")
+
+
+def __getattr__(name: str):
+    if name in _exports:
+        module = importlib.import_module(f".{_exports[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *__all__, *_submodules])
+
+
+if TYPE_CHECKING:
+    from ._plot import plot_pf, plot_eaf
+    from ._async import plot_eaf_async
+    from ._animation import plot_pf_animation
+    from ._style import PlotStyle
+    from ._data import EAFData, FrontSet
+    from ._eafdiff import EAFDiff, plot_eafdiff, choose_eafdiffplot
+    from ._pyramid import StaircasePyramid, handle_relayout
+    from ._cache import FigureCache
+    from ._report import report
 
 __version__ = _metadata_version(__package__ or __name__)
 # Remove symbols imported for internal use
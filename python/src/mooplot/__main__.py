@@ -0,0 +1,4 @@
+# ruff: noqa: D100
+from ._cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from numpy.typing import ArrayLike  # For type hints
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from moocore import is_nondominated
+
+from . import colour
+from ._data import FrontSet
+from ._plot import (
+    _get_2d_line_traces,
+    _get_extremes,
+    _sort_points,
+    add_extremes,
+)
+from ._style import _make_figure_unvalidated
+from ._utils import _get_axis_ranges, _parse_maximise, _parse_plot_type
+
+
+def plot_pf_animation(
+    data: ArrayLike,
+    frame_column: int,
+    type: str = "points",
+    maximise: bool | list[bool] = False,
+    reference_point: ArrayLike | None = None,
+    extremes_margin: float = 0.05,
+    keyframe_interval: int | None = 50,
+    frame_duration: int = 100,
+    **layout_kwargs,
+) -> go.Figure:
+    """Animate the evolution of Pareto fronts, e.g., over generations.
+
+    The front of each set at each frame is made of the nondominated points
+    among all the points of the set in that frame and the previous ones.
+    Fronts are updated incrementally from the front of the previous frame
+    and the new points, and each frame only contains the traces of the
+    fronts that changed, thus the size of the figure grows with the number of
+    changes of the fronts instead of the number of frames times the number
+    of points.
+
+    Parameters
+    ----------
+    data :
+        Array of numerical values, like the argument of :func:`plot_pf`,
+        where the last column gives the set of each point, with an
+        additional column given by ``frame_column``.
+    frame_column :
+        Index of the column of ``data`` that gives the frame of each point,
+        e.g., the generation at which it was evaluated. Frames are shown in
+        increasing order of this value.
+    type :
+        Type of plot, any of 'points', 'lines' or 'points,lines'. See
+        :func:`plot_pf`. Only 2 objectives are supported.
+    maximise, reference_point, extremes_margin :
+        See :func:`plot_pf`. The extremes are computed from all the points,
+        and the axis ranges are fixed to them.
+    keyframe_interval :
+        Every ``keyframe_interval`` frames, a frame contains the traces of all
+        fronts. The slider of the figure jumps to a frame by playing the
+        frames since the previous keyframe. If ``None``, only the first frame
+        is a keyframe, which gives the smallest figure but makes the slider
+        slower for long animations.
+    frame_duration :
+        Duration of each frame in milliseconds when the animation is played.
+    layout_kwargs :
+        Passed to :meth:`plotly.graph_objects.Figure.update_layout`.
+
+    Returns
+    -------
+        Figure with one frame per distinct value of the frame column, a
+        play button and a slider.
+
+    Examples
+    --------
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> rng = np.random.default_rng(42)
+    >>> generation = rng.integers(1, 6, size=len(x))
+    >>> data = np.column_stack([x[:, :-1], generation, x[:, -1]])
+    >>> fig = mooplot.plot_pf_animation(data, frame_column=2, type="p,l")
+    >>> len(fig.frames)
+    5
+
+    """
+    data = np.asarray(data, dtype=float)
+    if data.ndim != 2 or data.shape[1] < 4:
+        raise ValueError(
+            "'data' must have at least 4 columns (2 objectives + frame column + set column)"
+        )
+    frame_column = range(data.shape[1])[frame_column]
+    if frame_column == data.shape[1] - 1:
+        raise ValueError("'frame_column' cannot be the set column")
+    if data.shape[1] != 4:
+        raise NotImplementedError(
+            "Only 2D datasets are currently supported by plot_pf_animation"
+        )
+    type_parsed = _parse_plot_type(type, 2)
+    if type_parsed not in ("markers", "lines", "lines+markers"):
+        raise ValueError(
+            f"Plot 'type={type}' is not supported by plot_pf_animation"
+        )
+    maximise = _parse_maximise(maximise, 2)
+    # Group the rows by set in order of first appearance, as FrontSet does,
+    # so that the points of each set are a view.
+    _, first, inverse = np.unique(
+        data[:, -1], return_index=True, return_inverse=True
+    )
+    rank = np.argsort(np.argsort(first))[inverse.ravel()]
+    data = data[np.argsort(rank, kind="stable")]
+    frame_values, frame_index = np.unique(
+        data[:, frame_column], return_inverse=True
+    )
+    frame_index = frame_index.ravel()
+    front_set = FrontSet(np.delete(data, frame_column, axis=1))
+    sets, points = front_set.split()
+    n_frames = len(frame_values)
+    extremes = _get_extremes(
+        [front_set.points],
+        maximise,
+        reference_point=reference_point,
+        margin=extremes_margin,
+        ranges=_get_axis_ranges(layout_kwargs),
+    )
+    # With lines and markers, each set has a line trace extended up to the
+    # extremes followed by a trace of the markers at the points themselves.
+    modes = (
+        ["lines", "markers"]
+        if type_parsed == "lines+markers"
+        else [type_parsed]
+    )
+    n_modes = len(modes)
+
+    def trace_xy(front):
+        # Coordinates of the traces of a front, one per mode.
+        front = _sort_points(front, maximise)
+        x, y = front[:, 0], front[:, 1]
+        return [
+            add_extremes(x, y, maximise, extremes)
+            if "lines" in mode and len(front)
+            else (x, y)
+            for mode in modes
+        ]
+
+    # changes[f] lists (i, xy) for the sets whose front changed in frame f,
+    # where xy are the coordinates of the traces of the set.
+    changes = [[] for _ in range(n_frames)]
+    for i, set_points in enumerate(points):
+        start = front_set.offsets[i]
+        set_frames = frame_index[start : start + len(set_points)]
+        # Points of the set grouped by frame.
+        by_frame = np.argsort(set_frames, kind="stable")
+        bounds = np.searchsorted(set_frames[by_frame], np.arange(n_frames + 1))
+        front = set_points[:0]
+        for f in range(n_frames):
+            new = set_points[by_frame[bounds[f] : bounds[f + 1]]]
+            if len(new) == 0:
+                continue
+            candidates = np.concatenate([front, new])
+            keep = is_nondominated(candidates, maximise=maximise)
+            if keep[: len(front)].all() and not keep[len(front) :].any():
+                continue
+            front = candidates[keep]
+            changes[f].append((i, trace_xy(front)))
+
+    colorway = colour.parse_colorway(
+        layout_kwargs.pop("colorway", px.colors.qualitative.Plotly), len(sets)
+    )
+    empty_front = FrontSet._from_parts(
+        front_set.points[:0],
+        np.zeros(len(sets) + 1, dtype=np.intp),
+        sets=sets,
+    )
+    traces = [
+        trace
+        for set_traces in zip(
+            *(
+                _get_2d_line_traces(
+                    empty_front, maximise, None, colorway, mode=mode
+                )
+                for mode in modes
+            )
+        )
+        for trace in set_traces
+    ]
+    for trace in traces:
+        trace["type"] = "scatter"
+    if n_modes > 1:
+        # As in plot_pf(), only the markers have hover text and a legend.
+        for line, markers in zip(traces[::2], traces[1::2]):
+            line.update(hoverinfo="skip")
+            line.pop("hovertemplate")
+            markers.update(
+                showlegend=False, marker=dict(color=line["line"]["color"])
+            )
+
+    # Coordinates of each trace in the current frame.
+    empty = np.empty(0, dtype=front_set.points.dtype)
+    state = [(empty, empty)] * len(traces)
+    names = [_frame_name(value) for value in frame_values]
+    play = {"frame": {"duration": frame_duration, "redraw": False}}
+    jump = {
+        "mode": "immediate",
+        "frame": {"duration": 0, "redraw": False},
+        "transition": {"duration": 0},
+    }
+    frames, steps = [], []
+    keyframe = 0
+    for f in range(n_frames):
+        for i, xy in changes[f]:
+            state[i * n_modes : (i + 1) * n_modes] = xy
+        if f == 0 or (keyframe_interval and f % keyframe_interval == 0):
+            keyframe = f
+            updated = range(len(traces))
+        else:
+            updated = [
+                i * n_modes + k for i, _ in changes[f] for k in range(n_modes)
+            ]
+        frames.append(
+            dict(
+                name=names[f],
+                data=[
+                    dict(type="scatter", x=state[i][0], y=state[i][1])
+                    for i in updated
+                ],
+                traces=list(updated),
+            )
+        )
+        # Frames only update the fronts that changed, thus jumping to a frame
+        # plays the frames since the previous keyframe.
+        steps.append(
+            dict(
+                method="animate",
+                label=names[f],
+                args=[names[keyframe : f + 1], jump],
+            )
+        )
+        if f == 0:
+            # The figure starts at the first frame.
+            for trace, (x, y) in zip(traces, state):
+                trace["x"], trace["y"] = x, y
+
+    lower = extremes.min(axis=0)
+    upper = extremes.max(axis=0)
+    # Traces and frames are created by mooplot, see PlotStyle._make_figure().
+    figure = _make_figure_unvalidated(
+        data=traces,
+        frames=frames,
+        layout=dict(
+            xaxis=dict(title_text="Objective 1", range=[lower[0], upper[0]]),
+            yaxis=dict(title_text="Objective 2", range=[lower[1], upper[1]]),
+            legend=dict(title_text="Set", tracegroupgap=0),
+            margin=dict(t=60),
+            updatemenus=[
+                dict(
+                    type="buttons",
+                    direction="left",
+                    x=0,
+                    y=-0.15,
+                    xanchor="left",
+                    yanchor="top",
+                    showactive=False,
+                    buttons=[
+                        dict(
+                            label="Play",
+                            method="animate",
+                            args=[None, {**play, "fromcurrent": True}],
+                        ),
+                        dict(
+                            label="Pause",
+                            method="animate",
+                            args=[[None], jump],
+                        ),
+                    ],
+                )
+            ],
+            sliders=[
+                dict(
+                    x=0.15,
+                    len=0.85,
+                    y=-0.1,
+                    yanchor="top",
+                    currentvalue=dict(prefix="Frame: "),
+                    steps=steps,
+                )
+            ],
+        ),
+    )
+    figure.update_layout(layout_kwargs)
+    return figure
+
+
+def _frame_name(value) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+import plotly.graph_objects as go
+
+from ._plot import plot_eaf
+
+# Executor shared by all calls of plot_eaf_async(), created when first needed.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Building figures mostly runs Python code that holds the GIL,
+            # thus more threads would not create figures faster. Bounding
+            # them makes a burst of requests wait in the queue instead.
+            _executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="mooplot",
+            )
+        return _executor
+
+
+async def plot_eaf_async(
+    *args, executor: Executor | None = None, **kwargs
+) -> go.Figure:
+    """Plot attainment surfaces without blocking the :mod:`asyncio` event loop.
+
+    The figure is created by :func:`plot_eaf` in a worker thread, which is
+    useful in asynchronous web services. :func:`plot_eaf` does not modify its
+    arguments, thus the same datasets and :class:`PlotStyle` may be shared by
+    concurrent calls.
+
+    Parameters
+    ----------
+    args, kwargs :
+        Arguments of :func:`plot_eaf`.
+    executor :
+        Executor that runs :func:`plot_eaf`. By default, a thread pool shared
+        by all calls and bounded to at most 4 threads.
+
+    Returns
+    -------
+        The figure returned by :func:`plot_eaf`.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> eaf = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 50, 100])
+    >>> async def make_figures():
+    ...     return await asyncio.gather(
+    ...         mooplot.plot_eaf_async(eaf, type="fill"),
+    ...         mooplot.plot_eaf_async(eaf, type="lines"),
+    ...     )
+    >>> figs = asyncio.run(make_figures())
+
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor if executor is not None else _get_executor(),
+        functools.partial(plot_eaf, *args, **kwargs),
+    )
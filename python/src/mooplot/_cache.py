@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+from numbers import Number
+
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+
+from ._plot import plot_eaf, plot_pf
+from ._style import _make_figure_unvalidated
+
+
+class FigureCache:
+    """On-disk cache of the figures of :func:`plot_pf` and :func:`plot_eaf`.
+
+    Reports that are created again and again from the same data spend most
+    of their time creating the same figures. A :class:`FigureCache` stores
+    each figure as compact JSON in a directory, under a key made of the hash
+    of the input arrays and of all the arguments of the plot, such as
+    ``type``, ``percentiles``, ``colorway``, ``line_dashes``, ``template``
+    and the layout arguments. Arguments are normalised before hashing, thus
+    passing the default value of an argument gives the same key as omitting
+    it. The versions of mooplot and plotly are also part of the key.
+
+    When the files of the cache take more than ``max_size`` bytes, the least
+    recently used figures are removed. Several processes may share the same
+    directory.
+
+    Parameters
+    ----------
+    directory :
+        Directory of the cache, created if it does not exist.
+    max_size :
+        Maximum total size of the cached figures in bytes. If ``None``, the
+        size is not bounded.
+
+    Attributes
+    ----------
+    hits, misses, evictions : int
+        Number of figures read from the cache, created by the plot function
+        and removed from the cache since the cache was created.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> cache = mooplot.FigureCache(tempfile.mkdtemp(), max_size=2**20)
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> eaf = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 50, 100])
+    >>> fig = cache.plot_eaf(eaf, type="lines")
+    >>> fig = cache.plot_eaf(eaf, type="lines", template="simple_white")
+    >>> cache.hits, cache.misses
+    (1, 1)
+
+    """
+
+    def __init__(self, directory, max_size: int | None = 256 * 2**20):
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Estimate of the total size, the directory is only scanned again
+        # when the estimate exceeds max_size.
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def plot_pf(self, data, **kwargs) -> go.Figure:
+        """Return the figure of :func:`plot_pf` from the cache or create it.
+
+        Parameters
+        ----------
+        data :
+            See :func:`plot_pf`.
+        kwargs :
+            Other arguments passed to :func:`plot_pf`.
+
+        Returns
+        -------
+            A new figure, which may be modified without changing the cache.
+
+        """
+        return self._plot(plot_pf, data, **kwargs)
+
+    def plot_eaf(self, dataset, **kwargs) -> go.Figure:
+        """Return the figure of :func:`plot_eaf` from the cache or create it.
+
+        Parameters
+        ----------
+        dataset :
+            See :func:`plot_eaf`.
+        kwargs :
+            Other arguments passed to :func:`plot_eaf`.
+
+        Returns
+        -------
+            A new figure, which may be modified without changing the cache.
+
+        """
+        return self._plot(plot_eaf, dataset, **kwargs)
+
+    def get_key(self, function, *args, **kwargs) -> str:
+        """Return the cache key of ``function(*args, **kwargs)``.
+
+        Raises
+        ------
+        TypeError
+            If an argument cannot be hashed, e.g., an object of unknown type.
+
+        """
+        from . import __version__
+
+        bound = inspect.signature(function).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        # Variable keyword arguments are hashed like the other arguments.
+        for name, parameter in inspect.signature(function).parameters.items():
+            if parameter.kind is inspect.Parameter.VAR_KEYWORD:
+                arguments.update(arguments.pop(name))
+        text = json.dumps(
+            [
+                function.__qualname__,
+                __version__,
+                plotly.__version__,
+                _normalise(arguments),
+            ],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.blake2b(text.encode(), digest_size=20).hexdigest()
+
+    def report(self) -> str:
+        """Return a summary of the hits, misses and size of the cache."""
+        entries = list(self._entries())
+        size = sum(size for _, size, _ in entries)
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0.0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+            f"{self.evictions} evictions, {len(entries)} figures, "
+            f"{_format_size(size)}"
+        )
+
+    def clear(self) -> None:
+        """Remove all the figures from the cache."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                _remove(path)
+            self._size = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def _entries(self):
+        # Yields (path, size, last access time) of each cached figure.
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # Removed by another process.
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _plot(self, function, *args, **kwargs) -> go.Figure:
+        path = self._path(self.get_key(function, *args, **kwargs))
+        try:
+            with open(path, "rb") as f:
+                text = f.read()
+        except FileNotFoundError:
+            pass
+        else:
+            # Mark the figure as recently used.
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Evicted by another process.
+                pass
+            with self._lock:
+                self.hits += 1
+            return _figure_from_json(text)
+
+        figure = function(*args, **kwargs)
+        text = figure.to_json(validate=False, pretty=False).encode()
+        # Write to a temporary file first so that other processes never read
+        # a partial figure.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        with self._lock:
+            self.misses += 1
+            self._size += len(text)
+            if self.max_size is not None and self._size > self.max_size:
+                self._evict()
+        return figure
+
+    def _evict(self) -> None:
+        # Removes the least recently used figures until the total size is
+        # below max_size.
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(size for _, size, _ in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_size:
+                break
+            if _remove(path):
+                self.evictions += 1
+            size -= entry_size
+        self._size = size
+
+
+def _figure_from_json(text) -> go.Figure:
+    # The figure was created by mooplot, see PlotStyle._make_figure().
+    return _make_figure_unvalidated(**json.loads(text))
+
+
+def _remove(path) -> bool:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _hash_array(a: np.ndarray) -> dict:
+    if a.dtype.hasobject:
+        return {"array": _normalise(a.tolist())}
+    a = np.ascontiguousarray(a)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{a.dtype.str}{a.shape}".encode())
+    h.update(a.data)
+    return {"array": h.hexdigest()}
+
+
+def _normalise(value):
+    # Returns value as JSON-serialisable data with arrays replaced by their
+    # hashes, so that equal arguments give equal JSON.
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, Number) and np.ndim(value) == 0:
+        value = value.item() if isinstance(value, np.generic) else value
+        if isinstance(value, (bool, int)):
+            return value
+        if isinstance(value, float):
+            return value if np.isfinite(value) else {"float": repr(value)}
+        return {"number": repr(value)}
+    if isinstance(value, np.ndarray):
+        return _hash_array(value)
+    if isinstance(value, np.dtype) or (
+        isinstance(value, type) and issubclass(value, np.generic)
+    ):
+        # For example, coord_dtype=np.float32.
+        return {"dtype": np.dtype(value).str}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    if isinstance(value, dict):
+        # Keys keep their order because it matters, e.g., for the datasets
+        # of plot_eaf().
+        return {"dict": [[str(k), _normalise(v)] for k, v in value.items()]}
+    if hasattr(value, "to_plotly_json"):
+        # Plotly objects, such as templates.
+        return _normalise(value.to_plotly_json())
+    if hasattr(value, "columns") and hasattr(value, "to_numpy"):
+        # pandas.DataFrame
+        return {
+            "frame": _hash_array(value.to_numpy()),
+            "columns": _normalise(list(value.columns)),
+            "index": _hash_array(np.asarray(value.index)),
+        }
+    cls = type(value)
+    if cls.__module__.split(".")[0] == "mooplot":
+        # Objects of mooplot, such as PlotStyle, FrontSet or EAFData, are
+        # hashed by their public attributes.
+        names = [n for n in getattr(value, "__dict__", ()) if n[0] != "_"]
+        for c in cls.__mro__:
+            names += [n for n in getattr(c, "__slots__", ()) if n[0] != "_"]
+        return {
+            "object": f"{cls.__module__}.{cls.__qualname__}",
+            "state": {n: _normalise(getattr(value, n)) for n in sorted(names)},
+        }
+    raise TypeError(
+        f"Cannot compute the cache key of an argument of type {cls.__name__}"
+    )
@@ -0,0 +1,249 @@
+"""Command-line interface of mooplot.
+
+Plot the EAF or the Pareto fronts of many files of :func:`moocore.read_datasets`
+format, in parallel::
+
+    mooplot eaf ALG_*.dat --percentiles 0,50,100 -o out/ -j 8
+    mooplot pf run_*.dat.xz --type points,lines --format html,png
+
+Only the standard library is imported at start-up. Each file is processed
+by a worker that imports moocore and plotly when first needed.
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+_compressed_suffixes = (".xz", ".gz", ".bz2")
+
+# Formats written with plotly; other formats are written with matplotlib.
+_plotly_formats = ("html", "json")
+_formats = ("html", "json", "png", "pdf", "svg")
+
+
+def _get_stem(path: str) -> str:
+    # Returns the file name of path without compression and data suffixes,
+    # e.g., "ALG_1" for "runs/ALG_1.dat.xz".
+    name = os.path.basename(path)
+    for suffix in _compressed_suffixes:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    stem, _ = os.path.splitext(name)
+    return stem or name
+
+
+def _parse_list(text: str, convert=str) -> list:
+    return [convert(x) for x in text.replace(" ", "").split(",") if x]
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mooplot",
+        description="Plot files of multi-objective optimization results.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help, default_type in (
+        ("eaf", "plot the empirical attainment function of each file", "fill"),
+        ("pf", "plot the Pareto fronts of each file", "points"),
+    ):
+        command = commands.add_parser(name, help=help, description=help)
+        command.add_argument(
+            "files", nargs="+", help="files in moocore.read_datasets() format"
+        )
+        command.add_argument(
+            "-t",
+            "--type",
+            default=default_type,
+            help=f"type of plot, see mooplot.plot_{name}() (default: %(default)s)",
+        )
+        if name == "eaf":
+            command.add_argument(
+                "-p",
+                "--percentiles",
+                type=lambda x: _parse_list(x, float),
+                help="comma-separated list of percentiles (default: all)",
+            )
+        command.add_argument(
+            "-o",
+            "--output-dir",
+            default=".",
+            help="directory of the output files (default: current directory)",
+        )
+        command.add_argument(
+            "-f",
+            "--format",
+            type=_parse_list,
+            default=["html"],
+            help=f"comma-separated list of output formats among {', '.join(_formats)} (default: html)",
+        )
+        command.add_argument(
+            "--include-plotlyjs",
+            default="directory",
+            choices=["directory", "cdn", "inline"],
+            help="how HTML files load plotly.js: from a single plotly.min.js file in the output directory, from a CDN or inline in every file (default: %(default)s)",
+        )
+        command.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="number of worker processes, 0 for one per CPU (default: %(default)s)",
+        )
+        command.add_argument(
+            "-q",
+            "--quiet",
+            action="store_true",
+            help="do not report the time taken by each file",
+        )
+    return parser
+
+
+def _process_file(command, path, options) -> dict:
+    """Plot a single file and write the output files.
+
+    Returns
+    -------
+        Dictionary with the ``outputs`` written and the time in seconds of
+        each step (``read``, ``eaf``, ``plot`` and ``write``).
+
+    """
+    timings = {}
+    start = time.perf_counter()
+    import moocore
+
+    data = moocore.read_datasets(path)
+    timings["read"] = time.perf_counter() - start
+
+    stem = _get_stem(path)
+    formats = options["format"]
+    if command == "eaf":
+        start = time.perf_counter()
+        from ._data import EAFData
+
+        # The EAF is computed once for all output formats.
+        data = EAFData(
+            moocore.eaf(
+                data[:, :-1],
+                data[:, -1],
+                percentiles=options["percentiles"] or [],
+            )
+        )
+        timings["eaf"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    figures = {}
+    kwargs = dict(type=options["type"], title=stem)
+    if any(f in _plotly_formats for f in formats):
+        from ._plot import plot_eaf, plot_pf
+
+        plot = plot_eaf if command == "eaf" else plot_pf
+        figures["plotly"] = plot(data, **kwargs)
+    if any(f not in _plotly_formats for f in formats):
+        from .matplotlib import plot_eaf, plot_pf
+
+        plot = plot_eaf if command == "eaf" else plot_pf
+        figures["matplotlib"] = plot(data, **kwargs)
+    timings["plot"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    outputs = []
+    for fmt in formats:
+        output = os.path.join(options["output_dir"], f"{stem}.{fmt}")
+        if fmt == "html":
+            include_plotlyjs = options["include_plotlyjs"]
+            figures["plotly"].write_html(
+                output,
+                include_plotlyjs=True
+                if include_plotlyjs == "inline"
+                else include_plotlyjs,
+            )
+        elif fmt == "json":
+            figures["plotly"].write_json(output)
+        else:
+            figures["matplotlib"].savefig(output)
+        outputs.append(output)
+    timings["write"] = time.perf_counter() - start
+    return dict(outputs=outputs, timings=timings)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``mooplot`` command.
+
+    Parameters
+    ----------
+    argv :
+        Command-line arguments, by default those of the current process.
+
+    Returns
+    -------
+        Exit status, 0 if all files were plotted, 1 otherwise.
+
+    """
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+    unknown = [f for f in args.format if f not in _formats]
+    if unknown:
+        parser.error(
+            f"unknown format '{unknown[0]}', valid formats are {', '.join(_formats)}"
+        )
+    os.makedirs(args.output_dir, exist_ok=True)
+    options = dict(
+        type=args.type,
+        percentiles=getattr(args, "percentiles", None),
+        output_dir=args.output_dir,
+        format=args.format,
+        include_plotlyjs=args.include_plotlyjs,
+    )
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = min(jobs, len(args.files))
+
+    status = 0
+    start = time.perf_counter()
+
+    def report(path, result=None, error=None):
+        nonlocal status
+        if error is not None:
+            status = 1
+            print(f"mooplot: error: {path}: {error}", file=sys.stderr)
+        elif not args.quiet:
+            timings = ", ".join(
+                f"{step} {seconds:.3f}s"
+                for step, seconds in result["timings"].items()
+            )
+            print(f"{path}: {timings}")
+
+    if jobs <= 1:
+        for path in args.files:
+            try:
+                result = _process_file(args.command, path, options)
+            except Exception as e:
+                report(path, error=e)
+            else:
+                report(path, result)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(
+                    _process_file, args.command, path, options
+                ): path
+                for path in args.files
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report(futures[future], error=e)
+                else:
+                    report(futures[future], result)
+    if not args.quiet:
+        print(
+            f"{len(args.files)} files in {time.perf_counter() - start:.3f}s with {jobs} jobs"
+        )
+    return status
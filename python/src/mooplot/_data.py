@@ -0,0 +1,566 @@
+from __future__ import annotations
+
+from numpy.typing import ArrayLike, DTypeLike  # For type hints
+
+import numpy as np
+from moocore import eaf as _moocore_eaf
+from moocore import is_nondominated
+
+from ._parallel import _is_nondominated_within_sets, _parse_n_jobs
+from ._utils import _parse_maximise
+
+
+def _get_offsets(column):
+    # Returns the offsets of the runs of equal values in column.
+    if len(column) == 0:
+        return np.zeros(1, dtype=np.intp)
+    starts = np.flatnonzero(column[1:] != column[:-1]) + 1
+    return np.concatenate([[0], starts, [len(column)]])
+
+
+def _get_points(data, dtype):
+    # Returns the coordinates of data, without the last column, as a view of
+    # data unless they have to be converted to another dtype.
+    points = data[:, :-1]
+    if dtype is None:
+        return points
+    return points.astype(dtype, copy=False)
+
+
+class _GroupedPoints:
+    # Points stored as consecutive groups, where the points of the i-th group
+    # are points[offsets[i]:offsets[i + 1]] (CSR-style offsets).
+    __slots__ = ("offsets", "points")
+
+    @classmethod
+    def _from_parts(cls, points, offsets, **attributes):
+        obj = cls.__new__(cls)
+        obj.points = points
+        obj.offsets = offsets
+        for name, value in attributes.items():
+            setattr(obj, name, value)
+        return obj
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _views(self, pos) -> list:
+        offsets = self.offsets
+        return [self.points[offsets[i] : offsets[i + 1]] for i in pos]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the arrays of the container."""
+        return sum(
+            getattr(self, name).nbytes
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+        )
+
+    def astype(self, dtype: DTypeLike):
+        """Return the container with the points converted to another type.
+
+        Parameters
+        ----------
+        dtype :
+            Floating-point type of the points, e.g., :class:`numpy.float32`.
+
+        Returns
+        -------
+            A new container that shares every other array with this one, or
+            this container if its points already have type ``dtype``.
+
+        """
+        points = self.points.astype(dtype, copy=False)
+        if points is self.points:
+            return self
+        return self._replace_points(points)
+
+    def _replace_points(self, points):
+        # Returns a container with the same groups and other points.
+        attributes = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if name not in _GroupedPoints.__slots__
+        }
+        return self._from_parts(points, self.offsets, **attributes)
+
+
+class FrontSet(_GroupedPoints):
+    """Sets of points, such as the fronts of several runs of an algorithm.
+
+    The points of each set are a contiguous block of :attr:`points`
+    delimited by :attr:`offsets`, thus accessing the points of a set is a
+    slice that does not scan or copy the data. The set of each point is not
+    stored, only one integer code per set, which saves memory for archives
+    of many runs.
+
+    Parameters
+    ----------
+    data :
+        Array of numerical values, maybe created by
+        :func:`moocore.read_datasets()`, where each row gives the coordinates
+        of a point and the last column gives the set of each point. If the
+        rows of each set are consecutive, as in the output of
+        :func:`moocore.read_datasets()`, and ``dtype`` is ``None`` or the
+        dtype of ``data``, :attr:`points` is a view of ``data``.
+    dtype :
+        Floating-point type of :attr:`points`, e.g., :class:`numpy.float32`
+        to halve the memory used. By default, the type of ``data``.
+
+    Attributes
+    ----------
+    points : numpy.ndarray
+        Array of shape ``(n, nobj)`` with the points of all sets.
+    sets : numpy.ndarray
+        Integer code (:class:`numpy.int32`) of each set, in order of first
+        appearance in ``data``.
+    offsets : numpy.ndarray
+        Array of length ``len(sets) + 1``. The points of ``sets[i]`` are
+        ``points[offsets[i]:offsets[i + 1]]``.
+
+    Examples
+    --------
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> fronts = mooplot.FrontSet(x)
+    >>> len(fronts)
+    10
+    >>> fronts[3].shape
+    (10, 2)
+    >>> fig = mooplot.plot_pf(fronts, type="lines")
+
+    """
+
+    __slots__ = ("sets",)
+
+    def __init__(self, data: ArrayLike, dtype: DTypeLike | None = None):
+        data = np.asarray(data)
+        if data.dtype.kind != "f":
+            data = data.astype(float)
+        if data.ndim != 2 or data.shape[1] < 3:
+            raise ValueError(
+                "'data' must have at least 3 columns (2 objectives + set column)"
+            )
+        column = data[:, -1]
+        offsets = _get_offsets(column)
+        codes = column[offsets[:-1]]
+        if len(np.unique(codes)) != len(codes):
+            # The rows of some set are not consecutive, so group them keeping
+            # the order of first appearance of each set.
+            _, first, inverse = np.unique(
+                column, return_index=True, return_inverse=True
+            )
+            rank = np.argsort(np.argsort(first))
+            data = data[np.argsort(rank[inverse], kind="stable")]
+            column = data[:, -1]
+            offsets = _get_offsets(column)
+            codes = column[offsets[:-1]]
+        self.points = _get_points(data, dtype)
+        self.sets = codes.astype(np.int32)
+        self.offsets = offsets
+
+    def __getitem__(self, set: int) -> np.ndarray:
+        match = np.flatnonzero(self.sets == set)
+        if len(match) == 0:
+            raise KeyError(set)
+        i = match[0]
+        return self.points[self.offsets[i] : self.offsets[i + 1]]
+
+    def __repr__(self) -> str:
+        return f"FrontSet(n_sets={len(self)}, n_points={len(self.points)}, dtype={self.points.dtype})"
+
+    def _set_column(self) -> np.ndarray:
+        # Set code of each point.
+        return np.repeat(self.sets, np.diff(self.offsets))
+
+    def split(self):
+        """Return the points of each set.
+
+        Returns
+        -------
+        sets : numpy.ndarray
+            The code of each set.
+        points : list[numpy.ndarray]
+            The points of each set, as views of :attr:`points`.
+
+        """
+        return self.sets, self._views(range(len(self)))
+
+    def select(self, sets: ArrayLike) -> FrontSet:
+        """Return the sets with the given codes.
+
+        Parameters
+        ----------
+        sets :
+            Codes of the sets to keep. Codes that do not exist are ignored.
+
+        Returns
+        -------
+            A new :class:`FrontSet` with the selected sets, in the order of
+            this one.
+
+        """
+        pos = np.flatnonzero(np.isin(self.sets, np.asarray(sets).ravel()))
+        points = self._views(pos)
+        offsets = np.concatenate([[0], np.cumsum([len(p) for p in points])])
+        return self._from_parts(
+            np.concatenate(points) if points else self.points[:0],
+            offsets.astype(np.intp),
+            sets=self.sets[pos],
+        )
+
+    def filter_dominated(
+        self,
+        maximise: bool | list[bool] = False,
+        keep_weakly: bool = False,
+        n_jobs: int | None = None,
+    ) -> FrontSet:
+        """Remove the dominated points within each set.
+
+        Parameters
+        ----------
+        maximise, keep_weakly :
+            See :func:`moocore.is_nondominated`.
+        n_jobs :
+            Number of processes that filter the sets in parallel, or
+            ``None`` to filter them in the calling process. Negative values
+            count back from the number of CPUs, e.g., ``-1`` uses all of them.
+            The points are passed to the processes through shared memory and
+            the result is the same for any value. The processes are started
+            by a fork server, or spawned where it is not available, and are
+            reused by later calls with the same value.
+
+        Returns
+        -------
+            A new :class:`FrontSet` with the nondominated points of each set.
+
+        """
+        n_jobs = _parse_n_jobs(n_jobs)
+        if n_jobs > 1 and len(self) > 1:
+            keep = _is_nondominated_within_sets(
+                self.points, self.offsets, maximise, keep_weakly, n_jobs
+            )
+        else:
+            # Unlike moocore.is_nondominated_within_sets(), this does not
+            # search for the points of each set, which is O(n) for each set.
+            keep = np.zeros(len(self.points), dtype=bool)
+            for start, stop in zip(self.offsets[:-1], self.offsets[1:]):
+                keep[start:stop] = is_nondominated(
+                    self.points[start:stop],
+                    maximise=maximise,
+                    keep_weakly=keep_weakly,
+                )
+        # Every set keeps at least one point, thus no set is removed.
+        counts = np.add.reduceat(keep, self.offsets[:-1]) if len(self) else []
+        return self._from_parts(
+            self.points[keep],
+            np.concatenate([[0], np.cumsum(counts)]).astype(np.intp),
+            sets=self.sets,
+        )
+
+    def eaf(self, percentiles: ArrayLike = ()) -> EAFData:
+        """Compute the empirical attainment function of the sets.
+
+        Parameters
+        ----------
+        percentiles :
+            See :func:`moocore.eaf`.
+
+        Returns
+        -------
+            The EAF as an :class:`EAFData`.
+
+        """
+        return EAFData(
+            _moocore_eaf(
+                self.points, self._set_column(), percentiles=percentiles
+            )
+        )
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the sets in the format of :func:`moocore.read_datasets`.
+
+        Returns
+        -------
+            Array where the last column gives the set of each point.
+
+        """
+        return np.column_stack([self.points, self._set_column()])
+
+
+class EAFData(_GroupedPoints):
+    """Empirical attainment function grouped by level.
+
+    The points of the attainment surfaces are stored sorted by level, such
+    that the points of each level are a contiguous block of :attr:`points`
+    delimited by :attr:`offsets`. Selecting levels only needs a binary search
+    over :attr:`levels` and returns views of :attr:`points`, instead of
+    scanning and copying the whole EAF for every selection, which matters
+    when the EAF is large and plotted many times.
+
+    Parameters
+    ----------
+    data :
+        Numpy array of EAF values, as returned by :func:`moocore.eaf`, where
+        each row gives the coordinates of a point of an attainment surface
+        (2 objectives) and the last column gives its level (percentile).
+        If the rows are already sorted by level and ``dtype`` is ``None`` or
+        the dtype of ``data``, :attr:`points` is a view of ``data``.
+    dtype :
+        Floating-point type of :attr:`points`, see :class:`FrontSet`.
+
+    Attributes
+    ----------
+    points : numpy.ndarray
+        Array of shape ``(n, 2)`` with the points of all levels, sorted by
+        level.
+    levels : numpy.ndarray
+        Levels of the EAF in increasing order.
+    offsets : numpy.ndarray
+        Array of length ``len(levels) + 1``. The points of ``levels[i]`` are
+        ``points[offsets[i]:offsets[i + 1]]``.
+
+    Examples
+    --------
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> eaf = mooplot.EAFData(moocore.eaf(x[:, :-1], x[:, -1]))
+    >>> eaf.levels
+    array([ 10.,  20.,  30.,  40.,  50.,  60.,  70.,  80.,  90., 100.])
+    >>> eaf[50].shape
+    (15, 2)
+    >>> fig = mooplot.plot_eaf(eaf, percentiles=[10, 50, 100])
+
+    """
+
+    __slots__ = ("levels",)
+
+    def __init__(self, data: ArrayLike, dtype: DTypeLike | None = None):
+        data = np.asarray(data)
+        if data.dtype.kind != "f":
+            data = data.astype(float)
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError(
+                "'data' must have 3 columns (2 objectives + percentile column)"
+            )
+        column = data[:, -1]
+        if np.any(column[1:] < column[:-1]):
+            data = data[np.argsort(column, kind="stable")]
+            column = data[:, -1]
+        self.points = _get_points(data, dtype)
+        self.offsets = _get_offsets(column)
+        self.levels = column[self.offsets[:-1]]
+
+    def __getitem__(self, level: float) -> np.ndarray:
+        i = np.searchsorted(self.levels, level)
+        if i == len(self.levels) or self.levels[i] != level:
+            raise KeyError(level)
+        return self.points[self.offsets[i] : self.offsets[i + 1]]
+
+    def __repr__(self) -> str:
+        return f"EAFData(levels={self.levels.tolist()}, n_points={len(self.points)})"
+
+    def _positions(self, percentiles) -> np.ndarray:
+        # Indexes of the given percentiles in self.levels, in increasing order.
+        # Percentiles that do not exist in the EAF are ignored.
+        if percentiles is None:
+            return np.arange(len(self.levels))
+        percentiles = np.asarray(percentiles, dtype=float).ravel()
+        pos = np.searchsorted(self.levels, percentiles)
+        found = pos < len(self.levels)
+        found[found] = self.levels[pos[found]] == percentiles[found]
+        return np.unique(pos[found])
+
+    def split(self, percentiles: ArrayLike | None = None):
+        """Return the points of each level.
+
+        Parameters
+        ----------
+        percentiles :
+            Levels to return. Levels that do not exist in the EAF are ignored.
+            By default, all levels are returned.
+
+        Returns
+        -------
+        levels : numpy.ndarray
+            The selected levels in increasing order.
+        points : list[numpy.ndarray]
+            The points of each selected level, as views of :attr:`points`.
+
+        """
+        pos = self._positions(percentiles)
+        return self.levels[pos], self._views(pos)
+
+    def select(self, percentiles: ArrayLike) -> EAFData:
+        """Return the EAF restricted to some levels.
+
+        Parameters
+        ----------
+        percentiles :
+            Levels to keep. Levels that do not exist in the EAF are ignored.
+
+        Returns
+        -------
+            A new :class:`EAFData`. If the selected levels are consecutive,
+            its points are a view of the points of this EAF.
+
+        """
+        pos = self._positions(percentiles)
+        if len(pos) == 0:
+            return self._from_parts(
+                self.points[:0],
+                np.zeros(1, dtype=np.intp),
+                levels=self.levels[:0],
+            )
+        first, last = pos[0], pos[-1]
+        if last - first + 1 == len(pos):
+            start, stop = self.offsets[first], self.offsets[last + 1]
+            return self._from_parts(
+                self.points[start:stop],
+                self.offsets[first : last + 2] - start,
+                levels=self.levels[first : last + 1],
+            )
+        levels, points = self.split(percentiles)
+        offsets = np.concatenate([[0], np.cumsum([len(p) for p in points])])
+        return self._from_parts(np.concatenate(points), offsets, levels=levels)
+
+    def rays(
+        self,
+        n_rays: int = 32,
+        maximise: bool | list[bool] = False,
+        ideal_point: ArrayLike | None = None,
+        nadir_point: ArrayLike | None = None,
+    ) -> EAFData:
+        """Summarise each attainment surface by its intersections with rays.
+
+        The objectives are scaled to ``[0, 1]`` between ``ideal_point`` and
+        ``nadir_point``, and ``n_rays`` rays start at the ideal point with
+        evenly spaced angles. Each surface is intersected with every ray,
+        which takes ``O(n log n + K log n)`` time for a surface of ``n``
+        points and ``K`` rays. The summary of every level has exactly
+        ``n_rays`` points whatever the size of the EAF.
+
+        Parameters
+        ----------
+        n_rays :
+            Number of rays, that is, points of the summary of each level.
+        maximise :
+            Whether the objectives are maximised, see :func:`plot_eaf`.
+        ideal_point, nadir_point :
+            Origin of the rays and point that, together with the ideal point,
+            defines the scale of each objective. The ideal point must weakly
+            dominate all the points of the EAF. By default, the best and the
+            worst value of each objective in the EAF. Summaries computed with
+            the same points and number of rays, e.g., of the EAFs of
+            different algorithms, are comparable ray by ray.
+
+        Returns
+        -------
+            A new :class:`EAFData` with the same levels, where the ``k``-th
+            point of each level is the intersection of its surface with the
+            ``k``-th ray. The points of each level are sorted from the best
+            to the worst value of the first objective.
+
+        Examples
+        --------
+        >>> x = moocore.get_dataset("input1.dat")
+        >>> eaf = mooplot.EAFData(moocore.eaf(x[:, :-1], x[:, -1]))
+        >>> summary = eaf.rays(n_rays=8)
+        >>> summary[50].shape
+        (8, 2)
+        >>> summary.to_numpy().shape
+        (80, 3)
+
+        """
+        points = _summarise_rays(
+            self._views(range(len(self))),
+            n_rays,
+            _parse_maximise(maximise, 2),
+            ideal_point,
+            nadir_point,
+        )
+        return self._from_parts(
+            points,
+            np.arange(len(self) + 1, dtype=np.intp) * n_rays,
+            levels=self.levels,
+        )
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the EAF in the format of :func:`moocore.eaf`.
+
+        Returns
+        -------
+            Array of shape ``(n, 3)``, where the last column gives the level
+            of each point.
+
+        """
+        column = np.repeat(self.levels, np.diff(self.offsets))
+        return np.column_stack([self.points, column])
+
+
+def _summarise_rays(
+    points_list, n_rays, maximise, ideal_point=None, nadir_point=None
+) -> np.ndarray:
+    # Returns the n_rays intersections of each attainment surface in
+    # points_list with the rays of EAFData.rays(), concatenated. The default
+    # ideal and nadir points are computed from all the surfaces.
+    if int(n_rays) != n_rays or n_rays < 1:
+        raise ValueError("'n_rays' must be a positive integer")
+    n_rays = int(n_rays)
+    dtype = np.result_type(*points_list) if points_list else float
+    # Rays are computed for minimisation.
+    sign = np.where(maximise, -1.0, 1.0)
+    points_list = [p * sign for p in points_list]
+    nonempty = [p for p in points_list if len(p)]
+    if nonempty:
+        lower = np.min([p.min(axis=0) for p in nonempty], axis=0)
+        upper = np.max([p.max(axis=0) for p in nonempty], axis=0)
+    else:
+        lower, upper = np.zeros(2), np.ones(2)
+    if ideal_point is None:
+        ideal = lower
+    else:
+        ideal = np.asarray(ideal_point, dtype=float) * sign
+        if np.any(ideal > lower):
+            raise ValueError(
+                "'ideal_point' must weakly dominate all the points"
+            )
+    if nadir_point is None:
+        nadir = upper
+    else:
+        nadir = np.asarray(nadir_point, dtype=float) * sign
+    scale = nadir - ideal
+    scale[scale <= 0] = 1.0
+    # Angles from pi/2 (best value of the first objective) to 0, thus the
+    # intersections are sorted like stepped lines.
+    angles = np.pi / 2 * (n_rays - 0.5 - np.arange(n_rays)) / n_rays
+    directions = np.column_stack([np.cos(angles), np.sin(angles)])
+    result = np.empty((len(points_list) * n_rays, 2), dtype=dtype)
+    for i, points in enumerate(points_list):
+        if len(points) == 0:
+            result[i * n_rays : (i + 1) * n_rays] = np.nan
+            continue
+        t = _ray_intersections((points - ideal) / scale, angles, directions)
+        result[i * n_rays : (i + 1) * n_rays] = (
+            ideal + t[:, None] * directions * scale
+        ) * sign
+    return result
+
+
+def _ray_intersections(points, angles, directions) -> np.ndarray:
+    # Returns, for each ray t * directions[k] with angle angles[k] that starts
+    # at the origin, the value of t where it meets the boundary of the region
+    # dominated by points (minimisation), which is
+    # min_p max(p[0] / directions[k, 0], p[1] / directions[k, 1]).
+    # Sorted by the first objective, the first term increases and the second
+    # decreases, thus the minimum is at the points next to where the angle of
+    # the points, which decreases, crosses the angle of the ray.
+    points = points[np.argsort(points[:, 0], kind="stable")]
+    n = len(points)
+    point_angles = np.arctan2(points[:, 1], points[:, 0])
+    after = np.searchsorted(-point_angles, -angles, side="left")
+    candidates = np.stack(
+        [np.clip(after - 1, 0, n - 1), np.clip(after, 0, n - 1)]
+    )
+    values = np.max(points[candidates] / directions, axis=-1)
+    return values.min(axis=0)
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+from numpy.typing import ArrayLike  # For type hints
+
+import numpy as np
+import moocore
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from . import colour
+from ._data import FrontSet
+from ._plot import _get_extremes, _get_staircase
+from ._utils import _parse_maximise
+
+
+class EAFDiff:
+    """Differences between the empirical attainment functions of two datasets.
+
+    The differences are computed once, as rectangles, by
+    :func:`moocore.eafdiff`, and reused for plotting them
+    (:func:`plot_eafdiff`), for choosing one side interactively
+    (:func:`choose_eafdiffplot`) and for computing the weighted hypervolume
+    (:meth:`whv_rect`).
+
+    Parameters
+    ----------
+    x, y :
+        Datasets of the left and right sides, respectively, in the format
+        produced by :func:`moocore.read_datasets`, i.e., 2 objectives and the
+        set of each point in the last column, or :class:`FrontSet` objects.
+    intervals :
+        The absolute range of the differences :math:`[0, 1]` is partitioned
+        into this number of intervals.
+    maximise :
+        Whether the objectives must be maximised instead of minimised. Either
+        a single boolean value that applies to both objectives or a list of
+        two boolean values.
+
+    Attributes
+    ----------
+    rectangles : numpy.ndarray
+        Matrix with five columns, where the first 4 columns give the
+        coordinates of two corners of each rectangle and the last column gives
+        the difference in favour of ``x`` (negative values are differences in
+        favour of ``y``).
+    left : bool or None
+        Side chosen by the user in :func:`choose_eafdiffplot`, ``None`` if no
+        side has been chosen yet.
+
+    Examples
+    --------
+    >>> A1 = moocore.get_dataset("wrots_l100w10_dat.xz")
+    >>> A2 = moocore.get_dataset("wrots_l10w100_dat.xz")
+    >>> diff = mooplot.EAFDiff(A1, A2, intervals=5)
+    >>> rectangles = diff.choose(left=True)
+    >>> bool((rectangles[:, -1] > 0).all())
+    True
+    >>> ref = np.maximum(A1[:, :2].max(axis=0), A2[:, :2].max(axis=0))
+    >>> whv = diff.whv_rect(A1[A1[:, -1] == 1, :2], ref=ref, left=True)
+
+    """
+
+    def __init__(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        intervals: int = 5,
+        maximise: bool | list[bool] = False,
+    ):
+        self._x = _as_array(x)
+        self._y = _as_array(y)
+        if self._x.shape[1] != 3 or self._y.shape[1] != 3:
+            raise ValueError(
+                "'x' and 'y' must have 3 columns (2 objectives + set column)"
+            )
+        self.intervals = intervals
+        self.maximise = _parse_maximise(maximise, 2)
+        self.rectangles = moocore.eafdiff(
+            self._x,
+            self._y,
+            intervals=intervals,
+            maximise=self.maximise,
+            rectangles=True,
+        )
+        self.left = None
+        self._chosen = {}
+
+    def choose(self, left: bool | None = None) -> np.ndarray:
+        """Return the rectangles in favour of one side.
+
+        Parameters
+        ----------
+        left :
+            If ``True``, return the rectangles in favour of the left side,
+            otherwise in favour of the right side. By default, use the side
+            chosen in :func:`choose_eafdiffplot`.
+
+        Returns
+        -------
+            Matrix with five columns, where the first 4 columns give the
+            coordinates of two corners of each rectangle and the last column
+            gives the positive differences in favour of the chosen side.
+
+        """
+        if left is None:
+            left = self.left
+            if left is None:
+                raise ValueError(
+                    "No side has been chosen, 'left' must be either True or False"
+                )
+        left = bool(left)
+        chosen = self._chosen.get(left)
+        if chosen is None:
+            diff = self.rectangles[:, -1]
+            if left:
+                chosen = self.rectangles[diff > 0]
+            else:
+                chosen = self.rectangles[diff < 0]
+                chosen[:, -1] = -chosen[:, -1]
+            # If several threads compute it, all of them return the first one.
+            chosen = self._chosen.setdefault(left, chosen)
+        return chosen
+
+    def whv_rect(
+        self, points: ArrayLike, ref: ArrayLike, left: bool | None = None
+    ) -> float:
+        """Weighted hypervolume of ``points`` using the chosen rectangles.
+
+        Parameters
+        ----------
+        points :
+            Array of numerical values, where each row gives the coordinates of
+            a point in objective space.
+        ref :
+            Reference point as a 1D vector.
+        left :
+            Side whose rectangles are used, see :meth:`choose`.
+
+        Returns
+        -------
+            The weighted hypervolume computed by :func:`moocore.whv_rect`.
+
+        """
+        return moocore.whv_rect(
+            points, self.choose(left), ref=ref, maximise=self.maximise
+        )
+
+
+def _as_array(data):
+    # moocore.eafdiff() requires the format of moocore.read_datasets().
+    if isinstance(data, FrontSet):
+        return data.to_numpy()
+    return np.asarray(data, dtype=float)
+
+
+def _get_rectangles_trace(rectangles, extremes, **kwargs):
+    # A single closed polygon per rectangle, separated by NaN, so that all the
+    # rectangles of the same colour are a single trace.
+    lower = extremes.min(axis=0)
+    upper = extremes.max(axis=0)
+    x = np.clip(rectangles[:, [0, 2]], lower[0], upper[0])
+    y = np.clip(rectangles[:, [1, 3]], lower[1], upper[1])
+    nan = np.full(len(rectangles), np.nan)
+    x = np.column_stack([x[:, 0], x[:, 1], x[:, 1], x[:, 0], x[:, 0], nan])
+    y = np.column_stack([y[:, 0], y[:, 0], y[:, 1], y[:, 1], y[:, 0], nan])
+    return go.Scatter(
+        x=x.ravel(),
+        y=y.ravel(),
+        mode="lines",
+        fill="toself",
+        line=dict(width=0),
+        hoverinfo="skip",
+        **kwargs,
+    )
+
+
+def plot_eafdiff(
+    x: ArrayLike | EAFDiff,
+    y: ArrayLike | None = None,
+    intervals: int = 5,
+    maximise: bool | list[bool] = False,
+    title_left: str = "Left",
+    title_right: str = "Right",
+    colorway: list | None = None,
+    **layout_kwargs,
+) -> go.Figure:
+    """Plot the differences between the EAFs of two datasets.
+
+    The left side shows the regions of the objective space attained more
+    often by ``x`` and the right side the regions attained more often by
+    ``y``. Darker colours correspond to larger differences. Both sides also
+    show the grand-best and grand-worst attainment surfaces of the two
+    datasets combined.
+
+    Parameters
+    ----------
+    x, y :
+        Datasets of the left and right sides, see :class:`EAFDiff`.
+        Alternatively, ``x`` may be an :class:`EAFDiff`, which avoids
+        computing the differences again, and ``y`` is ignored.
+    intervals, maximise :
+        See :class:`EAFDiff`. Ignored if ``x`` is an :class:`EAFDiff`.
+    title_left, title_right :
+        Title of each side.
+    colorway :
+        List of colours, one per interval. The default is a grey gradient.
+    layout_kwargs :
+        Update features of the graph such as title axis titles, colours etc.
+        These additional parameters are passed to plotly :meth:`plotly.graph_objects.Figure.update_layout`.
+
+    Returns
+    -------
+        Graphical object. The user can customise any part of the graph after it is created.
+
+    See Also
+    --------
+    choose_eafdiffplot, EAFDiff
+
+    Notes
+    -----
+    For more background, see :footcite:t:`LopPaqStu09emaa`.
+
+    References
+    ----------
+    .. footbibliography::
+
+    Examples
+    --------
+    >>> A1 = moocore.get_dataset("wrots_l100w10_dat.xz")
+    >>> A2 = moocore.get_dataset("wrots_l10w100_dat.xz")
+    >>> mooplot.plot_eafdiff(A1, A2)  # doctest: +ELLIPSIS
+    Figure({...
+
+    """
+    diff = (
+        x
+        if isinstance(x, EAFDiff)
+        else EAFDiff(x, y, intervals=intervals, maximise=maximise)
+    )
+    maximise = diff.maximise
+    extremes = _get_extremes([diff._x[:, :-1], diff._y[:, :-1]], maximise)
+    colorway = colour.parse_colorway(
+        colorway
+        if colorway
+        else colour.discrete_colour_gradient(
+            "#D3D3D3", "black", diff.intervals
+        ),
+        diff.intervals,
+    )
+
+    # Grand-best and grand-worst attainment surfaces of both datasets.
+    both = np.vstack([diff._x, diff._y + [0, 0, diff._x[:, -1].max()]])
+    best = moocore.filter_dominated(both[:, :-1], maximise=maximise)
+    # moocore.eaf() minimises, so flip the maximised objectives.
+    sign = np.where(maximise, -1.0, 1.0)
+    worst = moocore.eaf(sign * both[:, :-1], both[:, -1], percentiles=[100])
+    worst = sign * worst[:, :-1]
+
+    fig = make_subplots(
+        rows=1,
+        cols=2,
+        shared_yaxes=True,
+        horizontal_spacing=0.02,
+        subplot_titles=(title_left, title_right),
+    )
+    for col, left in ((1, True), (2, False)):
+        # Transparent background so that clicking anywhere selects a side.
+        (lo_x, lo_y), (hi_x, hi_y) = np.sort(extremes, axis=0)
+        fig.add_trace(
+            go.Heatmap(
+                x=[lo_x, hi_x],
+                y=[lo_y, hi_y],
+                z=[[0]],
+                opacity=0,
+                showscale=False,
+                hovertemplate=("Choose " + ("left" if left else "right"))
+                + "<extra></extra>",
+            ),
+            row=1,
+            col=col,
+        )
+        rectangles = diff.choose(left)
+        # Differences are in (0, intervals], one colour per interval.
+        level = np.clip(np.ceil(rectangles[:, -1]), 1, diff.intervals) - 1
+        for i in range(diff.intervals):
+            selected = rectangles[level == i]
+            if len(selected):
+                fig.add_trace(
+                    _get_rectangles_trace(
+                        selected,
+                        extremes,
+                        fillcolor=colorway[i],
+                        name=f"{i + 1}/{diff.intervals}",
+                        legendgroup=str(i),
+                        showlegend=left,
+                    ),
+                    row=1,
+                    col=col,
+                )
+        for name, surface in (("Grand best", best), ("Grand worst", worst)):
+            sx, sy = _get_staircase(surface, maximise, extremes)
+            fig.add_trace(
+                go.Scatter(
+                    x=sx,
+                    y=sy,
+                    mode="lines",
+                    line=dict(color="black", width=1, shape="hv"),
+                    name=name,
+                    legendgroup=name,
+                    showlegend=left,
+                ),
+                row=1,
+                col=col,
+            )
+    fig.update_layout(
+        template="simple_white",
+        xaxis_title="Objective 0",
+        xaxis2_title="Objective 0",
+        yaxis_title="Objective 1",
+        legend_title_text="Difference",
+    )
+    fig.update_layout(layout_kwargs)
+    return fig
+
+
+def choose_eafdiffplot(
+    x: ArrayLike | EAFDiff,
+    y: ArrayLike | None = None,
+    intervals: int = 5,
+    maximise: bool | list[bool] = False,
+    callback=None,
+    **kwargs,
+) -> go.FigureWidget:
+    """Interactively choose according to empirical attainment function differences.
+
+    Creates the same plot as :func:`plot_eafdiff` as a
+    :class:`plotly.graph_objects.FigureWidget` that waits for the user to
+    click in one of the sides. Then, the rectangles that give the differences
+    in favour of the chosen side are available from :meth:`EAFDiff.choose`.
+    These rectangles may be used for interactive decision-making as shown by
+    :footcite:t:`DiaLop2020ejor`.
+
+    The differences are computed only once. Choosing a side does not compute
+    them again and neither does any later call to :meth:`EAFDiff.whv_rect`.
+
+    Parameters
+    ----------
+    x, y, intervals, maximise :
+        See :func:`plot_eafdiff`. Pass an :class:`EAFDiff` as ``x`` to keep a
+        reference to the differences and the chosen side.
+    callback :
+        Function called as ``callback(rectangles)`` every time the user
+        chooses a side, with the rectangles in favour of that side.
+    kwargs :
+        Other arguments passed to :func:`plot_eafdiff`.
+
+    Returns
+    -------
+        Interactive figure. It requires the :mod:`ipywidgets` package.
+
+    See Also
+    --------
+    plot_eafdiff, EAFDiff
+
+    References
+    ----------
+    .. footbibliography::
+
+    Examples
+    --------
+    >>> A1 = moocore.get_dataset("wrots_l100w10_dat.xz")
+    >>> A2 = moocore.get_dataset("wrots_l10w100_dat.xz")
+    >>> diff = mooplot.EAFDiff(A1, A2, intervals=5)
+    >>> fig = mooplot.choose_eafdiffplot(diff)  # doctest: +SKIP
+    >>> # After clicking on the left side of the figure.
+    >>> rectangles = diff.choose()  # doctest: +SKIP
+
+    """
+    diff = (
+        x
+        if isinstance(x, EAFDiff)
+        else EAFDiff(x, y, intervals=intervals, maximise=maximise)
+    )
+    fig = go.FigureWidget(plot_eafdiff(diff, **kwargs))
+    # Keep the differences alive as long as the figure.
+    fig._eafdiff = diff
+
+    def _on_click(trace, points, state):
+        if not points.point_inds:
+            return
+        diff.left = trace.xaxis == "x"
+        if callback is not None:
+            callback(diff.choose())
+
+    for trace in fig.data:
+        trace.on_click(_on_click)
+    return fig
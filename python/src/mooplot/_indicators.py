@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+import numpy as np
+import moocore
+
+# Quality indicators accepted by the "indicators" argument of plot_pf() and
+# plot_eaf(): label shown in the legend, moocore function, whether the
+# function takes the reference point (True) or the reference front (False)
+# and whether higher values are better.
+_indicators = {
+    "hv": ("HV", moocore.hypervolume, True, True),
+    "igd": ("IGD", moocore.igd, False, False),
+    "igd+": ("IGD+", moocore.igd_plus, False, False),
+    "eps+": ("eps+", moocore.epsilon_additive, False, False),
+}
+
+# Named selections of plot_pf(select_sets=...) and their quantile of the
+# quality of the sets.
+_named_quantiles = {"worst": 0.0, "median": 0.5, "best": 1.0}
+
+# Executor shared by all the computations of indicators, created when first
+# needed. moocore releases the GIL while computing, thus the indicators of
+# several sets are computed in parallel by threads.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                thread_name_prefix="mooplot-indicators",
+            )
+        return _executor
+
+
+def _parse_indicators(indicators) -> list:
+    if indicators is None:
+        return []
+    if isinstance(indicators, str):
+        indicators = [indicators]
+    indicators = [indicator.lower() for indicator in indicators]
+    for indicator in indicators:
+        if indicator not in _indicators:
+            raise ValueError(
+                f"Unknown indicator '{indicator}', valid indicators are {list(_indicators)}"
+            )
+    return indicators
+
+
+def _compute_indicators(
+    points_list, indicators, maximise, reference_point=None, reference=None
+) -> np.ndarray:
+    """Compute quality indicators of each set of points.
+
+    Indicators that need a reference front use ``reference`` or, if it is
+    ``None``, the nondominated points of the union of all sets. The sets are
+    not filtered or sorted again.
+
+    Returns
+    -------
+        Array of shape ``(len(points_list), len(indicators))``.
+
+    """
+    functions = []
+    reference_front = reference
+    for indicator in indicators:
+        _, function, needs_point, _ = _indicators[indicator]
+        if needs_point:
+            if reference_point is None:
+                raise ValueError(
+                    f"'reference_point' is required to compute '{indicator}'"
+                )
+            ref = reference_point
+        else:
+            if reference_front is None:
+                reference_front = moocore.filter_dominated(
+                    np.concatenate(points_list), maximise=maximise
+                )
+            ref = reference_front
+        functions.append((function, ref))
+
+    def compute(points):
+        return [f(points, ref=ref, maximise=maximise) for f, ref in functions]
+
+    if len(points_list) > 1:
+        values = list(_get_executor().map(compute, points_list))
+    else:
+        values = [compute(points) for points in points_list]
+    return np.array(values, dtype=float).reshape(len(points_list), -1)
+
+
+def _annotate_indicators(figure, keys, indicators, values) -> None:
+    # Appends the value of each indicator to the names of the traces whose
+    # name, or otherwise legendgroup (e.g., "Set 1" of the 3D plots), is in
+    # keys and stores all the values in the layout metadata as
+    # {"indicators": {key: {indicator: value}}}.
+    table = {
+        key: dict(zip(indicators, row.tolist()))
+        for key, row in zip(keys, values)
+    }
+    suffixes = {
+        key: " ("
+        + ", ".join(
+            f"{_indicators[indicator][0]}: {value:.4g}"
+            for indicator, value in row.items()
+        )
+        + ")"
+        for key, row in table.items()
+    }
+    for trace in figure.data:
+        key = trace.name if trace.name in suffixes else trace.legendgroup
+        if trace.name is not None and key in suffixes:
+            trace.name = trace.name + suffixes[key]
+    meta = figure.layout.meta
+    meta = dict(meta) if isinstance(meta, dict) else {}
+    meta["indicators"] = table
+    figure.layout.meta = meta
+
+
+def _parse_select_sets(select_sets: str) -> list:
+    # Returns the (label, quantile of quality) pairs of select_sets, which is
+    # a comma-separated list of the keys of _named_quantiles or
+    # "quantiles:[q1, q2, ...]".
+    text = select_sets.replace(" ", "").lower()
+    if text.startswith("quantiles:"):
+        values = text[len("quantiles:") :].strip("[]").split(",")
+        try:
+            quantiles = [float(q) for q in values]
+        except ValueError:
+            quantiles = [-1.0]
+        if not all(0 <= q <= 1 for q in quantiles):
+            raise ValueError(
+                f"Invalid select_sets='{select_sets}', quantiles must be numbers between 0 and 1"
+            )
+        return [(f"q{q:g}", q) for q in quantiles]
+    selection = []
+    for name in text.split(","):
+        if name not in _named_quantiles:
+            raise ValueError(
+                f"Invalid select_sets='{select_sets}', valid values are {list(_named_quantiles)} and 'quantiles:[...]'"
+            )
+        selection.append((name, _named_quantiles[name]))
+    return selection
+
+
+def _select_sets(
+    front, select_sets, by, maximise, reference_point, reference=None
+):
+    """Select sets by the quantiles of their quality.
+
+    The indicator ``by`` is computed for all sets in a single pass over the
+    points of ``front``. The set of quantile ``q`` is the one at position
+    ``floor(q * (n - 1) + 0.5)`` when the ``n`` sets are sorted from worst to best
+    value of the indicator, keeping the order of ``front`` for ties.
+
+    Returns
+    -------
+    front : FrontSet
+        The selected sets.
+    labels : dict
+        The labels of the selection of each selected set, e.g.,
+        ``{3: ["median"]}``.
+
+    """
+    selection = _parse_select_sets(select_sets)
+    (by,) = _parse_indicators(by)
+    values = _compute_indicators(
+        front.split()[1], [by], maximise, reference_point, reference
+    )[:, 0]
+    if _indicators[by][3]:
+        order = np.argsort(values, kind="stable")
+    else:
+        order = np.argsort(-values, kind="stable")
+    labels = {}
+    for label, q in selection:
+        s = front.sets[order[int(np.floor(q * (len(order) - 1) + 0.5))]]
+        labels.setdefault(int(s), []).append(label)
+    return front.select(list(labels)), labels
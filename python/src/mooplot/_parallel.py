@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from moocore import is_nondominated
+
+# Process pool shared by all the parallel computations, created when first
+# needed and replaced when a different number of workers is requested.
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_mp_context():
+    # Forking a process that may run other threads is unsafe, thus workers
+    # are started by a fork server, or spawned where it is not available.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def _submit(max_workers: int, fn, args_list) -> list[Future]:
+    # Submits fn(*args) for each args of args_list to the shared pool. The
+    # lock is held while submitting, thus another thread cannot shut down the
+    # pool in between, and futures already submitted to a replaced pool
+    # still complete.
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=_get_mp_context()
+            )
+            _executor_workers = max_workers
+        return [_executor.submit(fn, *args) for args in args_list]
+
+
+@atexit.register
+def _shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+def _parse_n_jobs(n_jobs: int | None) -> int:
+    # Number of worker processes: None means 1 and negative values count
+    # back from the number of CPUs, e.g., -1 means all CPUs.
+    if n_jobs is None:
+        return 1
+    n_jobs = int(n_jobs)
+    if n_jobs == 0:
+        raise ValueError("'n_jobs' must be a positive or negative integer")
+    if n_jobs < 0:
+        n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def _attach(name: str) -> SharedMemory:
+    # Attaches to the shared memory created by the parent process, which is
+    # the only one that unlinks it. Before Python 3.13, attaching registers
+    # the memory again in the resource tracker, which the workers share with
+    # the parent, thus the memory is still unregistered once when unlinked.
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+def _is_nondominated_shard(
+    points_name, keep_name, shape, dtype, offsets, maximise, keep_weakly
+) -> None:
+    # Worker of _is_nondominated_within_sets(): computes the nondominated
+    # points of the sets delimited by offsets.
+    points_shm = _attach(points_name)
+    keep_shm = _attach(keep_name)
+    try:
+        points = np.ndarray(shape, dtype=dtype, buffer=points_shm.buf)
+        keep = np.ndarray(shape[0], dtype=bool, buffer=keep_shm.buf)
+        for start, stop in zip(offsets[:-1], offsets[1:]):
+            keep[start:stop] = is_nondominated(
+                points[start:stop], maximise=maximise, keep_weakly=keep_weakly
+            )
+        # The arrays must not outlive the buffers.
+        del points, keep
+    finally:
+        points_shm.close()
+        keep_shm.close()
+
+
+def _is_nondominated_within_sets(
+    points, offsets, maximise, keep_weakly, n_jobs: int
+) -> np.ndarray:
+    """Return which points are nondominated within their set, in parallel.
+
+    The sets are split into shards of consecutive sets with about the same
+    number of points, which are processed by a pool of ``n_jobs`` processes.
+    The points and the result are passed through shared memory, thus only
+    the offsets of each shard are pickled.
+
+    Returns
+    -------
+        Boolean array equal to the one computed by calling
+        :func:`moocore.is_nondominated` on each set.
+
+    """
+    n = len(points)
+    n_sets = len(offsets) - 1
+    # Several shards per process balance the load when sets have different
+    # sizes.
+    n_shards = min(4 * n_jobs, n_sets)
+    bounds = np.unique(
+        np.searchsorted(offsets, np.linspace(0, n, n_shards + 1)[1:-1])
+    )
+    bounds = np.unique(np.concatenate([[0], bounds, [n_sets]]))
+
+    points_shm = SharedMemory(create=True, size=max(points.nbytes, 1))
+    keep_shm = SharedMemory(create=True, size=max(n, 1))
+    try:
+        shared = np.ndarray(
+            points.shape, dtype=points.dtype, buffer=points_shm.buf
+        )
+        shared[...] = points
+        del shared
+        futures = _submit(
+            n_jobs,
+            _is_nondominated_shard,
+            [
+                (
+                    points_shm.name,
+                    keep_shm.name,
+                    points.shape,
+                    points.dtype.str,
+                    offsets[first : last + 1],
+                    maximise,
+                    keep_weakly,
+                )
+                for first, last in zip(bounds[:-1], bounds[1:])
+            ],
+        )
+        # Wait for all shards before releasing the memory, even if one fails.
+        wait(futures)
+        for future in futures:
+            future.result()
+        return np.ndarray(n, dtype=bool, buffer=keep_shm.buf).copy()
+    finally:
+        points_shm.close()
+        points_shm.unlink()
+        keep_shm.close()
+        keep_shm.unlink()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from numpy.typing import ArrayLike  # For type hints
+from numpy.typing import ArrayLike, DTypeLike  # For type hints
 
 import numpy as np
 import pandas as pd
@@ -8,14 +8,26 @@ import pandas as pd
 # FIXME: Move plotly plots to submodule mooplot.plotly
 import plotly.express as px
 import plotly.graph_objects as go
-from moocore import filter_dominated_within_sets
+import moocore
 from . import colour
+from ._data import EAFData, FrontSet, _summarise_rays
+from ._indicators import (
+    _annotate_indicators,
+    _compute_indicators,
+    _parse_indicators,
+    _select_sets,
+)
+from ._reference import _ReferenceIndex, _annotate_reference
+from ._style import PlotStyle
 from ._utils import (
     parse_line_dash,
-    parse_2d_line_dash,
     parse_line_width,
-    parse_2d_line_width,
     _parse_plot_type,
+    _parse_assume,
+    _parse_maximise,
+    _check_sorted_within_sets,
+    _check_positive,
+    _get_axis_ranges,
 )
 
 
@@ -26,6 +38,20 @@ def plot_pf(
     data: ArrayLike,
     type: str = "points",
     filter_dominated: bool = True,
+    assume: str | None = None,
+    maximise: bool | list[bool] = False,
+    reference_point: ArrayLike | None = None,
+    extremes_margin: float = 0.05,
+    bins: int | tuple[int, int] | None = None,
+    indicators: str | list[str] | None = None,
+    coord_dtype: DTypeLike | None = None,
+    n_jobs: int | None = None,
+    select_sets: str | None = None,
+    by: str = "hv",
+    reference: ArrayLike | None = None,
+    normalize: str | ArrayLike | None = None,
+    log_x: bool = False,
+    log_y: bool = False,
     **layout_kwargs,
 ) -> go.Figure:
     """Plot Pareto fronts.
@@ -38,6 +64,7 @@ def plot_pf(
         Array of numerical values, maybe created by :func:`moocore.read_datasets()`,
         where each row gives the coordinates of a point
         in objective space and the last column defines the sets to which each row of ``data`` belongs.
+        It may also be a :class:`FrontSet`.
     type :
         Type of plot. Any of:
 
@@ -45,6 +72,7 @@ def plot_pf(
         - 'lines' : produces a stepped line graph *(2 objectives only)*
         - 'points,lines' : produces a stepped line graph with points *(2 objective only)*
         - 'fill' : produces a stepped line graph with filled areas between lines. See :func:`plot_eaf` *(2 objective only)*
+        - 'density' : produces a 2D histogram of the points of all sets, with the nondominated front of each set as a stepped line. Use ``filter_dominated=False`` to show all the points *(2 objective only)*
         - 'surface' : produces a smoothed 3d surface *(3 objective only*)
         - 'surface,points' : produces a smoothed 3d surface with datapoints plotted *(3 objective only*)
         - 'cube' : produces a discrete cube surface *(3 objective only*)
@@ -52,6 +80,123 @@ def plot_pf(
         Abbreviations such as ``'p'`` or ``'p,l'`` are accepted.
     filter_dominated :
         Whether to automatically filter dominated points within each set. Default is ``True``.
+    assume :
+        Properties that ``data`` is known to satisfy, so that the corresponding
+        processing steps can be skipped. A comma-separated string containing
+        any of:
+
+        - 'nondominated' : the points within each set are mutually nondominated,
+          thus ``filter_dominated`` is ignored.
+        - 'sorted' : the rows of each set are consecutive and sorted by the
+          first objective from best to worst (ascending when minimising,
+          descending when maximising), thus line plots do not need to sort
+          them again.
+
+        Unless Python runs with optimizations enabled (``python -O``), the
+        'sorted' assumption is checked in linear time and a
+        :class:`ValueError` is raised if it does not hold.
+    maximise :
+        Whether the objectives must be maximised instead of minimised. Either
+        a single boolean value that applies to all objectives or a list of
+        boolean values, with one value per objective.
+    reference_point :
+        Worst value of each objective. Stepped lines and filled areas are
+        extended up to this point and clipped to it. By default, it is
+        computed from the range of the data plus ``extremes_margin``.
+    extremes_margin :
+        Fraction of the range of each objective added to the data bounds to
+        compute the extremes of stepped lines and filled areas when
+        ``reference_point`` is not given. If the axis ranges are set in
+        ``layout_kwargs``, e.g., ``xaxis_range=[0, 1]``, the extremes are set
+        to those ranges instead.
+    bins :
+        Number of bins of the histogram of ``type='density'``, either the
+        same for both objectives or one per objective. By default, one bin
+        every two pixels of the figure, according to the ``width`` and
+        ``height`` given in ``layout_kwargs`` or the default figure size of
+        plotly.
+    indicators :
+        Quality indicators to compute for each set, any of:
+
+        - 'hv' : hypervolume with respect to ``reference_point``, see
+          :func:`moocore.hypervolume`.
+        - 'igd', 'igd+' : inverted generational distance and IGD+, see
+          :func:`moocore.igd` and :func:`moocore.igd_plus`.
+        - 'eps+' : additive epsilon indicator, see
+          :func:`moocore.epsilon_additive`.
+
+        Indicators other than 'hv' use the nondominated points of the union
+        of all sets as the reference front. The indicators are computed in
+        parallel for all sets, from the points that are plotted, and shown in
+        the legend. Their values are stored in the metadata of the figure as
+        ``fig.layout.meta["indicators"][set][indicator]``.
+    coord_dtype :
+        Floating-point type of the coordinates of the traces, e.g.,
+        :class:`numpy.float32`, which is precise enough for display and
+        halves the memory used by the figure and, when plotly exports JSON
+        with ``orjson``, its size. The points are converted once, after
+        removing dominated points with the precision of ``data``. By
+        default, the type of the points of ``data``.
+    n_jobs :
+        Number of processes that remove the dominated points of the sets in
+        parallel, see :meth:`FrontSet.filter_dominated`. Useful for archives
+        of thousands of runs. The figure is the same for any value.
+    select_sets :
+        Plot only the sets of given quality according to the indicator
+        ``by``, instead of all sets. A comma-separated string containing any
+        of 'best', 'worst' and 'median', or ``'quantiles:[q1, q2, ...]'`` with
+        values between 0 (worst) and 1 (best). The set of quantile ``q`` is
+        the one at position ``floor(q * (n - 1) + 0.5)`` of the ``n`` sets sorted
+        from worst to best. The name of each selected set is prefixed by its
+        selection, e.g., ``'median: 3'``, and the selection is stored in the
+        metadata of the figure as ``fig.layout.meta["select_sets"][label]``.
+    by :
+        Quality indicator that ranks the sets for ``select_sets``, see
+        ``indicators``. It is computed for all sets in a single parallel
+        pass. If ``by='hv'`` and ``reference_point`` is not given, the
+        hypervolume is computed with respect to the worst extremes of the
+        data, see ``extremes_margin``.
+    reference :
+        Reference front, such as the true Pareto front of the problem, as an
+        array with one point per row and one column per objective. Its
+        nondominated points are plotted in black and the hover text of each
+        point plotted as a marker, e.g., with ``type="points"``, shows its
+        distance to the nearest reference point, its additive epsilon with
+        respect to the reference front and the reference point that
+        dominates it with the smallest epsilon, if any. These values are
+        computed once, for all the points of the figure, from an index of
+        the reference front sorted by the first objective, and stored in the
+        ``customdata`` of the traces. With ``normalize``, they are computed
+        from the normalized points, as noted in the hover text. Indicators
+        other than 'hv' use this front instead of the union of all sets.
+    normalize :
+        Scale each objective to about ``[0, 1]``, so that objectives with
+        very different ranges fill the figure equally. Either:
+
+        - 'minmax' : the minimum and the maximum of each objective among the
+          points of all sets.
+        - 'ideal-nadir' : the ideal and the nadir points of the nondominated
+          points of the union of all sets.
+        - An array of shape ``(2, nobj)`` with the lower and the upper
+          bound of each objective.
+
+        The bounds are computed once for all sets. The points are scaled in
+        place when the plot already works on a copy of ``data``, e.g., after
+        removing dominated points, and otherwise while copying them once.
+        ``reference_point`` and ``reference`` are given in the original
+        units and scaled with the same bounds, whereas the indicators, the
+        hover text and the axis ranges in ``layout_kwargs`` use the scaled
+        values. The tick labels of the axes show the original units and the
+        bounds are stored in ``fig.layout.meta["normalize"]``.
+    log_x, log_y :
+        Whether the axis of the first or the second objective is
+        logarithmic. The values of the objective, ``reference_point`` and
+        ``reference`` must be positive, which is checked once for all the
+        points, and ``extremes_margin`` and the axis ranges in
+        ``layout_kwargs`` apply to the logarithms of the values, thus the
+        stepped lines end at positive values and the axis spans only the
+        data. With ``type='density'``, the bins have the same width in the
+        logarithmic scale. They cannot be combined with ``normalize``.
     layout_kwargs :
         Update features of the graph such as title axis titles, colours etc.
         These additional parameters are passed to plotly :meth:`plotly.graph_objects.Figure.update_layout`.
@@ -67,34 +212,127 @@ def plot_pf(
     >>> mooplot.plot_pf(x, type="points,lines")  # doctest: +ELLIPSIS
     Figure({...
 
+    Millions of points are shown faster as a histogram:
+
+    >>> fig = mooplot.plot_pf(x, type="density", filter_dominated=False)
+
+    Show the hypervolume and IGD+ of each set in the legend:
+
+    >>> fig = mooplot.plot_pf(
+    ...     x, type="lines", indicators=["hv", "igd+"], reference_point=[10, 10]
+    ... )
+    >>> fig.data[0].name
+    '1 (HV: 90.46, IGD+: 0.1294)'
+    >>> fig.layout.meta["indicators"]["1"]["hv"]  # doctest: +ELLIPSIS
+    90.46...
+
+    Plot only the best, median and worst sets according to the hypervolume:
+
+    >>> fig = mooplot.plot_pf(
+    ...     x, type="lines", select_sets="best,median,worst", reference_point=[10, 10]
+    ... )
+    >>> [trace.name for trace in fig.data]
+    ['best: 1', 'median: 2', 'worst: 8']
+
+    Compare the sets with a reference front, whose distance is shown when
+    hovering over the points:
+
+    >>> fig = mooplot.plot_pf(x, type="points", reference=[[1, 2], [2, 1]])
+    >>> fig.data[0].customdata[0].round(3).tolist()  # doctest: +ELLIPSIS
+    [..., ..., ..., ...]
+
+    Scale both objectives to ``[0, 1]``, keeping the original units in the
+    axis labels:
+
+    >>> fig = mooplot.plot_pf(x, type="lines", normalize="minmax")
+    >>> fig.layout.xaxis.ticktext
+    ('0', '2', '4', '6', '8', '10')
+
+    Use a logarithmic scale for the second objective:
+
+    >>> fig = mooplot.plot_pf(x, type="lines", log_y=True)
+    >>> fig.layout.yaxis.type
+    'log'
+
     .. minigallery:: mooplot.plot_pf
        :add-heading:
 
     """
-    # FIXME: Accept a Pandas DataFrame.
-    data = np.asarray(data, dtype=float)
-    ncols = data.shape[1]
-    if ncols < 3:
-        raise ValueError(
-            "'data' must have at least 3 columns (2 objectives + set column)"
-        )
-    if ncols > 4:
+    front = _as_front_set(data)
+    dim = front.points.shape[1]
+    if dim > 3:
         raise NotImplementedError(
             "Only 2D or 3D datasets are currently supported"
         )
-    dim = ncols - 1
-    if filter_dominated:
-        data = filter_dominated_within_sets(data)
-
+    maximise = _parse_maximise(maximise, dim)
+    indicators = _parse_indicators(indicators)
+    log = np.array([log_x, log_y, False][:dim], dtype=bool)
+    if log.any() and normalize is not None:
+        raise ValueError(
+            "'normalize' cannot be combined with 'log_x' or 'log_y'"
+        )
+    assume_nondominated, assume_sorted = _parse_assume(assume)
+    if assume_sorted and __debug__:
+        _check_sorted_within_sets(
+            front.points[:, 0], front.offsets, descending=maximise[0]
+        )
     type_parsed = _parse_plot_type(type, dim)
+    if filter_dominated and not assume_nondominated:
+        front = front.filter_dominated(maximise=maximise, n_jobs=n_jobs)
+        assume_nondominated = True
+    if coord_dtype is not None:
+        front = front.astype(coord_dtype)
+    if normalize is not None:
+        bounds = _get_normalize_bounds(normalize, [front.points], maximise)
+        original = data.points if isinstance(data, FrontSet) else data
+        front = front._replace_points(
+            _normalise_points(
+                front.points,
+                bounds,
+                copy=np.may_share_memory(front.points, original),
+            )
+        )
+        if reference_point is not None:
+            reference_point = _normalise_points(
+                np.array(reference_point, dtype=float), bounds, copy=False
+            )
+        if reference is not None:
+            reference = _normalise_points(
+                np.array(reference, dtype=float), bounds, copy=False
+            )
+    reference_front = None
+    if reference is not None:
+        reference_index = _ReferenceIndex(reference, maximise)
+        reference_front = reference_index.reference * reference_index.sign
+    # The reference front is plotted within the extremes.
+    all_points = [front.points]
+    if reference_front is not None:
+        all_points.append(reference_front)
+    if select_sets is not None:
+        ref = reference_point
+        if ref is None:
+            ref = _get_extremes(
+                all_points, maximise, margin=extremes_margin, log=log
+            )[1]
+        front, selection = _select_sets(
+            front, select_sets, by, maximise, ref, reference_front
+        )
+        all_points[0] = front.points
+    if reference_point is not None:
+        _check_positive(all_points + [np.atleast_2d(reference_point)], log)
+    else:
+        _check_positive(all_points, log)
 
-    df = pd.DataFrame(
-        data, columns=[f"Objective {d + 1}" for d in range(dim)] + ["Set"]
-    )
-    # Convert set num to string without decimal points, plotly interprets ints as discrete colour sequences.
-    df["Set"] = df["Set"].astype(int).astype(str)
-    num_percentiles = df["Set"].nunique()
+    num_percentiles = len(front)
     if dim == 2:
+        extremes = _get_extremes(
+            all_points,
+            maximise,
+            reference_point=reference_point,
+            margin=extremes_margin,
+            ranges=_get_axis_ranges(layout_kwargs),
+            log=log,
+        )
         # FIXME this can be combined with plot_2d_eaf function to tidy up
         if type_parsed == "fill":
             def_colours = colour.get_default_fill_colorway(num_percentiles)
@@ -106,7 +344,17 @@ def plot_pf(
                 dict.get(layout_kwargs, "fill_border_colours", def_colours),
                 num_percentiles,
             )
-            figure = create_2d_eaf_plot(data, colorway, fill_border_colours)
+            # Sets are filled in increasing order of their number.
+            sets, points = front.split()
+            order = np.argsort(sets, kind="stable")
+            figure = create_2d_eaf_plot(
+                sets[order],
+                [points[i] for i in order],
+                colorway,
+                fill_border_colours,
+                maximise=maximise,
+                extremes=extremes,
+            )
             # Make sure these arguments are not used twice
             layout_kwargs.pop("fill_border_colours", None)
             layout_kwargs.pop("colorway", None)
@@ -119,30 +367,46 @@ def plot_pf(
                 num_percentiles,
             )
             layout_kwargs["colorway"] = colorway
-            # Sort the the points by Objective 1 within each set, while keeping the set order (May be inefficient)
-            for s in df["Set"].unique():
-                mask = df["Set"] == s
-                df.loc[mask] = (
-                    df.loc[mask].sort_values(by=df.columns[0]).values
-                )
-
-            figure = px.line(
-                df,
-                x=df.columns[0],
-                y=df.columns[1],
-                color="Set",
-                color_discrete_sequence=colorway,
+            if type_parsed == "density":
+                if bins is None:
+                    bins = (
+                        layout_kwargs.get("width", 700) // 2,
+                        layout_kwargs.get("height", 450) // 2,
+                    )
+                traces = [_get_density_trace(front.points, bins, log)]
+                if not assume_nondominated:
+                    front = front.filter_dominated(
+                        maximise=maximise, n_jobs=n_jobs
+                    )
+                mode = "lines"
+            else:
+                traces = []
+                mode = type_parsed
+            traces += _get_2d_line_traces(
+                front,
+                maximise,
+                extremes if "lines" in mode else None,
+                colorway,
+                mode=mode,
+                sort=not assume_sorted,
+            )
+            figure = go.Figure(
+                data=traces,
+                layout=dict(
+                    xaxis_title_text="Objective 1",
+                    yaxis_title_text="Objective 2",
+                    legend=dict(title_text="Set", tracegroupgap=0),
+                    margin=dict(t=60),
+                ),
             )
-
-            # FIXME: This should be configurable.
-            maximise = [False, False]
-            # Extend lines past the figure boundaries.
-            for trace in figure.data:
-                trace.x, trace.y = add_extremes(trace.x, trace.y, maximise)
-
-            figure.update_traces(line_shape="hv", mode=type_parsed)
 
     elif dim == 3:
+        df = pd.DataFrame(
+            front.to_numpy(),
+            columns=[f"Objective {d + 1}" for d in range(dim)] + ["Set"],
+        )
+        # Convert set num to string without decimal points, plotly interprets ints as discrete colour sequences.
+        df["Set"] = df["Set"].astype(int).astype(str)
         colorway = colour.parse_colorway(
             dict.get(layout_kwargs, "colorway", px.colors.qualitative.Plotly),
             num_percentiles,
@@ -164,7 +428,7 @@ def plot_pf(
             figure.update_traces(marker_size=4)
             figure.update_layout(margin=_3d_margin)
         elif "cube" in type_parsed:
-            figure = _get_cube_plot(data)
+            figure = _get_cube_plot(front.to_numpy())
         else:
             raise NotImplementedError
         if title:
@@ -172,10 +436,382 @@ def plot_pf(
     else:
         raise NotImplementedError
 
+    if indicators:
+        sets, points = front.split()
+        _annotate_indicators(
+            figure,
+            [str(s) for s in sets],
+            indicators,
+            _compute_indicators(
+                points, indicators, maximise, reference_point, reference_front
+            ),
+        )
+    if select_sets is not None:
+        _annotate_selection(figure, selection)
+    if reference is not None:
+        _annotate_reference(
+            figure, reference_index, normalized=normalize is not None
+        )
+        if dim == 2:
+            mode = "markers" if type_parsed == "markers" else "lines"
+            trace = _get_2d_line_traces(
+                FrontSet(
+                    np.column_stack(
+                        [reference_front, np.zeros(len(reference_front))]
+                    )
+                ),
+                maximise,
+                extremes if mode == "lines" else None,
+                ["black"],
+                mode=mode,
+            )[0]
+            trace["line"]["dash"] = "dash"
+        else:
+            trace = dict(
+                type="scatter3d",
+                x=reference_front[:, 0],
+                y=reference_front[:, 1],
+                z=reference_front[:, 2],
+                mode="markers",
+                marker=dict(color="black", size=3),
+            )
+        trace.update(name="Reference", legendgroup="Reference")
+        trace["hovertemplate"] = (
+            "Reference<br>"
+            + "<br>".join(
+                f"Objective {d + 1}=%{{{a}}}" for d, a in enumerate("xyz"[:dim])
+            )
+            + "<extra></extra>"
+        )
+        figure.add_trace(trace)
+    if normalize is not None:
+        shown = [front.points] if len(front.points) else []
+        if reference_front is not None:
+            shown.append(reference_front)
+        if dim == 2:
+            shown.append(extremes)
+        shown = np.concatenate(shown)
+        _set_original_ticks(
+            figure,
+            bounds,
+            np.column_stack([shown.min(axis=0), shown.max(axis=0)]),
+        )
+    _set_log_axes(figure, log)
     figure.update_layout(layout_kwargs)
     return figure
 
 
+def _annotate_selection(figure, selection) -> None:
+    # Prefixes the names of the traces of each selected set with its labels
+    # and stores the selected set of each label in the layout metadata as
+    # {"select_sets": {label: set}}.
+    prefixes = {
+        str(s): ", ".join(labels) + ": " for s, labels in selection.items()
+    }
+    for trace in figure.data:
+        key = trace.legendgroup if trace.legendgroup else trace.name
+        if trace.name is not None and key in prefixes:
+            trace.name = prefixes[key] + trace.name
+    meta = figure.layout.meta
+    meta = dict(meta) if isinstance(meta, dict) else {}
+    meta["select_sets"] = {
+        label: s for s, labels in selection.items() for label in labels
+    }
+    figure.layout.meta = meta
+
+
+def _as_front_set(data):
+    # Returns data as a FrontSet, see plot_pf().
+    if isinstance(data, FrontSet):
+        return data
+    # FIXME: Accept a Pandas DataFrame.
+    data = np.asarray(data, dtype=float)
+    if data.shape[1] < 3:
+        raise ValueError(
+            "'data' must have at least 3 columns (2 objectives + set column)"
+        )
+    return FrontSet(data)
+
+
+def _get_2d_line_traces(front, maximise, extremes, colorway, mode, sort=True):
+    # Returns one "hv" line trace per set, sorted from best to worst value of
+    # the first objective. If extremes are given, extend the lines up to them.
+    # Like plotly.express, use WebGL for more than 1000 points.
+    # The extremes only extend and clip the lines: with mode="lines+markers",
+    # the markers are a separate trace of the points themselves, which is the
+    # only one with hover text.
+    trace_type = "scattergl" if len(front.points) > 1000 else "scatter"
+    split_markers = extremes is not None and "markers" in mode
+    traces = []
+    for s, points, line_colour in zip(*front.split(), colorway):
+        if sort:
+            points = _sort_points(points, maximise)
+        x, y = points[:, 0], points[:, 1]
+        name = str(s)
+        hovertemplate = f"Set={name}<br>Objective 1=%{{x}}<br>Objective 2=%{{y}}<extra></extra>"
+        line = dict(
+            type=trace_type,
+            x=x,
+            y=y,
+            mode=mode,
+            name=name,
+            legendgroup=name,
+            showlegend=True,
+            line=dict(color=line_colour, dash="solid", shape="hv"),
+            hovertemplate=hovertemplate,
+        )
+        if extremes is not None:
+            line["x"], line["y"] = add_extremes(x, y, maximise, extremes)
+        if split_markers:
+            line.update(mode="lines", hoverinfo="skip")
+            line.pop("hovertemplate")
+        traces.append(line)
+        if split_markers:
+            traces.append(
+                dict(
+                    type=trace_type,
+                    x=x,
+                    y=y,
+                    mode="markers",
+                    name=name,
+                    legendgroup=name,
+                    showlegend=False,
+                    marker=dict(color=line_colour),
+                    hovertemplate=hovertemplate,
+                )
+            )
+    return traces
+
+
+def _histogram_2d(points, bins):
+    """Count the points within each bin of a grid over their bounds.
+
+    The bin of each point is computed arithmetically and all bins are
+    counted by a single call of :func:`numpy.bincount`, thus the cost is
+    linear in the number of points and bins.
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        Array of shape ``(bins[1], bins[0])`` with the number of points
+        within each bin, where rows correspond to the second objective.
+    lower : numpy.ndarray
+        Lower corner of the grid.
+    step : numpy.ndarray
+        Size of the bins in each objective.
+
+    """
+    bins = np.broadcast_to(np.asarray(bins, dtype=np.intp), (2,))
+    if np.any(bins < 1):
+        raise ValueError("'bins' must be positive")
+    lower = points.min(axis=0).astype(float)
+    span = points.max(axis=0) - lower
+    span[span == 0] = 1.0
+    step = span / bins
+    # The maximum of each objective belongs to the last bin.
+    index = np.minimum(((points - lower) / step).astype(np.intp), bins - 1)
+    counts = np.bincount(
+        index[:, 1] * bins[0] + index[:, 0], minlength=bins[0] * bins[1]
+    )
+    return counts.reshape(bins[1], bins[0]), lower, step
+
+
+def _get_density_trace(points, bins, log=(False, False)):
+    # Returns a heatmap trace with the number of points within each bin.
+    # Empty bins are transparent. The bins of the objectives of logarithmic
+    # axes have the same width in the logarithmic scale.
+    log = np.asarray(log, dtype=bool)
+    if log.any():
+        points = points.astype(float)
+        points[:, log] = np.log10(points[:, log])
+    counts, lower, step = _histogram_2d(points, bins)
+    z = counts.astype(float)
+    z[counts == 0] = np.nan
+    coords = {}
+    for d, axis in enumerate("xy"):
+        if log[d]:
+            # The edges of the bins, one more than the bins.
+            coords[axis] = 10.0 ** (
+                lower[d] + step[d] * np.arange(counts.shape[1 - d] + 1)
+            )
+        else:
+            coords[axis + "0"] = lower[d] + step[d] / 2
+            coords["d" + axis] = step[d]
+    return dict(
+        type="heatmap",
+        z=z,
+        **coords,
+        colorscale="Greys",
+        zmin=0,
+        name="Density",
+        colorbar=dict(
+            title=dict(text="Points"), len=0.5, y=0, yanchor="bottom"
+        ),
+        hovertemplate="Objective 1=%{x}<br>Objective 2=%{y}<br>Points=%{z}<extra></extra>",
+    )
+
+
+def _get_normalize_bounds(normalize, points_list, maximise):
+    """Return the bounds of each objective used to normalize the points.
+
+    The bounds are computed once from the points of all the sets, thus the
+    normalized sets of all algorithms remain comparable.
+
+    Returns
+    -------
+        Array of shape ``(2, nobj)``, whose rows are the lower and the upper
+        bound of each objective, which are mapped to 0 and 1.
+
+    """
+    nobj = points_list[0].shape[1]
+    if isinstance(normalize, str):
+        if normalize == "minmax":
+            points = points_list
+        elif normalize == "ideal-nadir":
+            points = [
+                moocore.filter_dominated(
+                    np.concatenate(points_list), maximise=maximise
+                )
+            ]
+        else:
+            raise ValueError(
+                f"Unknown normalize='{normalize}', valid values are 'minmax', 'ideal-nadir' or an array of bounds"
+            )
+        bounds = np.vstack(
+            [
+                np.min([p.min(axis=0) for p in points], axis=0),
+                np.max([p.max(axis=0) for p in points], axis=0),
+            ]
+        ).astype(float)
+        # Objectives with a single value are only shifted.
+        bounds[1, bounds[1] == bounds[0]] += 1.0
+        return bounds
+    bounds = np.asarray(normalize, dtype=float)
+    if bounds.shape != (2, nobj) or np.any(bounds[1] <= bounds[0]):
+        raise ValueError(
+            f"'normalize' bounds must have shape (2, {nobj}), with the lower bound of each objective in the first row and its upper bound in the second row"
+        )
+    return bounds
+
+
+def _normalise_points(points, bounds, copy: bool):
+    # Maps the bounds of each objective to 0 and 1, in place unless copy is
+    # True, that is, unless points may be the data of the caller.
+    if copy:
+        points = np.subtract(points, bounds[0], dtype=points.dtype)
+    else:
+        points -= bounds[0]
+    points /= (bounds[1] - bounds[0]).astype(points.dtype)
+    return points
+
+
+def _nice_ticks(lower, upper, n=6):
+    # Returns about n round values between lower and upper.
+    span = upper - lower
+    if not span > 0:
+        return np.array([lower])
+    raw = span / n
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    step = magnitude * next(
+        m for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw
+    )
+    # Adding 0.0 turns -0.0 into 0.0.
+    return (
+        np.arange(np.ceil(lower / step), np.floor(upper / step) + 1) * step
+        + 0.0
+    )
+
+
+def _set_original_ticks(figure, bounds, ranges) -> None:
+    # Labels the ticks of the axes of a figure of normalized points with the
+    # values in the original units, where ranges are the (lower, upper)
+    # normalized values shown in each axis. The bounds are stored in the
+    # layout metadata as {"normalize": {"lower": ..., "upper": ...}}.
+    span = bounds[1] - bounds[0]
+    axes = {}
+    for d, (lo, hi) in enumerate(ranges):
+        ticks = _nice_ticks(
+            bounds[0, d] + lo * span[d], bounds[0, d] + hi * span[d]
+        )
+        axes["xyz"[d] + "axis"] = dict(
+            tickmode="array",
+            tickvals=(ticks - bounds[0, d]) / span[d],
+            ticktext=[f"{t:.6g}" for t in ticks],
+        )
+    if len(ranges) == 3:
+        axes = dict(scene=axes)
+    figure.update_layout(axes)
+    meta = figure.layout.meta
+    meta = dict(meta) if isinstance(meta, dict) else {}
+    meta["normalize"] = dict(lower=bounds[0].tolist(), upper=bounds[1].tolist())
+    figure.layout.meta = meta
+
+
+def _get_extremes(
+    points_list,
+    maximise,
+    reference_point=None,
+    margin=0.05,
+    ranges=None,
+    log=None,
+):
+    """Return the best and worst extremes of each objective.
+
+    The extremes are taken from the axis ``ranges`` when given, otherwise
+    the worst extreme is the ``reference_point`` and the data bounds are
+    extended by ``margin`` times the range of each objective. For the
+    objectives where ``log`` is true, the margin is added to the range of
+    the logarithms of the values and the axis ranges are logarithms, as in
+    plotly, thus the extremes are positive.
+
+    Returns
+    -------
+        Array of shape ``(2, nobj)``, whose rows are the best and the worst
+        extremes of each objective.
+
+    """
+    lower = np.min([p.min(axis=0) for p in points_list], axis=0).astype(float)
+    upper = np.max([p.max(axis=0) for p in points_list], axis=0).astype(float)
+    log = np.zeros(len(lower), dtype=bool) if log is None else np.asarray(log)
+    lower[log] = np.log10(lower[log])
+    upper[log] = np.log10(upper[log])
+    span = upper - lower
+    span[span == 0] = 1.0
+    lower = lower - margin * span
+    upper = upper + margin * span
+    lower[log] = 10.0 ** lower[log]
+    upper[log] = 10.0 ** upper[log]
+    best = np.where(maximise, upper, lower)
+    worst = np.where(maximise, lower, upper)
+    if reference_point is not None:
+        reference_point = np.array(reference_point, dtype=float)
+        if reference_point.shape != worst.shape:
+            raise ValueError(
+                f"'reference_point' must have length {worst.shape[0]} (number of objectives)"
+            )
+        worst = reference_point
+    if ranges is not None:
+        for i, axis_range in enumerate(ranges):
+            if axis_range is None:
+                continue
+            lo, hi = sorted(axis_range)
+            if log[i]:
+                lo, hi = 10.0**lo, 10.0**hi
+            best[i], worst[i] = (hi, lo) if maximise[i] else (lo, hi)
+    return np.vstack([best, worst])
+
+
+def _set_log_axes(figure, log) -> None:
+    # Sets the type of the axes of the objectives where log is true.
+    axes = {
+        f"{axis}axis_type": "log" for axis, is_log in zip("xyz", log) if is_log
+    }
+    if len(log) == 3:
+        axes = {f"scene_{key}": value for key, value in axes.items()}
+    if axes:
+        figure.update_layout(axes)
+
+
 def _apply_default_themes(fig):
     # This theme may be preferable as it has a white background so could make for a more "scientific" look
     fig.update_layout(
@@ -220,6 +856,7 @@ def _gen_3d_mesh_plot(df, type):
                 z=df_one_set["Objective 3"],
                 opacity=0.85,
                 name="Set " + set,
+                legendgroup=set,
             ),
         )
         if "markers" in type:
@@ -229,6 +866,7 @@ def _gen_3d_mesh_plot(df, type):
                 y=df_one_set["Objective 2"],
                 z=df_one_set["Objective 3"],
                 name="Set " + set + " points",
+                legendgroup=set,
                 marker=dict(size=3),
             )
     fig.update_traces(showlegend=True)
@@ -299,6 +937,8 @@ def _get_cube_plot(dataset):
     cube_df = pd.DataFrame(np_cubes, columns=col_names)
     for s in cube_df["Set"].unique():
         set_n_df = cube_df[cube_df["Set"] == s]
+        # Same key of the set as the other plots, see _annotate_indicators().
+        key = str(int(s))
         num_cubes = set_n_df["Cube Number"].nunique()
         # Define the corners of all triangles in all cubes
         cube_indexs = _get_tri_indexs(num_cubes)
@@ -311,7 +951,8 @@ def _get_cube_plot(dataset):
                 j=cube_indexs[1, :],
                 k=cube_indexs[2, :],
                 showlegend=True,
-                name=f"Set {s}",
+                name=f"Set {key}",
+                legendgroup=key,
             )
         )
     fig.update_layout(
@@ -326,22 +967,49 @@ def _get_cube_plot(dataset):
     return fig
 
 
-def add_extremes(x, y, maximise):
-    best_x = np.max(x) if maximise[0] else np.min(x)
-    best_y = np.max(y) if maximise[1] else np.min(y)
-    dtype = np.finfo(x.dtype)
-    inf_x = dtype.min if maximise[0] else dtype.max
-    inf_y = dtype.min if maximise[1] else dtype.max
-    return np.concatenate([[best_x], x, [inf_x]]), np.concatenate(
-        [[inf_y], y, [best_y]]
-    )
+# Returns the points sorted from best to worst value of the first objective.
+def _sort_points(points, maximise):
+    order = np.argsort(points[:, 0], kind="stable")
+    if maximise[0]:
+        order = order[::-1]
+    return points[order]
+
+
+# Returns the stepped line of a set of nondominated points, see add_extremes().
+def _get_staircase(points, maximise, extremes):
+    points = _sort_points(points, maximise)
+    return add_extremes(points[:, 0], points[:, 1], maximise, extremes)
+
+
+# Points must be sorted from best to worst value of the first objective, thus
+# a "hv" step line gives the attainment surface whatever the objective
+# directions are. The line is clipped to the box given by extremes (see
+# _get_extremes()).
+def add_extremes(x, y, maximise, extremes):
+    # The lines keep the type of x and y, e.g., float32 (see coord_dtype of
+    # plot_pf()), whatever the type of extremes.
+    extremes = extremes.astype(x.dtype, copy=False)
+    new_x = np.empty(len(x) + 2, dtype=x.dtype)
+    new_y = np.empty(len(y) + 2, dtype=y.dtype)
+    new_x[0] = np.max(x) if maximise[0] else np.min(x)
+    new_x[1:-1] = x
+    new_x[-1] = extremes[1, 0]
+    new_y[0] = extremes[1, 1]
+    new_y[1:-1] = y
+    new_y[-1] = np.max(y) if maximise[1] else np.min(y)
+    lower = extremes.min(axis=0)
+    upper = extremes.max(axis=0)
+    np.clip(new_x, lower[0], upper[0], out=new_x)
+    np.clip(new_y, lower[1], upper[1], out=new_y)
+    return new_x, new_y
 
 
 # Create a fill plot -> Such as EAF percentile  plot.
 # If a figure is given, update the figure instead of creating a new one
-# If no name is given, the last column eg. Percentile is chosen.
+# If no name is given, the levels eg. Percentile are chosen.
 def create_2d_eaf_plot(
-    dataset,
+    levels,
+    points,
     colorway,
     fill_border_colours,
     figure=None,
@@ -349,25 +1017,71 @@ def create_2d_eaf_plot(
     names=None,
     line_dashes=None,
     line_width=None,
+    maximise=(False, False),
+    extremes=None,
 ) -> go.Figure:
-    # Get a line plot and sort by the last column eg. Set number or percentile
-    # FIXME: remove this recursion.
-    lines_plot = plot_pf(dataset, type="line", filter_dominated=False)
-    ordered_lines = sorted(lines_plot.data, key=lambda x: int(x["name"]))
-    float_inf = np.finfo(
-        np.float64
-    ).max  # Interpreted as infinite value by plotly
-
-    # Add an line to fill down from infinity to the last percentile
-    ordered_lines.append(
-        dict(x=np.array([0, float_inf]), y=np.array([float_inf, float_inf]))
+    figure = figure if figure else go.Figure()
+    figure.add_traces(
+        _get_2d_eaf_traces(
+            levels,
+            points,
+            colorway,
+            fill_border_colours,
+            type=type,
+            names=names,
+            line_dashes=line_dashes,
+            line_width=line_width,
+            maximise=maximise,
+            extremes=extremes,
+        )
     )
-    percentile_names = np.unique(dataset[:, -1]).astype(int)
-    num_percentiles = len(percentile_names)
+    return figure
 
-    # If figure argument is given, add to an existing figure, else create new
-    # figure.
-    figure = figure if figure else go.Figure()
+
+# Returns the traces of create_2d_eaf_plot() as a list of dictionaries. The
+# points of levels[i] are points[i], see EAFData.split().
+def _get_2d_eaf_traces(
+    levels,
+    points,
+    colorway,
+    fill_border_colours,
+    type="fill",
+    names=None,
+    line_dashes=None,
+    line_width=None,
+    maximise=(False, False),
+    extremes=None,
+    line_shape="hv",
+) -> list:
+    is_fill = "fill" in type
+    choose_mode = (
+        "lines"
+        if ("lines" in type or is_fill)
+        else ("markers" if "points" in type else "lines")
+    )
+    percentile_names = levels.astype(int)
+    num_percentiles = len(percentile_names)
+    if choose_mode == "markers":
+        # Markers are the points themselves, without the extremes of the
+        # lines or clipping.
+        ordered_lines = [
+            (q[:, 0], q[:, 1])
+            for q in (_sort_points(p, maximise) for p in points)
+        ]
+    else:
+        if extremes is None:
+            extremes = _get_extremes(points, maximise)
+        ordered_lines = [_get_staircase(p, maximise, extremes) for p in points]
+
+        # Add an line to fill from the worst extremes to the last percentile
+        dtype = ordered_lines[0][0].dtype if ordered_lines else float
+        (best_x, _), (inf_x, inf_y) = extremes
+        ordered_lines.append(
+            (
+                np.array([best_x, inf_x], dtype=dtype),
+                np.array([inf_y, inf_y], dtype=dtype),
+            )
+        )
 
     if names:
         if isinstance(names, str):
@@ -376,17 +1090,10 @@ def create_2d_eaf_plot(
             raise ValueError(
                 f"Names list (len {len(names)}) should equal number of different traces (len {num_percentiles})"
             )
-    line_dashes = parse_line_dash(
-        line_dashes, num_percentiles, default="solid"
-    )
+    line_dashes = parse_line_dash(line_dashes, num_percentiles, default="solid")
     line_width = parse_line_width(line_width, num_percentiles, default=2)
 
-    is_fill = "fill" in type
-    choose_mode = (
-        "lines"
-        if ("lines" in type or is_fill)
-        else ("markers" if "points" in type else "lines")
-    )
+    traces = []
     for i, line in enumerate(ordered_lines):
         # In fill graphs the first two traces should be the same colour
         # In non-fill graphs the last
@@ -403,14 +1110,15 @@ def create_2d_eaf_plot(
         line_colour = (
             fill_border_colours[name_i] if type == "fill" else colorway[name_i]
         )
-        figure.add_trace(
-            go.Scatter(
-                x=line["x"],
-                y=line["y"],
+        traces.append(
+            dict(
+                type="scatter",
+                x=line[0],
+                y=line[1],
                 mode=choose_mode,
                 fill="none" if (i == 0 or not is_fill) else "tonexty",
                 line={
-                    "shape": "hv",
+                    "shape": line_shape,
                     "dash": line_dashes[name_i],
                     "color": line_colour,
                     "width": line_width[name_i],
@@ -424,139 +1132,109 @@ def create_2d_eaf_plot(
                         is_fill
                         and i == 0
                         or not is_fill
-                        and i == len(ordered_lines) - 1
+                        and i == num_percentiles
                     )
                     else True
                 ),  # Don't show extra traces in case
             )
         )
-    return figure
+    return traces
 
 
-def _combine_2d_figures(
-    datasets,
+def _get_combined_2d_traces(
+    levels_list,
+    points_list,
     names,
     types,
     colorways,
     fill_border_colours,
     line_dashes,
     line_widths,
+    maximise=(False, False),
+    extremes=None,
+    line_shape="hv",
 ):
-    # Create a single 2d graph containing multiple different EAF plots
-    num_sets = [
-        len(np.unique(set[:, -1])) for set in datasets
-    ]  # A list containing the number of traces in each plot
-    # FIXME fix this colour thing
-    def_colours = colour.get_example_gradients(num_sets, choice="scientific")
-    def_line = colour.get_2d_colorway_from_colour(num_sets, "rgba(0,0,0,0.7)")
-
-    line_dashes = parse_2d_line_dash(line_dashes, num_sets, default="solid")
-    colourway = colour.parse_2d_colorway(colorways, def_colours, num_sets)
-    fill_border_colours = colour.parse_2d_colorway(
-        fill_border_colours, def_line, num_sets
-    )
-    line_widths = parse_2d_line_width(line_widths, num_sets, default=2)
-
-    combined_figure = go.Figure()
-    for i, dataset in enumerate(datasets):
-        combined_figure = create_2d_eaf_plot(
-            dataset,
-            colourway[i],
+    # Create the traces of a single 2d graph containing multiple different
+    # EAF plots. The style arguments are already parsed, see
+    # PlotStyle._get_2d_trace_style().
+    traces = []
+    for i, (levels, points) in enumerate(zip(levels_list, points_list)):
+        traces += _get_2d_eaf_traces(
+            levels,
+            points,
+            colorways[i],
             fill_border_colours[i],
-            figure=combined_figure,
             type=types[i],
             names=names[i],
             line_dashes=line_dashes[i],
             line_width=line_widths[i],
+            maximise=maximise,
+            extremes=extremes,
+            line_shape=line_shape,
         )
-    return combined_figure
-
-
-def apply_legend_preset(fig, preset: str = "centre_top_right"):
-    """Apply a preset to the legend, changing it's position, text or colour.
-
-    For more advanced legend behaviour.
-
-    Parameters
-    ----------
-    fig :
-        Figure to apply preset to
-    preset :
-        If `preset` is a string, this will change the position of the legend. It must be one of the following: "outside_top_right", "outside_top_left", "top_right", "bottom_right", "top_left", \
-        "bottom_left","centre_top_right", "centre_top_left","centre_bottom_right", "centre_bottom_left".
-
-        Set it to a list [preset_position_name, title_text, background_colour, border_colour] to change position, title text, background colour and border colour
-
-    """
-    colour = None
-    text = None
-    border_colour = None
-    if isinstance(preset, list):
-        position = preset[0]
-        text = preset[1]
-        colour = preset[2]
-        border_colour = preset[3]
-    elif isinstance(preset, dict):
-        position = preset.get("position")
-        text = preset.get("text")
-        colour = preset.get("colour")
-        border_colour = preset.get("border_colour")
-    elif isinstance(preset, str):
-        position = preset
+    return traces
+
+
+def _split_eaf_datasets(dataset, percentiles, dtype=None):
+    # Returns the names of the EAFs in dataset, which is either a single EAF
+    # (name None) or a dictionary of EAFs (dictionary interface of plot_eaf),
+    # and the levels and the points of each level of each EAF, keeping only
+    # the given percentiles. Each EAF is an array or an EAFData. If dtype is
+    # given, the points of the selected levels are converted to it.
+    if isinstance(dataset, dict):
+        names = list(dataset.keys())
+        eafs = list(dataset.values())
+        if not percentiles:
+            percentiles = [None] * len(eafs)
+        elif isinstance(percentiles[0], list):
+            # If You want to choose percentiles inside each algorithm, use 2d list
+            if len(percentiles) != len(dataset):
+                raise ValueError("percentile len != dataset len")
+        elif isinstance(percentiles[0], (int, float)):
+            # Use same percentiles for all datasets
+            percentiles = [percentiles] * len(eafs)
+        else:
+            raise TypeError("Incorrect type for percentiles")
     else:
-        raise TypeError("preset argument type not recognised")
-
-    pos_presets = dict(
-        outside_top_right=(1.02, 1),
-        outside_top_left=(-0.2, 1),
-        top_right=(1, 1),
-        bottom_right=(1, 0),
-        top_left=(0, 1),
-        bottom_left=(0, 0),
-        centre_top_right=(0.975, 0.95),
-        centre_top_left=(0.025, 0.95),
-        centre_bottom_right=(0.975, 0.05),
-        centre_bottom_left=(0.025, 0.05),
-    )
-    position = position if position else "centre_top_right"
-    xanchor = (
-        "left" if "left" in position or "outside" in position else "right"
-    )
-    yanchor = "top" if "top" in position or "outside" in position else "bottom"
-
-    colour = "rgba(0,0,0,0)" if colour == "invisible" else colour
-    border_colour = "rgba(0,0,0,0)" if colour == "invisible" else border_colour
-
-    fig.update_layout(
-        legend=dict(
-            x=pos_presets[position][0],
-            y=pos_presets[position][1],
-            xanchor=xanchor,
-            yanchor=yanchor,
-            bgcolor=colour,
-            bordercolor=border_colour,
-            borderwidth=0 if not border_colour else 2.5,
-        )
-    )
-    if text or text == "":
-        fig.update_layout(
-            legend=dict(
-                title_text=text,
-            )
-        )
+        names, eafs = [None], [dataset]
+        percentiles = [percentiles if percentiles else None]
+
+    levels_list, points_list = [], []
+    for eaf, eaf_percentiles in zip(eafs, percentiles):
+        if not isinstance(eaf, EAFData):
+            eaf = EAFData(eaf)
+        if dtype is not None and eaf.points.dtype != dtype:
+            if eaf_percentiles is not None:
+                eaf = eaf.select(eaf_percentiles)
+            eaf = eaf.astype(dtype)
+        levels, points = eaf.split(eaf_percentiles)
+        levels_list.append(levels)
+        points_list.append(points)
+    return names, levels_list, points_list
 
 
 def plot_eaf(
     dataset: ArrayLike,
     type: str = "fill",
-    percentiles: list = [],
-    colorway: list = [],
-    fill_border_colours: list = [],
-    trace_names: list = [],
+    percentiles: list | None = None,
+    colorway: list | None = None,
+    fill_border_colours: list | None = None,
+    trace_names: list | None = None,
     line_dashes: str = "solid",
-    line_width: list = [],
+    line_width: list | None = None,
     legend_preset: str = "centre_top_right",
     template: str = "simple_white",
+    maximise: bool | list[bool] = False,
+    reference_point: ArrayLike | None = None,
+    extremes_margin: float = 0.05,
+    style: PlotStyle | None = None,
+    indicators: str | list[str] | None = None,
+    coord_dtype: DTypeLike | None = None,
+    summarize: str | None = None,
+    n_rays: int = 32,
+    normalize: str | ArrayLike | None = None,
+    log_x: bool = False,
+    log_y: bool = False,
     **layout_kwargs,
 ) -> go.Figure:
     """Plot attainment surfaces in 2D.
@@ -566,6 +1244,8 @@ def plot_eaf(
     dataset :
         The `dataset` argument must be Numpy array of EAF values (2 objectives and percentile marker), or it can be a dictionary of such values. \
         The dictionary must have this format: {'alg_name_1' : dataset1, 'alg_name_2' : dataset2}.
+        Each EAF may also be an :class:`EAFData`, which avoids grouping the
+        points by percentile every time the EAF is plotted.
     percentiles :
         A list of percentiles to plot. These must exist in the dataset argument. If multiple datasets are provided, this can also be a list of lists - \
         selecting percentile groups for each algorithm (dictionary interface)
@@ -590,6 +1270,50 @@ def plot_eaf(
         See "preset" argument for function ``apply_legend_preset()``
     template :
         Choose layout template for the plot - see `Plotly template tutorial <https://plotly.com/python/templates/>`_ .  Default is "simple_white"
+    maximise :
+        Whether the objectives must be maximised instead of minimised. Either
+        a single boolean value that applies to both objectives or a list of
+        two boolean values. This must match the value used to compute the EAF.
+    reference_point, extremes_margin :
+        Extremes of the attainment surfaces, see :func:`plot_pf`. When
+        several datasets are given, the extremes are shared by all of them.
+    style :
+        A :class:`PlotStyle` that replaces the arguments ``colorway``,
+        ``fill_border_colours``, ``line_dashes``, ``line_width``,
+        ``legend_preset`` and ``template``. The style is resolved once and
+        reused by every figure created from it.
+    indicators :
+        Quality indicators to compute for each attainment surface, see
+        :func:`plot_pf`. The reference front of the indicators other than
+        'hv' is made of the nondominated points of all the plotted
+        surfaces. The values are stored in
+        ``fig.layout.meta["indicators"][name][indicator]``, where ``name``
+        is the original name of the trace of the surface.
+    coord_dtype :
+        Floating-point type of the coordinates of the traces, see
+        :func:`plot_pf`. Only the points of the selected percentiles are
+        converted.
+    summarize :
+        If ``'rays'``, each attainment surface is replaced by its
+        intersections with ``n_rays`` rays, see :meth:`EAFData.rays`, which
+        are joined by straight lines. The size of the figure does not depend
+        on the size of the EAF. The rays start at the best value of each
+        objective among all the plotted surfaces, thus the summaries of
+        several datasets are comparable.
+    n_rays :
+        Number of rays of ``summarize='rays'``.
+    normalize :
+        Scale each objective to about ``[0, 1]``, see :func:`plot_pf`. The
+        bounds are computed from the points of the selected percentiles of
+        all datasets, thus the surfaces of all algorithms share them. Only
+        the points of the selected percentiles are scaled, in place if they
+        were already copied from ``dataset``.
+    log_x, log_y :
+        Whether the axis of the first or the second objective is
+        logarithmic, see :func:`plot_pf`. The extremes shared by all
+        datasets are computed from the logarithms of the values. With
+        ``summarize='rays'``, the rays are computed from the logarithms of
+        the values, thus they are evenly spread in the figure.
     layout_kwargs :
         Update features of the graph such as title axis titles, colours etc. These additional parameters are passed to \
         plotly update_layout, See here for all the layout features that can be accessed: `Layout Plotly reference <https://plotly.com/python-api-reference/generated/plotly.graph_objects.Layout.html#plotly.graph_objects.Layout/>`_
@@ -603,58 +1327,128 @@ def plot_eaf(
     -----
     For more background, see :footcite:t:`LopPaqStu09emaa`.
 
+    This function does not modify its arguments and may be called
+    concurrently from several threads, also with the same :class:`PlotStyle`.
+    See :func:`plot_eaf_async` to call it from :mod:`asyncio` code.
+
     References
     ----------
     .. footbibliography::
 
     """
-    if isinstance(dataset, np.ndarray):
-        # Plot single EAF data
-        if percentiles:
-            # If specific values are given, only select data from these given percentiles
-            dataset = dataset[np.isin(dataset[:, -1], percentiles)]
-        num_percentiles = len(np.unique(dataset[:, -1]))
-        def_colours = colour.get_default_fill_colorway(num_percentiles)
-        colorway = colour.parse_colorway(
-            colorway if colorway else def_colours, num_percentiles
+    maximise = _parse_maximise(maximise, 2)
+    indicators = _parse_indicators(indicators)
+    log = np.array([log_x, log_y], dtype=bool)
+    if log.any() and normalize is not None:
+        raise ValueError(
+            "'normalize' cannot be combined with 'log_x' or 'log_y'"
         )
-        fill_border_colours = colour.parse_colorway(
-            fill_border_colours if fill_border_colours else def_colours,
-            num_percentiles,
+    if style is None:
+        style = PlotStyle(
+            colorway=colorway,
+            fill_border_colours=fill_border_colours,
+            line_dashes=line_dashes,
+            line_width=line_width,
+            legend_preset=legend_preset,
+            template=template,
+            **layout_kwargs,
         )
+        layout_kwargs = {}
+    ranges = _get_axis_ranges({**style.layout_kwargs, **layout_kwargs})
 
-        fig = create_2d_eaf_plot(
-            dataset,
+    names, levels_list, points_list = _split_eaf_datasets(
+        dataset, percentiles, coord_dtype
+    )
+    if normalize is not None:
+        bounds = _get_normalize_bounds(
+            normalize, [p for points in points_list for p in points], maximise
+        )
+        originals = [
+            eaf.points if isinstance(eaf, EAFData) else eaf
+            for eaf in (
+                dataset.values() if isinstance(dataset, dict) else [dataset]
+            )
+        ]
+        points_list = [
+            [
+                _normalise_points(
+                    p,
+                    bounds,
+                    copy=any(np.may_share_memory(p, o) for o in originals),
+                )
+                for p in points
+            ]
+            for points in points_list
+        ]
+        if reference_point is not None:
+            reference_point = _normalise_points(
+                np.array(reference_point, dtype=float), bounds, copy=False
+            )
+    all_points = [p for points in points_list for p in points]
+    if reference_point is not None:
+        _check_positive(all_points + [np.atleast_2d(reference_point)], log)
+    else:
+        _check_positive(all_points, log)
+    extremes = _get_extremes(
+        all_points,
+        maximise,
+        reference_point=reference_point,
+        margin=extremes_margin,
+        ranges=ranges,
+        log=log,
+    )
+    if indicators:
+        # Computed from the attainment surfaces, before they are replaced by
+        # their summaries.
+        indicator_values = _compute_indicators(
+            all_points, indicators, maximise, reference_point
+        )
+    line_shape = "hv"
+    if summarize is not None:
+        if summarize != "rays":
+            raise ValueError(
+                f"Unknown summarize='{summarize}', valid values are 'rays' and None"
+            )
+        if log.any():
+            # The rays are spread evenly in the logarithmic scale.
+            all_points = [p.copy() for p in all_points]
+            for p in all_points:
+                p[:, log] = np.log10(p[:, log])
+        summary = _summarise_rays(all_points, n_rays, maximise)
+        summary[:, log] = 10.0 ** summary[:, log]
+        counts = np.cumsum([0] + [len(points) for points in points_list])
+        points_list = [
+            list(summary.reshape(-1, n_rays, 2)[start:stop])
+            for start, stop in zip(counts[:-1], counts[1:])
+        ]
+        line_shape = "linear"
+    if not isinstance(dataset, dict):
+        # Plot single EAF data
+        colorway, fill_border_colours, line_dashes, line_width = (
+            style._get_trace_style(len(levels_list[0]))
+        )
+        traces = _get_2d_eaf_traces(
+            levels_list[0],
+            points_list[0],
             colorway,
             fill_border_colours,
             type=type,
             line_dashes=line_dashes,
             line_width=line_width,
+            maximise=maximise,
+            extremes=extremes,
+            line_shape=line_shape,
         )
-        fig.update_layout(
+        fig = style._make_figure(
+            traces,
             legend_title_text="Percentile",
-            xaxis_title="Objective 0",
-            yaxis_title="Objective 1",
             title="2D Empirical Attainment Function",
         )
 
-    elif isinstance(dataset, dict):
+    else:
         """Plot multiple Eaf data. Expect dictionaries with this format:
         {'alg_name' : dataset}
         """
-        if percentiles:
-            for i, (name, set) in enumerate(dataset.items()):
-                if isinstance(percentiles[0], list):
-                    # If You want to choose percentiles inside each algorithm, use 2d list
-                    if len(percentiles) != len(dataset):
-                        raise ValueError("percentile len != dataset len")
-                    dataset[name] = set[np.isin(set[:, -1], percentiles[i])]
-                elif isinstance(percentiles[0], (int, float)):
-                    # Use same percentiles for all datasets
-                    dataset[name] = set[np.isin(set[:, -1], percentiles)]
-                else:
-                    raise TypeError("Incorrect type for percentiles")
-
         if isinstance(type, str):
             # Set all types to be single type argument
             type = [type] * len(dataset)
@@ -663,29 +1457,43 @@ def plot_eaf(
                 "type list must be same length as dataset dictionary"
             )
 
-        traces_list = []  # Extract list with names from dict
-        names_list = []
-        for i, (name, set) in enumerate(dataset.items()):
-            names_list.append(name)
-            traces_list.append(set)
-
-        fig = _combine_2d_figures(
-            traces_list,
-            names_list,
+        # A list containing the number of traces in each plot
+        num_sets = [len(levels) for levels in levels_list]
+        traces = _get_combined_2d_traces(
+            levels_list,
+            points_list,
+            names,
             type,
-            colorway,
-            fill_border_colours,
-            line_dashes,
-            line_width,
+            *style._get_2d_trace_style(num_sets),
+            maximise=maximise,
+            extremes=extremes,
+            line_shape=line_shape,
         )
-        fig.update_layout(
+        fig = style._make_figure(
+            traces,
             legend_title_text="Algorithm",
-            xaxis_title="Objective 0",
-            yaxis_title="Objective 1",
             title="2d Empirical Attainment Function",
         )
-    apply_legend_preset(fig, legend_preset)
-    fig.update_layout(layout_kwargs, template=template)
+    if indicators:
+        _annotate_indicators(
+            fig,
+            [
+                str(int(level)) if name is None else f"{name} - {int(level)}"
+                for name, levels in zip(names, levels_list)
+                for level in levels
+            ],
+            indicators,
+            indicator_values,
+        )
+    if normalize is not None:
+        _set_original_ticks(
+            fig,
+            bounds,
+            np.column_stack([extremes.min(axis=0), extremes.max(axis=0)]),
+        )
+    _set_log_axes(fig, log)
+    if layout_kwargs:
+        fig.update_layout(layout_kwargs)
     if trace_names:
         # Change trace names
         current_names = [
@@ -702,7 +1510,3 @@ def plot_eaf(
             )
 
     return fig
-
-
-def diff_eaf_plot(x, y, n_intervals):
-    pass
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+class StaircasePyramid:
+    """Multi-resolution pyramid of the stepped lines of a figure.
+
+    Figures that compare large datasets may contain millions of vertices in
+    their stepped lines, which are too heavy to send to a browser. A
+    :class:`StaircasePyramid` precomputes, for each stepped line of a
+    figure created by :func:`plot_eaf` or :func:`plot_pf`, simplified
+    versions at increasing levels of detail. At level ``k``, the range of
+    each objective is divided into ``max_vertices / 2 * 2**k`` cells, and
+    consecutive vertices within the same cell are replaced by their best
+    corner, so the simplified line differs from the original by less than
+    one cell. Because stepped lines are monotone in both objectives, a line
+    visits at most ``max_vertices`` cells of the visible area at the level
+    that matches the zoom of the figure. On axes of type ``"log"``, e.g.,
+    with ``log_x=True``, the cells and the ranges are in the logarithmic
+    scale of the axis, as in plotly.
+
+    The figure is first shown with :attr:`figure`, which contains the
+    coarsest level. When the user zooms or pans, the browser sends the
+    ``plotly_relayout`` event to a server, which answers with
+    :func:`handle_relayout`.
+
+    Parameters
+    ----------
+    figure :
+        Figure whose stepped lines, i.e., traces with lines and
+        ``line_shape="hv"``, are simplified. Other traces are kept as they
+        are. The figure is not modified.
+    max_vertices :
+        Maximum number of vertices of each stepped line within the visible
+        area, approximately.
+
+    Attributes
+    ----------
+    traces : list[int]
+        Indexes of the simplified traces in the figure.
+    levels : list[list[tuple[numpy.ndarray, numpy.ndarray]]]
+        For each simplified trace, the coordinates ``(x, y)`` of the line at
+        each level of detail. The last level of each trace is the original
+        line, which is also used for larger levels.
+    bounds : numpy.ndarray
+        Array of shape ``(2, 2)`` with the minimum and maximum coordinates of
+        the simplified traces.
+
+    Examples
+    --------
+    >>> x = moocore.get_dataset("wrots_l100w10_dat.xz")
+    >>> eaf = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 50, 100])
+    >>> pyramid = mooplot.StaircasePyramid(mooplot.plot_eaf(eaf), max_vertices=50)
+    >>> fig = pyramid.figure
+    >>> update = mooplot.handle_relayout(
+    ...     pyramid,
+    ...     {
+    ...         "xaxis.range[0]": 5.8e6,
+    ...         "xaxis.range[1]": 5.9e6,
+    ...         "yaxis.range[0]": 5.6e6,
+    ...         "yaxis.range[1]": 5.7e6,
+    ...     },
+    ... )
+    >>> update["level"]
+    4
+
+    """
+
+    def __init__(self, figure: go.Figure, max_vertices: int = 2000):
+        self.max_vertices = max_vertices
+        self._log = np.array(
+            [
+                figure.layout.xaxis.type == "log",
+                figure.layout.yaxis.type == "log",
+            ]
+        )
+        self._cells = max(max_vertices // 2, 1)
+        self.traces = [
+            i for i, trace in enumerate(figure.data) if _is_staircase(trace)
+        ]
+        lines = [
+            (
+                np.asarray(figure.data[i].x, dtype=float),
+                np.asarray(figure.data[i].y, dtype=float),
+            )
+            for i in self.traces
+        ]
+        if lines:
+            x = np.concatenate([x for x, _ in lines])
+            y = np.concatenate([y for _, y in lines])
+            self.bounds = np.array([[x.min(), y.min()], [x.max(), y.max()]])
+        else:
+            self.bounds = np.array([[0.0, 0.0], [1.0, 1.0]])
+        # Bounds in the units of the axes.
+        self._axis_bounds = _to_axis_units(self.bounds, self._log)
+        self.levels = [self._build_levels(x, y) for x, y in lines]
+        self._figure = figure
+
+    def _cell_size(self, level: int) -> np.ndarray:
+        span = self._axis_bounds[1] - self._axis_bounds[0]
+        span[span == 0] = 1.0
+        return span / (self._cells * 2**level)
+
+    def _build_levels(self, x, y) -> list:
+        levels = []
+        # Levels that keep more than half of the vertices would use almost as
+        # much memory as the original line, which is used instead. The number
+        # of levels is also bounded by the floating-point resolution.
+        for level in range(48):
+            sx, sy = _simplify_staircase(
+                x, y, self._axis_bounds[0], self._cell_size(level), self._log
+            )
+            if 2 * len(sx) > len(x):
+                break
+            levels.append((sx, sy))
+        levels.append((x, y))
+        return levels
+
+    @property
+    def figure(self) -> go.Figure:
+        """Copy of the figure with the coarsest level of each stepped line."""
+        data = [trace.to_plotly_json() for trace in self._figure.data]
+        for i, levels in zip(self.traces, self.levels):
+            data[i]["x"], data[i]["y"] = levels[0]
+        return go.Figure(data=data, layout=self._figure.layout)
+
+    def get_level(self, x_range=None, y_range=None) -> int:
+        """Return the level of detail for the visible area.
+
+        Parameters
+        ----------
+        x_range, y_range :
+            Visible range of each axis, in the units of the axis, i.e., the
+            base-10 logarithm of the range on a logarithmic axis. By default,
+            the whole range of the stepped lines.
+
+        Returns
+        -------
+            The smallest level whose cells are small enough for the zoom,
+            which may be larger than the number of levels of some traces.
+
+        """
+        span = self._axis_bounds[1] - self._axis_bounds[0]
+        view = np.array(
+            [
+                np.ptp(r) if r is not None else s
+                for r, s in zip((x_range, y_range), span)
+            ],
+            dtype=float,
+        )
+        zoom = np.max(span / np.maximum(view, np.finfo(float).tiny))
+        return max(int(np.ceil(np.log2(max(zoom, 1.0)) - 1e-9)), 0)
+
+    def get_traces(self, x_range=None, y_range=None):
+        """Return the stepped lines for the visible area.
+
+        Each line is taken from the level given by :meth:`get_level`,
+        cropped to the visible area and clipped to a box slightly larger
+        than it. Clipping does not change the lines or the areas between
+        them within the box, thus filled areas are still correct.
+
+        Parameters
+        ----------
+        x_range, y_range :
+            Visible range of each axis, in the units of the axis, see
+            :meth:`get_level`. By default, the whole range of the stepped
+            lines.
+
+        Returns
+        -------
+        level : int
+            The level of detail.
+        lines : list[tuple[numpy.ndarray, numpy.ndarray]]
+            The coordinates ``(x, y)`` of each trace in :attr:`traces`.
+
+        """
+        level = self.get_level(x_range, y_range)
+        box = self.bounds.copy()
+        for i, r in enumerate((x_range, y_range)):
+            if r is not None:
+                lo, hi = sorted(r)
+                # Lines on the margin of the box are not visible.
+                margin = 0.1 * (hi - lo)
+                box[:, i] = lo - margin, hi + margin
+                if self._log[i]:
+                    box[:, i] = 10.0 ** box[:, i]
+        lines = []
+        for levels in self.levels:
+            x, y = levels[min(level, len(levels) - 1)]
+            lines.append(_crop_staircase(x, y, box))
+        return level, lines
+
+
+def handle_relayout(pyramid: StaircasePyramid, relayout_data: dict) -> dict:
+    """Answer a ``plotly_relayout`` event with the lines for the new zoom.
+
+    This function can be called by any web server that receives the
+    ``plotly_relayout`` event of a figure shown with
+    :attr:`StaircasePyramid.figure`, for example, with this JavaScript code:
+
+    .. code-block:: javascript
+
+       plot.on("plotly_relayout", async (event) => {
+         const response = await fetch("/relayout", {
+           method: "POST", body: JSON.stringify(event)});
+         const update = await response.json();
+         Plotly.restyle(plot, {x: update.x, y: update.y}, update.traces);
+       });
+
+    Parameters
+    ----------
+    pyramid :
+        The pyramid of the figure.
+    relayout_data :
+        Data of the ``plotly_relayout`` event, e.g.,
+        ``{"xaxis.range[0]": 0, "xaxis.range[1]": 1}``. Axes without a range,
+        or with ``autorange``, show the whole range of the stepped lines. As
+        in plotly, the range of a logarithmic axis is the base-10 logarithm
+        of the visible values.
+
+    Returns
+    -------
+        A dictionary that can be serialised as JSON with keys ``"level"``,
+        ``"traces"`` (indexes of the updated traces), ``"x"`` and ``"y"``
+        (coordinates of each updated trace).
+
+    """
+    ranges = []
+    for axis in ("xaxis", "yaxis"):
+        axis_range = relayout_data.get(f"{axis}.range")
+        if axis_range is None and f"{axis}.range[0]" in relayout_data:
+            axis_range = (
+                relayout_data[f"{axis}.range[0]"],
+                relayout_data[f"{axis}.range[1]"],
+            )
+        if relayout_data.get(f"{axis}.autorange"):
+            axis_range = None
+        ranges.append(
+            None if axis_range is None else [float(v) for v in axis_range]
+        )
+    level, lines = pyramid.get_traces(*ranges)
+    return {
+        "level": level,
+        "traces": list(pyramid.traces),
+        "x": [x.tolist() for x, _ in lines],
+        "y": [y.tolist() for _, y in lines],
+    }
+
+
+def _is_staircase(trace) -> bool:
+    return (
+        trace.type in ("scatter", "scattergl")
+        and trace.line.shape == "hv"
+        and trace.mode is not None
+        and "lines" in trace.mode
+        and trace.x is not None
+        and len(trace.x) > 0
+    )
+
+
+# Returns the stepped line (x, y) with consecutive vertices within the same
+# cell of a grid replaced by their best corner. The line is monotone in both
+# coordinates, so it visits each cell at most once. Vertices go from the best
+# to the worst value of x and from the worst to the best value of y, thus
+# the best corner is made of the first x and the last y of each cell. The
+# grid is in the units of the axes, i.e., log10 on the logarithmic axes.
+def _simplify_staircase(x, y, lower, cell, log=(False, False)):
+    cx = np.floor(((np.log10(x) if log[0] else x) - lower[0]) / cell[0])
+    cy = np.floor(((np.log10(y) if log[1] else y) - lower[1]) / cell[1])
+    new_cell = np.ones(len(x), dtype=bool)
+    new_cell[1:] = (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])
+    starts = np.flatnonzero(new_cell)
+    ends = np.append(starts[1:], len(x)) - 1
+    return x[starts], y[ends]
+
+
+# Returns the points as an array whose columns are in the units of the axes,
+# i.e., the base-10 logarithm of the values on the logarithmic axes given by
+# log.
+def _to_axis_units(points, log):
+    points = np.array(points, dtype=float)
+    log = np.asarray(log, dtype=bool)
+    if log.any():
+        points[:, log] = np.log10(points[:, log])
+    return points
+
+
+# Returns the positions [start, stop) of the values of the monotone array v
+# within [lo, hi].
+def _monotone_range(v, lo, hi):
+    if v[0] > v[-1]:
+        v, lo, hi = -v, -hi, -lo
+    return np.searchsorted(v, lo, "left"), np.searchsorted(v, hi, "right")
+
+
+# Returns the part of the stepped line (x, y) within box, clipped to it. Both
+# x and y are monotone, thus the vertices within box are consecutive. The
+# first and last vertices, and the vertices next to those within box, keep
+# the clipped line equal to the original line within box.
+def _crop_staircase(x, y, box):
+    n = len(x)
+    x_start, x_stop = _monotone_range(x, box[0, 0], box[1, 0])
+    y_start, y_stop = _monotone_range(y, box[0, 1], box[1, 1])
+    start = max(x_start, y_start)
+    stop = min(x_stop, y_stop)
+    idx = np.concatenate(
+        [[0, start - 1, start, stop - 1, stop, n - 1], np.arange(start, stop)]
+    )
+    idx = np.unique(np.clip(idx, 0, n - 1))
+    x = np.clip(x[idx], box[0, 0], box[1, 0])
+    y = np.clip(y[idx], box[0, 1], box[1, 1])
+    # Remove repeated vertices, e.g., those clipped to the same corner.
+    keep = np.ones(len(x), dtype=bool)
+    keep[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+    return x[keep], y[keep]
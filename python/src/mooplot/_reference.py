@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import numpy as np
+import moocore
+
+# Maximum number of (point, reference point, objective) differences computed
+# at once by _ReferenceIndex._query_chunks().
+_chunk_size = 2**22
+
+
+class _ReferenceIndex:
+    """Index of a reference front for proximity queries.
+
+    The nondominated points of the reference front are sorted once by the
+    first objective. Queries compute, for a batch of points and without
+    Python loops over the points:
+
+    - the Euclidean distance to the nearest reference point;
+    - the additive epsilon of each point, that is, the smallest value that
+      subtracted from (added to, when maximising) all its objectives gives a
+      point that weakly dominates a reference point, which is negative if the
+      point strictly dominates a reference point;
+    - the reference point that weakly dominates the point with the smallest
+      additive epsilon, if any.
+
+    With 2 objectives, the additive epsilon and the dominating point are
+    found by bisection of the sorted front, and the nearest point is searched
+    by walking along the front away from the point of smallest epsilon only
+    while closer points may exist. Otherwise, the points are compared with
+    all reference points, in chunks of bounded memory.
+
+    """
+
+    def __init__(self, reference, maximise) -> None:
+        reference = np.asarray(reference, dtype=float)
+        if reference.ndim != 2 or len(reference) == 0:
+            raise ValueError(
+                "'reference' must be a non-empty 2D array with one point per row"
+            )
+        if reference.shape[1] != len(maximise):
+            raise ValueError(
+                f"'reference' must have {len(maximise)} columns (number of objectives)"
+            )
+        # Points are stored as if all objectives were minimised.
+        self.sign = np.where(maximise, -1.0, 1.0)
+        reference = moocore.filter_dominated(reference * self.sign)
+        self.reference = reference[np.lexsort(reference.T[::-1])]
+
+    def query(self, points):
+        """Return the proximity of each point to the reference front.
+
+        Returns
+        -------
+        distance : numpy.ndarray
+            Distance to the nearest reference point.
+        epsilon : numpy.ndarray
+            Additive epsilon of each point.
+        dominating : numpy.ndarray
+            Index in :attr:`reference` of the reference point that weakly
+            dominates each point with the smallest additive epsilon, or
+            ``-1`` if no reference point dominates it.
+
+        """
+        points = np.asarray(points, dtype=float) * self.sign
+        if points.shape[1] == 2:
+            return self._query_2d(points)
+        return self._query_chunks(points)
+
+    def get_customdata(self, points) -> np.ndarray:
+        # Returns the columns distance, epsilon and the coordinates of the
+        # dominating reference point (NaN if there is none) of each point.
+        distance, epsilon, dominating = self.query(points)
+        dominating_points = self.reference[dominating] * self.sign
+        dominating_points[dominating < 0] = np.nan
+        return np.column_stack([distance, epsilon, dominating_points])
+
+    def _query_2d(self, points):
+        rx, ry = self.reference[:, 0], self.reference[:, 1]
+        px, py = points[:, 0], points[:, 1]
+        n = len(rx)
+        # rx is increasing and ry is decreasing, thus px - rx decreases and
+        # py - ry increases along the front and max(px - rx, py - ry) is
+        # minimal next to the position k where they cross.
+        k = np.searchsorted(rx - ry, px - py, side="left")
+
+        def chebyshev(i):
+            return np.maximum(px - rx[i], py - ry[i])
+
+        def best_of(first, second):
+            return np.where(
+                chebyshev(first) <= chebyshev(second), first, second
+            )
+
+        below = np.clip(k - 1, 0, n - 1)
+        above = np.clip(k, 0, n - 1)
+        nearest = best_of(below, above)
+        epsilon = chebyshev(nearest)
+
+        # The reference points that weakly dominate a point are those in
+        # [first, last).
+        last = np.searchsorted(rx, px, side="right")
+        first = np.searchsorted(-ry, -py, side="left")
+        has_dominating = first < last
+        first = np.minimum(first, n - 1)
+        last = np.maximum(last - 1, first)
+        dominating = best_of(
+            np.clip(below, first, last), np.clip(above, first, last)
+        )
+        dominating = np.where(has_dominating, dominating, -1)
+
+        # Walk along the front away from the candidate nearest point in both
+        # directions. Going right, rx - px and py - ry only grow, and going
+        # left, px - rx and ry - py only grow, thus each walk stops once they
+        # exceed the distance to the nearest point found so far.
+        distance = np.hypot(px - rx[nearest], py - ry[nearest])
+        for step in (1, -1):
+            active = np.arange(len(points))
+            i = nearest + step
+            while len(active):
+                keep = (i >= 0) & (i < n)
+                active, i = active[keep], i[keep]
+                gap = np.maximum(
+                    step * (rx[i] - px[active]), step * (py[active] - ry[i])
+                )
+                keep = gap < distance[active]
+                active, i = active[keep], i[keep]
+                distance[active] = np.minimum(
+                    distance[active],
+                    np.hypot(px[active] - rx[i], py[active] - ry[i]),
+                )
+                i = i + step
+        return distance, epsilon, dominating
+
+    def _query_chunks(self, points):
+        reference = self.reference
+        m = len(points)
+        distance = np.empty(m)
+        epsilon = np.empty(m)
+        dominating = np.empty(m, dtype=np.intp)
+        step = max(1, _chunk_size // reference.size)
+        for start in range(0, m, step):
+            diff = points[start : start + step, None, :] - reference
+            chebyshev = diff.max(axis=-1)
+            distance[start : start + step] = np.sqrt(
+                np.einsum("ijk,ijk->ij", diff, diff).min(axis=1)
+            )
+            epsilon[start : start + step] = chebyshev.min(axis=1)
+            chebyshev[diff.min(axis=-1) < 0] = np.inf
+            best = chebyshev.argmin(axis=1)
+            best[np.isinf(chebyshev[np.arange(len(best)), best])] = -1
+            dominating[start : start + step] = best
+        return distance, epsilon, dominating
+
+
+def _annotate_reference(
+    figure, index: _ReferenceIndex, normalized: bool = False
+) -> None:
+    # Attaches the proximity to the reference front of the points of all
+    # scatter traces with markers as customdata and shows it in their hover
+    # text. Other traces, e.g., lines, also contain extremes and the corners
+    # of the staircases, which are not points of the sets. All the points are
+    # queried in a single batch. If normalized, the points and the reference
+    # front have been normalized, and so are the values.
+    dim = index.reference.shape[1]
+    axes = "xyz"[:dim]
+    traces = [
+        trace
+        for trace in figure.data
+        if trace.type in ("scatter", "scattergl", "scatter3d")
+        and trace.x is not None
+        and "markers" in (trace.mode or "")
+    ]
+    if not traces:
+        return
+    coords = [
+        np.column_stack([np.asarray(trace[a], dtype=float) for a in axes])
+        for trace in traces
+    ]
+    customdata = index.get_customdata(np.concatenate(coords))
+    dominating = ", ".join(f"%{{customdata[{2 + d}]:.4g}}" for d in range(dim))
+    note = " (normalized)" if normalized else ""
+    hover = (
+        f"Distance to reference{note}=%{{customdata[0]:.4g}}"
+        f"<br>eps+{note}=%{{customdata[1]:.4g}}"
+        f"<br>Dominated by{note}=({dominating})"
+    )
+    start = 0
+    for trace, c in zip(traces, coords):
+        trace.customdata = customdata[start : start + len(c)]
+        start += len(c)
+        template = trace.hovertemplate
+        if template:
+            head, extra, tail = template.partition("<extra>")
+            trace.hovertemplate = head + "<br>" + hover + extra + tail
+        else:
+            trace.hovertemplate = (
+                "<br>".join(
+                    f"Objective {d + 1}=%{{{a}}}" for d, a in enumerate(axes)
+                )
+                + "<br>"
+                + hover
+            )
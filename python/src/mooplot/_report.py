@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import html
+import os
+
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+# Keys of the figure whose values are usually the same in many figures of a
+# report and are stored once, see _extract_shared().
+_shared_keys = ("template", "colorscale")
+
+_style = """\
+body { font-family: sans-serif; margin: 2em auto; max-width: 1200px; }
+.mooplot-figure { width: 100%; margin-bottom: 1em; }
+.mooplot-figure:empty { background: #f4f4f4; }"""
+
+# Plots each figure the first time that it scrolls into view. Values of
+# _shared_keys are replaced by {"_shared": index} in the stored figures.
+_loader = """\
+(function () {
+  const shared = JSON.parse(document.getElementById("mooplot-shared").text);
+  const resolve = (value) => {
+    if (Array.isArray(value)) return value.map(resolve);
+    if (value === null || typeof value !== "object") return value;
+    if (Object.keys(value).length === 1 && "_shared" in value)
+      return shared[value._shared];
+    const result = {};
+    for (const key in value) result[key] = resolve(value[key]);
+    return result;
+  };
+  const plot = (div) => {
+    const script = document.getElementById(div.dataset.figure);
+    const figure = resolve(JSON.parse(script.text));
+    figure.config = {responsive: true};
+    Plotly.newPlot(div, figure);
+  };
+  const divs = document.querySelectorAll(".mooplot-figure");
+  if (!("IntersectionObserver" in window)) {
+    divs.forEach(plot);
+    return;
+  }
+  const observer = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+      if (entry.isIntersecting) {
+        observer.unobserve(entry.target);
+        plot(entry.target);
+      }
+    }
+  }, {rootMargin: "200px"});
+  divs.forEach((div) => observer.observe(div));
+})();"""
+
+
+def report(
+    sections,
+    filename=None,
+    title: str = "mooplot report",
+    include_plotlyjs: bool | str = True,
+) -> str:
+    """Create a single HTML page with many figures.
+
+    Writing each figure with :meth:`plotly.graph_objects.Figure.write_html`
+    includes plotly.js (several MB) and the layout template in every figure.
+    Instead, the page created by this function loads plotly.js once, stores
+    the templates and colour scales shared by several figures once, and
+    plots each figure only when it scrolls into view, thus pages with dozens
+    of figures are small and open fast.
+
+    Parameters
+    ----------
+    sections :
+        Either a dictionary that maps the heading of each section to its
+        figures, or a sequence of ``(heading, figures)`` pairs, where
+        ``figures`` is a figure or a list of figures, e.g., created by
+        :func:`plot_eaf` or :func:`plot_pf`. A heading of ``None`` creates a
+        section without heading. The frames of animations, e.g., created by
+        :func:`plot_pf_animation`, are kept.
+    filename :
+        If given, the page is written to this file.
+    title :
+        Title of the page, also shown as its first heading.
+    include_plotlyjs :
+        How the page loads plotly.js. ``True`` includes it in the page, so
+        the page works offline, ``'cdn'`` loads it from the plotly CDN, and
+        ``'directory'`` loads ``plotly.min.js`` from the directory of
+        ``filename``, where it is written if it does not exist. A string
+        ending in ``.js`` is used as the URL of plotly.js.
+
+    Returns
+    -------
+        The HTML of the page.
+
+    Examples
+    --------
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> eaf = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 50, 100])
+    >>> page = mooplot.report(
+    ...     {
+    ...         "Attainment surfaces": [
+    ...             mooplot.plot_eaf(eaf, type="fill"),
+    ...             mooplot.plot_eaf(eaf, type="lines"),
+    ...         ],
+    ...         "Pareto fronts": mooplot.plot_pf(x, type="points,lines"),
+    ...     },
+    ...     include_plotlyjs="cdn",
+    ... )
+    >>> page.count('class="mooplot-figure"')
+    3
+    >>> mooplot.report(
+    ...     {"EAF": mooplot.plot_eaf(eaf)}, filename="report.html"
+    ... )  # doctest: +SKIP
+
+    """
+    if isinstance(sections, dict):
+        sections = sections.items()
+    shared = {}
+    body = [f"<h1>{html.escape(title)}</h1>"]
+    scripts = []
+    n_figures = 0
+    for heading, figures in sections:
+        if isinstance(figures, (go.Figure, dict)):
+            figures = [figures]
+        body.append("<section>")
+        if heading is not None:
+            body.append(f"<h2>{html.escape(str(heading))}</h2>")
+        for figure in figures:
+            if isinstance(figure, go.Figure):
+                figure = figure.to_plotly_json()
+            frames = figure.get("frames")
+            figure = {
+                "data": figure.get("data", []),
+                "layout": figure.get("layout", {}),
+            }
+            if frames:
+                # E.g., figures of plot_pf_animation().
+                figure["frames"] = frames
+            height = figure["layout"].get("height") or 450
+            figure = _extract_shared(figure, shared)
+            figure_id = f"mooplot-figure-{n_figures}"
+            n_figures += 1
+            body.append(
+                f'<div class="mooplot-figure" data-figure="{figure_id}"'
+                f' style="height: {height}px"></div>'
+            )
+            scripts.append(_json_script(figure_id, figure))
+        body.append("</section>")
+    scripts.insert(
+        0, _json_script("mooplot-shared", [item for _, item in shared.values()])
+    )
+
+    page = "\n".join(
+        [
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            '<meta charset="utf-8">',
+            f"<title>{html.escape(title)}</title>",
+            f"<style>\n{_style}\n</style>",
+            "</head>",
+            "<body>",
+            *body,
+            *scripts,
+            _plotlyjs_script(include_plotlyjs),
+            f"<script>\n{_loader}\n</script>",
+            "</body>",
+            "</html>",
+            "",
+        ]
+    )
+    if filename is not None:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(page)
+        if include_plotlyjs == "directory":
+            bundle = os.path.join(
+                os.path.dirname(os.path.abspath(filename)), "plotly.min.js"
+            )
+            if not os.path.exists(bundle):
+                with open(bundle, "w", encoding="utf-8") as f:
+                    f.write(get_plotlyjs())
+    return page
+
+
+def _extract_shared(value, shared: dict):
+    # Returns value with the values of _shared_keys replaced by
+    # {"_shared": index}, where shared maps the JSON of each distinct value to
+    # its index and the value itself. Arrays are not traversed.
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key in _shared_keys and item is not None:
+                text = to_json_plotly(item)
+                if text not in shared:
+                    shared[text] = (len(shared), item)
+                result[key] = {"_shared": shared[text][0]}
+            else:
+                result[key] = _extract_shared(item, shared)
+        return result
+    if isinstance(value, (list, tuple)):
+        return [_extract_shared(item, shared) for item in value]
+    return value
+
+
+def _json_script(script_id: str, value) -> str:
+    # The JSON is not parsed until the figure is plotted. "</" is escaped so
+    # that strings in the figure cannot close the script element.
+    text = to_json_plotly(value).replace("</", "<\\/")
+    return f'<script type="application/json" id="{script_id}">{text}</script>'
+
+
+def _plotlyjs_script(include_plotlyjs) -> str:
+    if include_plotlyjs == "cdn":
+        url = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+    elif include_plotlyjs == "directory":
+        url = "plotly.min.js"
+    elif isinstance(include_plotlyjs, str) and include_plotlyjs.endswith(".js"):
+        url = include_plotlyjs
+    elif include_plotlyjs is True:
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    elif not include_plotlyjs:
+        return ""
+    else:
+        raise ValueError(
+            f"Invalid include_plotlyjs={include_plotlyjs!r}, valid values are True, False, 'cdn', 'directory' or the URL of a .js file"
+        )
+    return f'<script charset="utf-8" src="{html.escape(url)}"></script>'
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import threading
+
+import plotly.graph_objects as go
+
+from . import colour
+from ._utils import (
+    parse_line_dash,
+    parse_2d_line_dash,
+    parse_line_width,
+    parse_2d_line_width,
+)
+
+
+def apply_legend_preset(fig, preset: str = "centre_top_right"):
+    """Apply a preset to the legend, changing it's position, text or colour.
+
+    For more advanced legend behaviour.
+
+    Parameters
+    ----------
+    fig :
+        Figure to apply preset to
+    preset :
+        If `preset` is a string, this will change the position of the legend. It must be one of the following: "outside_top_right", "outside_top_left", "top_right", "bottom_right", "top_left", \
+        "bottom_left","centre_top_right", "centre_top_left","centre_bottom_right", "centre_bottom_left".
+
+        Set it to a list [preset_position_name, title_text, background_colour, border_colour] to change position, title text, background colour and border colour
+
+    """
+    colour = None
+    text = None
+    border_colour = None
+    if isinstance(preset, list):
+        position = preset[0]
+        text = preset[1]
+        colour = preset[2]
+        border_colour = preset[3]
+    elif isinstance(preset, dict):
+        position = preset.get("position")
+        text = preset.get("text")
+        colour = preset.get("colour")
+        border_colour = preset.get("border_colour")
+    elif isinstance(preset, str):
+        position = preset
+    else:
+        raise TypeError("preset argument type not recognised")
+
+    pos_presets = dict(
+        outside_top_right=(1.02, 1),
+        outside_top_left=(-0.2, 1),
+        top_right=(1, 1),
+        bottom_right=(1, 0),
+        top_left=(0, 1),
+        bottom_left=(0, 0),
+        centre_top_right=(0.975, 0.95),
+        centre_top_left=(0.025, 0.95),
+        centre_bottom_right=(0.975, 0.05),
+        centre_bottom_left=(0.025, 0.05),
+    )
+    position = position if position else "centre_top_right"
+    xanchor = "left" if "left" in position or "outside" in position else "right"
+    yanchor = "top" if "top" in position or "outside" in position else "bottom"
+
+    colour = "rgba(0,0,0,0)" if colour == "invisible" else colour
+    border_colour = "rgba(0,0,0,0)" if colour == "invisible" else border_colour
+
+    fig.update_layout(
+        legend=dict(
+            x=pos_presets[position][0],
+            y=pos_presets[position][1],
+            xanchor=xanchor,
+            yanchor=yanchor,
+            bgcolor=colour,
+            bordercolor=border_colour,
+            borderwidth=0 if not border_colour else 2.5,
+        )
+    )
+    if text or text == "":
+        fig.update_layout(
+            legend=dict(
+                title_text=text,
+            )
+        )
+
+
+class PlotStyle:
+    """Reusable styling of :func:`plot_eaf` figures.
+
+    Resolving colourways, line dashes, line widths, the legend preset and the
+    layout template takes longer than plotting small datasets. A
+    :class:`PlotStyle` resolves them once, when first needed, and figures
+    created from it only have to fill in their traces. This is useful when
+    creating many figures that look the same. A :class:`PlotStyle` may be
+    shared by several threads.
+
+    Parameters
+    ----------
+    colorway, fill_border_colours, line_dashes, line_width, legend_preset, template :
+        See :func:`plot_eaf`.
+    layout_kwargs :
+        Update features of the graph such as title axis titles, colours etc.
+        See :func:`plot_eaf`.
+
+    Examples
+    --------
+    >>> style = mooplot.PlotStyle(colorway="darkblue", legend_preset="top_right")
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> eaf = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 50, 100])
+    >>> figs = [mooplot.plot_eaf(eaf, style=style) for _ in range(3)]
+
+    """
+
+    def __init__(
+        self,
+        colorway=None,
+        fill_border_colours=None,
+        line_dashes="solid",
+        line_width=None,
+        legend_preset="centre_top_right",
+        template: str = "simple_white",
+        **layout_kwargs,
+    ):
+        self.colorway = colorway
+        self.fill_border_colours = fill_border_colours
+        self.line_dashes = line_dashes
+        self.line_width = line_width
+        self.legend_preset = legend_preset
+        self.template = template
+        self.layout_kwargs = layout_kwargs
+        # Caches of resolved values, indexed by number of traces or by
+        # legend and plot titles.
+        self._styles = {}
+        self._layouts = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _cached(self, cache: dict, key, resolve):
+        # Returns cache[key], calling resolve() to compute it only once even
+        # if several threads ask for it at the same time.
+        value = cache.get(key)
+        if value is None:
+            with self._lock:
+                value = cache.get(key)
+                if value is None:
+                    value = cache[key] = resolve()
+        return value
+
+    def _get_trace_style(self, num_percentiles: int):
+        # Returns colorway, fill_border_colours, line_dashes and line_width
+        # for a single dataset with num_percentiles traces.
+        return self._cached(
+            self._styles,
+            num_percentiles,
+            lambda: self._resolve_trace_style(num_percentiles),
+        )
+
+    def _resolve_trace_style(self, num_percentiles: int):
+        def_colours = colour.get_default_fill_colorway(num_percentiles)
+        return (
+            colour.parse_colorway(
+                self.colorway if self.colorway else def_colours,
+                num_percentiles,
+            ),
+            colour.parse_colorway(
+                self.fill_border_colours
+                if self.fill_border_colours
+                else def_colours,
+                num_percentiles,
+            ),
+            parse_line_dash(self.line_dashes, num_percentiles, default="solid"),
+            parse_line_width(self.line_width, num_percentiles, default=2),
+        )
+
+    def _get_2d_trace_style(self, num_sets: list):
+        # Same as _get_trace_style() for several datasets, where num_sets
+        # gives the number of traces of each dataset.
+        return self._cached(
+            self._styles,
+            tuple(num_sets),
+            lambda: self._resolve_2d_trace_style(num_sets),
+        )
+
+    def _resolve_2d_trace_style(self, num_sets: list):
+        # FIXME fix this colour thing
+        def_colours = colour.get_example_gradients(
+            num_sets, choice="scientific"
+        )
+        def_line = colour.get_2d_colorway_from_colour(
+            num_sets, "rgba(0,0,0,0.7)"
+        )
+        return (
+            colour.parse_2d_colorway(self.colorway, def_colours, num_sets),
+            colour.parse_2d_colorway(
+                self.fill_border_colours, def_line, num_sets
+            ),
+            parse_2d_line_dash(self.line_dashes, num_sets, default="solid"),
+            parse_2d_line_width(self.line_width, num_sets, default=2),
+        )
+
+    def _get_layout(self, legend_title_text: str, title: str) -> dict:
+        # Returns the validated layout of the figure as a dictionary.
+        return self._cached(
+            self._layouts,
+            (legend_title_text, title),
+            lambda: self._resolve_layout(legend_title_text, title),
+        )
+
+    def _resolve_layout(self, legend_title_text: str, title: str) -> dict:
+        fig = go.Figure()
+        fig.update_layout(
+            legend_title_text=legend_title_text,
+            xaxis_title="Objective 0",
+            yaxis_title="Objective 1",
+            title=title,
+        )
+        apply_legend_preset(fig, self.legend_preset)
+        fig.update_layout(self.layout_kwargs, template=self.template)
+        return fig.layout.to_plotly_json()
+
+    def _make_figure(self, traces: list, legend_title_text: str, title: str):
+        # The traces are created by mooplot and the layout has been validated
+        # by _get_layout(), so they are not validated again, which is by far
+        # the most expensive step for small figures.
+        return _make_figure_unvalidated(
+            data=traces, layout=self._get_layout(legend_title_text, title)
+        )
+
+
+def _make_figure_unvalidated(**kwargs) -> go.Figure:
+    # Creates a go.Figure from data created by mooplot without validating it
+    # and enables validation afterwards for any user updates. This relies on
+    # private attributes of plotly, thus the figure is created and validated
+    # normally if they are not available.
+    try:
+        fig = go.Figure(**kwargs, _validate=False)
+        objs = [fig, fig._layout_obj, *fig.data]
+        if not all(hasattr(obj, "_validate") for obj in objs):
+            raise AttributeError("_validate")
+    except (TypeError, AttributeError):
+        return go.Figure(**kwargs)
+    for obj in objs:
+        obj._validate = True
+    return fig
@@ -1,10 +1,19 @@
+from __future__ import annotations
+
+import functools
+from collections.abc import Hashable
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+
 def _parse_plot_type(plot_type: str, dimension: int):
     if not isinstance(plot_type, str):
         raise TypeError("plot 'type' must be a string")
     plot_type = plot_type.replace(" ", "").lower().split(",")
     if len(plot_type) > 2:
         raise ValueError(f"Too many commas in plot 'type={plot_type}'")
-    allowed_types = ["lines", "points", "surface", "cube", "fill"]
+    allowed_types = ["lines", "points", "surface", "cube", "fill", "density"]
     selected_types = [
         t for t in allowed_types if any(t.startswith(x) for x in plot_type)
     ]
@@ -15,6 +24,10 @@ def _parse_plot_type(plot_type: str, dimension: int):
         raise ValueError(
             "Plot types 'surface' and 'cube' are only valid for plotting 3 objectives"
         )
+    if dimension == 3 and "density" in selected_types:
+        raise ValueError(
+            "Plot type 'density' is only valid for plotting 2 objectives"
+        )
 
     if "points" in selected_types:
         if "lines" in selected_types:
@@ -31,104 +44,273 @@ def _parse_plot_type(plot_type: str, dimension: int):
         return "cube"
     elif "fill" in selected_types:
         return "fill"
+    elif "density" in selected_types:
+        return "density"
     else:
         raise ValueError(f"Plot 'type={plot_type} not recognised")
 
 
-# FIXME Seems like these similar parsing functions can be combined
-def parse_line_dash(dash, size, default):
-    dash_parsed = dash if dash else default
-    allowed_names = [
-        "solid",
-        "dot",
-        "dash",
-        "longdash",
-        "dashdot",
-        "longdashdot",
-    ]
-    if isinstance(dash_parsed, str):
-        if dash_parsed not in allowed_names:
-            raise ValueError(
-                f"'{dash_parsed}' not recognised as line dash type. Allowed types are {allowed_names}"
-            )
-        dash_parsed = [dash_parsed] * size
-    elif isinstance(dash_parsed, list):
-        if False in [d in allowed_names for d in dash_parsed]:
-            raise ValueError(
-                f"Dash list {dash_parsed} contains an unrecognised dash type.\nAllowed types are {allowed_names}"
-            )
-        dash_parsed = (
-            dash_parsed * (size // len(dash_parsed))
-            + dash_parsed[: size % len(dash_parsed)]
-        )  # Make list same length as size, repeating if its smaller
+def _parse_maximise(maximise, nobj: int):
+    """Return a boolean array with one value per objective."""
+    maximise = np.atleast_1d(np.asarray(maximise, dtype=bool))
+    if maximise.shape[0] == 1:
+        return np.full(nobj, maximise[0])
+    if maximise.ndim != 1 or maximise.shape[0] != nobj:
+        raise ValueError(
+            f"'maximise' must have length 1 or {nobj} (number of objectives)"
+        )
+    return maximise
+
+
+def _get_axis_ranges(layout_kwargs: dict):
+    """Return the x and y axis ranges set in the layout arguments, if any."""
+    ranges = []
+    for axis in ("xaxis", "yaxis"):
+        axis_range = layout_kwargs.get(f"{axis}_range")
+        if axis_range is None and layout_kwargs.get(axis) is not None:
+            try:
+                axis_range = layout_kwargs[axis]["range"]
+            except KeyError:
+                pass
+        ranges.append(axis_range)
+    return ranges
+
+
+def _parse_assume(assume: str | None):
+    """Return a pair of booleans ``(nondominated, sorted)``."""
+    if not assume:
+        return False, False
+    if not isinstance(assume, str):
+        raise TypeError("'assume' must be a string")
+    # Empty items, e.g., of a trailing comma, would match every value.
+    assume = [a for a in assume.replace(" ", "").lower().split(",") if a]
+    allowed = ["nondominated", "sorted"]
+    unknown = [a for a in assume if not any(t.startswith(a) for t in allowed)]
+    if unknown:
+        raise ValueError(
+            f"'assume={unknown[0]}' not recognised. Allowed values are {allowed}"
+        )
+    return (
+        any("nondominated".startswith(a) for a in assume),
+        any("sorted".startswith(a) for a in assume),
+    )
+
+
+def _check_sorted_within_sets(x, offsets, descending: bool = False):
+    """Check in O(n) that ``x`` is sorted within each set.
+
+    The values of the i-th set are ``x[offsets[i]:offsets[i + 1]]``, see
+    :class:`FrontSet`.
+    """
+    if descending:
+        unsorted = x[1:] > x[:-1]
     else:
-        raise TypeError(
-            f"type {type(dash)} not recognised for dashed line argument"
+        unsorted = x[1:] < x[:-1]
+    # Pairs of consecutive values that belong to different sets.
+    unsorted[offsets[1:-1] - 1] = False
+    if unsorted.any():
+        row = int(np.argmax(unsorted)) + 1
+        raise ValueError(
+            f"'assume=sorted' but row {row} of 'data' is not sorted by the first objective within its set"
         )
-    return dash_parsed
 
 
-def parse_2d_line_dash(dash, size_list, default):
-    dash_parsed = dash if dash else default
-    if isinstance(dash_parsed, str):
-        # Set all traces to be same single value
-        dash_parsed = [
-            parse_line_dash(dash, size, default) for size in size_list
-        ]
-    elif isinstance(dash_parsed, list):
-        # Can individually select each trace, or set to the same for each
-        if len(dash_parsed) != len(size_list):
+def _check_positive(points_list, log) -> None:
+    """Check that the objectives of logarithmic axes are positive.
+
+    ``log`` is a boolean array with one value per objective. Each array of
+    ``points_list`` is checked by a single reduction over its rows.
+    """
+    log = np.asarray(log, dtype=bool)
+    if not log.any():
+        return
+    for points in points_list:
+        if len(points) == 0:
+            continue
+        invalid = ~(points[:, log].min(axis=0) > 0)
+        if invalid.any():
+            axis = "xyz"[np.flatnonzero(log)[np.argmax(invalid)]]
             raise ValueError(
-                "2d dash_size list should be same length as number of traces"
+                f"'log_{axis}=True' but some values of the {axis} axis are not positive"
             )
-        dash_parsed = [
-            parse_line_dash(dash_i, size_list[i], default)
-            for i, dash_i in enumerate(dash_parsed)
-        ]
-    else:
-        raise TypeError(f"type {type(dash)} not recognised for dash argument")
-    return dash_parsed
 
 
-def parse_line_width(line, size, default):
-    line_parsed = line if line else default
-    if isinstance(line_parsed, (int, float)):
-        line_parsed = [line_parsed] * size
-    elif isinstance(line_parsed, list):
-        if False in [
-            isinstance(line_i, (int, float)) for line_i in line_parsed
-        ]:
-            raise TypeError("line size wrong type, must be a number")
-        line_parsed = (
-            line_parsed * (size // len(line_parsed))
-            + line_parsed[: size % len(line_parsed)]
-        )  # Make list same length as size, repeating if its smaller
-    else:
+class _StyleItem(NamedTuple):
+    # Kind of value of a style argument, see _broadcast_style().
+    name: str
+    # Types of a single value, which is broadcast to all traces.
+    types: tuple
+    # Validates a single value and returns it in the form used by plotly.
+    parse: Callable
+
+
+def _broadcast_style(value, sizes, default, item: _StyleItem) -> list:
+    """Expand a style argument to one value per trace.
+
+    A single value is used for all traces, and a list of values is repeated
+    until there is one value per trace. If ``sizes`` is a list, there are
+    several groups of traces, e.g., one per dataset, and ``value`` may also
+    be a list with one single value or list per group. If ``value`` is
+    empty, ``default`` is used instead, which may also give one value per
+    group. Each distinct value is validated only once, and the result is
+    cached, thus styling the same traces again costs a dictionary lookup.
+
+    Parameters
+    ----------
+    value :
+        The style argument.
+    sizes :
+        Number of traces, or list with the number of traces of each group.
+    default :
+        Value used when ``value`` is empty.
+    item :
+        The kind of values of the argument.
+
+    Returns
+    -------
+        List with one value per trace, or a list of such lists if ``sizes`` is
+        a list.
+
+    """
+    grouped = not isinstance(sizes, (int, np.integer))
+    sizes = tuple(int(n) for n in sizes) if grouped else int(sizes)
+    try:
+        result = _broadcast_style_cached(
+            _freeze(value),
+            sizes,
+            _freeze(default),
+            item,
+            _type_key((value, default)),
+        )
+    except TypeError as e:
+        if "unhashable" not in str(e):
+            raise
+        # Values that cannot be cached, such as arrays.
+        result = _broadcast_style_uncached(value, sizes, default, item)
+    return [list(values) for values in result] if grouped else list(result)
+
+
+def _freeze(value):
+    # Lists become tuples, so that the value can be a key of a cache.
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _type_key(value):
+    # Types of value and of the items of its lists. Values such as True, 1
+    # and 1.0 are equal, thus they are part of the key of a cache to avoid
+    # that they share its entries.
+    if isinstance(value, (list, tuple)):
+        return tuple(_type_key(v) for v in value)
+    return type(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def _broadcast_style_cached(value, sizes, default, item, types):
+    # types is only part of the key of the cache, see _type_key().
+    return _broadcast_style_uncached(value, sizes, default, item)
+
+
+def _broadcast_style_uncached(value, sizes, default, item):
+    if default is not None and not value:
+        value = default
+    if isinstance(sizes, int):
+        return _broadcast_values(value, sizes, item)
+    if isinstance(value, item.types):
+        # Validate the single value once for all groups.
+        values = _broadcast_values(value, max(sizes, default=0), item)
+        return tuple(values[:n] for n in sizes)
+    if not isinstance(value, (list, tuple)):
         raise TypeError(
-            f"line width argument {line_parsed}, type {str(type(line_parsed))} not recognised"
+            f"type {type(value)} not recognised for {item.name} argument"
+        )
+    if len(value) != len(sizes):
+        raise ValueError(
+            f"2d {item.name} list should be same length as number of traces"
         )
-    return line_parsed
+    # The default may give one value per group.
+    per_group = isinstance(default, (list, tuple)) and len(default) == len(
+        sizes
+    )
+    return tuple(
+        _broadcast_values(
+            v
+            if v or default is None
+            else (default[i] if per_group else default),
+            n,
+            item,
+        )
+        for i, (v, n) in enumerate(zip(value, sizes))
+    )
 
 
-def parse_2d_line_width(line, size_list, default):
-    parsed_2d = line if line else default
-    if isinstance(parsed_2d, (int, float)):
-        # Set all traces to be same single value
-        parsed_2d = [
-            parse_line_width(parsed_2d, size, default) for size in size_list
-        ]
-    elif isinstance(parsed_2d, list):
-        # Can individually select each trace, or set to the same for each
-        if len(parsed_2d) != len(size_list):
-            raise ValueError(
-                "2d line size argument should be same length as number of traces"
-            )
-        parsed_2d = [
-            parse_line_width(line_i, size_list[i], default)
-            for i, line_i in enumerate(parsed_2d)
-        ]
-    else:
+def _broadcast_values(value, size: int, item: _StyleItem) -> tuple:
+    # Returns a tuple of size values from a single value or a list of values,
+    # which is repeated as needed.
+    if isinstance(value, item.types):
+        return (_parse_style_value(value, item),) * size
+    if not isinstance(value, (list, tuple)):
         raise TypeError(
-            f"type {type(parsed_2d)} not recognised for dashed line argument"
+            f"{item.name} argument {value}, type {type(value)} not recognised"
         )
-    return parsed_2d
+    if len(value) == 0:
+        raise ValueError(f"{item.name} list must not be empty")
+    values = tuple(_parse_style_value(v, item) for v in value)
+    return (values * (size // len(values) + 1))[:size]
+
+
+def _parse_style_value(value, item: _StyleItem):
+    # The same values, e.g., colours, are often used by many traces.
+    if isinstance(value, Hashable):
+        return _parse_style_value_cached(value, item)
+    return item.parse(value)
+
+
+@functools.lru_cache(maxsize=4096, typed=True)
+def _parse_style_value_cached(value, item):
+    return item.parse(value)
+
+
+_line_dash_names = (
+    "solid",
+    "dot",
+    "dash",
+    "longdash",
+    "dashdot",
+    "longdashdot",
+)
+
+
+def _parse_line_dash_value(dash):
+    if dash not in _line_dash_names:
+        raise ValueError(
+            f"'{dash}' not recognised as line dash type. Allowed types are {list(_line_dash_names)}"
+        )
+    return dash
+
+
+def _parse_line_width_value(width):
+    if isinstance(width, bool) or not isinstance(width, (int, float)):
+        raise TypeError("line size wrong type, must be a number")
+    return width
+
+
+_line_dash = _StyleItem("line dash", (str,), _parse_line_dash_value)
+_line_width = _StyleItem("line width", (int, float), _parse_line_width_value)
+
+
+def parse_line_dash(dash, size, default):
+    return _broadcast_style(dash, size, default, _line_dash)
+
+
+def parse_2d_line_dash(dash, size_list, default):
+    return _broadcast_style(dash, size_list, default, _line_dash)
+
+
+def parse_line_width(line, size, default):
+    return _broadcast_style(line, size, default, _line_width)
+
+
+def parse_2d_line_width(line, size_list, default):
+    return _broadcast_style(line, size_list, default, _line_width)
@@ -4,6 +4,8 @@ import numpy as np
 from matplotlib import colors
 import re
 
+from ._utils import _StyleItem, _broadcast_style
+
 # FIXME add tests for this module
 
 
@@ -194,48 +196,21 @@ class ColourGradient:
         return self.gradient
 
 
+def _parse_colour_value(colour):
+    return parse_colour_to_nparray(colour, strings=True)
+
+
+_colour = _StyleItem("colorway", (str, int), _parse_colour_value)
+
+
 # Parse different types of colorway arguments into an acceptable format, or choose default
 def parse_colorway(colorway, length):
-    if isinstance(colorway, str) or isinstance(colorway, int):
-        colorway = parse_colour_to_nparray(colorway, strings=True)
-        colorway = [colorway] * length
-    elif isinstance(colorway, list):
-        colorway = [
-            parse_colour_to_nparray(col, strings=True) for col in colorway
-        ]
-        # If list smaller than expected, repeat it until it reaches length
-        colorway = (
-            colorway * (length // len(colorway))
-            + colorway[: length % len(colorway)]
-        )
-    else:
-        raise TypeError(
-            "Colorway argument needs to be string, int or list of (string or int)"
-        )
-    return colorway
+    return _broadcast_style(colorway, length, None, _colour)
 
 
 # Parse "list of list" colourway arguments
 def parse_2d_colorway(colorway, default, size_list):
-    parsed_2d = colorway if colorway else default
-    if isinstance(parsed_2d, str):
-        # Set all traces to be same single value
-        parsed_2d = [parse_colorway(parsed_2d, size) for size in size_list]
-    elif isinstance(parsed_2d, list):
-        # Can individually select each trace, or set to the same for each.
-        if len(parsed_2d) != len(size_list):
-            raise ValueError(
-                "2d colorway list should be same length as number of traces"
-            )
-        parsed_2d = [
-            parse_colorway(color_i if color_i else default, size_list[i])
-            for i, color_i in enumerate(parsed_2d)
-        ]
-    else:
-        raise TypeError(
-            f"type {type(parsed_2d)} not recognised for colorway argument"
-        )
-    return parsed_2d
+    return _broadcast_style(colorway, size_list, default, _colour)
 
 
 # These gradients are generated using a language model and are untested so the values may be wrong
@@ -0,0 +1,513 @@
+"""Static figures with matplotlib.
+
+The functions of this module draw the same figures as :func:`mooplot.plot_pf`
+and :func:`mooplot.plot_eaf` as static :class:`matplotlib.figure.Figure`
+objects, which can be saved as PNG, PDF or SVG without a browser. Each set of
+points or each level of an EAF is drawn as a single artist, a
+:class:`~matplotlib.collections.LineCollection` for stepped lines and a
+:class:`~matplotlib.collections.PolyCollection` for filled areas.
+
+"""
+
+from __future__ import annotations
+
+from numpy.typing import ArrayLike  # For type hints
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from plotly.colors import qualitative
+
+from . import colour
+from ._plot import (
+    _as_front_set,
+    _get_extremes,
+    _get_staircase,
+    _histogram_2d,
+    _split_eaf_datasets,
+)
+from ._style import PlotStyle
+from ._utils import (
+    _check_sorted_within_sets,
+    _get_axis_ranges,
+    _parse_assume,
+    _parse_maximise,
+    _parse_plot_type,
+)
+
+__all__ = ["BatchRenderer", "plot_eaf", "plot_pf"]
+
+# Equivalent matplotlib linestyles of the line dashes accepted by plotly.
+_line_dashes = {
+    "solid": "-",
+    "dot": ":",
+    "dash": "--",
+    "longdash": (0, (8, 4)),
+    "dashdot": "-.",
+    "longdashdot": (0, (8, 4, 2, 4)),
+}
+
+# Layout arguments of plot_pf() and plot_eaf() understood by this module.
+_layout_keys = (
+    "title",
+    "xaxis_title",
+    "yaxis_title",
+    "xaxis_range",
+    "yaxis_range",
+    "legend_title_text",
+)
+
+
+def plot_pf(
+    data: ArrayLike,
+    type: str = "points",
+    filter_dominated: bool = True,
+    assume: str | None = None,
+    maximise: bool | list[bool] = False,
+    reference_point: ArrayLike | None = None,
+    extremes_margin: float = 0.05,
+    bins: int | tuple[int, int] | None = None,
+    colorway: list | None = None,
+    ax=None,
+    **layout_kwargs,
+) -> Figure:
+    """Plot Pareto fronts as a static matplotlib figure.
+
+    Parameters
+    ----------
+    data, filter_dominated, assume, maximise, reference_point, extremes_margin :
+        See :func:`mooplot.plot_pf`. ``data`` may be a
+        :class:`mooplot.FrontSet`.
+    type :
+        Type of plot, any of 'points', 'lines', 'points,lines', 'fill' or
+        'density'. See :func:`mooplot.plot_pf`. Only 2 objectives are
+        supported.
+    bins :
+        Number of bins of the histogram of ``type='density'``, see
+        :func:`mooplot.plot_pf`. By default, one bin every two pixels of the
+        figure.
+    colorway :
+        Colour or list of colours of the sets, see :func:`mooplot.plot_eaf`.
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw into. By default, a new figure is created.
+    layout_kwargs :
+        Any of ``title``, ``xaxis_title``, ``yaxis_title``, ``xaxis_range``,
+        ``yaxis_range`` and ``legend_title_text``, with the same meaning as
+        in :func:`mooplot.plot_pf`.
+
+    Returns
+    -------
+        The figure that contains the plot.
+
+    Examples
+    --------
+    >>> from mooplot.matplotlib import plot_pf
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> fig = plot_pf(x, type="points,lines")
+    >>> fig.savefig("pf.png")  # doctest: +SKIP
+
+    """
+    front = _as_front_set(data)
+    if front.points.shape[1] != 2:
+        raise NotImplementedError(
+            "Only 2D datasets are currently supported by the matplotlib backend"
+        )
+    _check_layout_kwargs(layout_kwargs)
+    maximise = _parse_maximise(maximise, 2)
+    assume_nondominated, assume_sorted = _parse_assume(assume)
+    if assume_sorted and __debug__:
+        _check_sorted_within_sets(
+            front.points[:, 0], front.offsets, descending=maximise[0]
+        )
+    type_parsed = _parse_plot_type(type, 2)
+    if filter_dominated and not assume_nondominated:
+        front = front.filter_dominated(maximise=maximise)
+        assume_nondominated = True
+
+    extremes = _get_extremes(
+        [front.points],
+        maximise,
+        reference_point=reference_point,
+        margin=extremes_margin,
+        ranges=_get_axis_ranges(layout_kwargs),
+    )
+    layout_kwargs = {
+        "xaxis_title": "Objective 1",
+        "yaxis_title": "Objective 2",
+        "legend_title_text": "Set",
+        **layout_kwargs,
+    }
+    sets, points = front.split()
+    if type_parsed == "fill":
+        style = PlotStyle(colorway=colorway)
+        order = np.argsort(sets, kind="stable")
+        return _plot_eaf_levels(
+            [sets[order]],
+            [[points[i] for i in order]],
+            [None],
+            ["fill"],
+            style,
+            maximise,
+            extremes,
+            ax,
+            None,
+            layout_kwargs,
+        )
+
+    ax = _get_axes(ax)
+    colorway = colour.parse_colorway(
+        colorway if colorway else qualitative.Plotly, len(sets)
+    )
+    if type_parsed == "density":
+        if bins is None:
+            bins = (ax.figure.get_size_inches() * ax.figure.dpi / 2).astype(int)
+        counts, lower, step = _histogram_2d(front.points, bins)
+        upper = lower + step * counts.shape[::-1]
+        image = ax.imshow(
+            np.ma.masked_equal(counts, 0),
+            cmap="Greys",
+            vmin=0,
+            origin="lower",
+            extent=(lower[0], upper[0], lower[1], upper[1]),
+            aspect="auto",
+            interpolation="nearest",
+        )
+        # Inset axes are removed by ax.clear(), see BatchRenderer.
+        cax = ax.inset_axes([1.02, 0.0, 0.03, 0.5])
+        ax.figure.colorbar(image, cax=cax)
+        cax.set_title("Points", fontsize="small")
+        if not assume_nondominated:
+            sets, points = front.filter_dominated(maximise=maximise).split()
+        type_parsed = "lines"
+    for s, p, c in zip(sets, points, colorway):
+        label = str(s)
+        c = _to_mpl_colour(c)
+        if "lines" in type_parsed:
+            x, y = _get_staircase(p, maximise, extremes)
+            ax.add_collection(
+                LineCollection([_hv_vertices(x, y)], colors=[c], label=label)
+            )
+            label = None
+        if "markers" in type_parsed:
+            ax.scatter(p[:, 0], p[:, 1], s=16, color=c, label=label)
+    return _finish_axes(ax, extremes, layout_kwargs)
+
+
+def plot_eaf(
+    dataset: ArrayLike | dict,
+    type: str | list[str] = "fill",
+    percentiles: list | None = None,
+    colorway=None,
+    fill_border_colours=None,
+    trace_names: list | None = None,
+    line_dashes="solid",
+    line_width=None,
+    maximise: bool | list[bool] = False,
+    reference_point: ArrayLike | None = None,
+    extremes_margin: float = 0.05,
+    style: PlotStyle | None = None,
+    ax=None,
+    **layout_kwargs,
+) -> Figure:
+    """Plot attainment surfaces in 2D as a static matplotlib figure.
+
+    Each percentile is drawn as a single artist, thus figures with many
+    points are much faster to draw and to save than the equivalent plotly
+    figures exported through kaleido.
+
+    Parameters
+    ----------
+    dataset, type, percentiles, colorway, fill_border_colours, trace_names, line_dashes, line_width, maximise, reference_point, extremes_margin :
+        See :func:`mooplot.plot_eaf`. Line widths are given in pixels, as in
+        plotly.
+    style :
+        A :class:`mooplot.PlotStyle` that replaces the arguments
+        ``colorway``, ``fill_border_colours``, ``line_dashes`` and
+        ``line_width``. Its layout arguments are ignored.
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw into. By default, a new figure is created.
+    layout_kwargs :
+        Any of ``title``, ``xaxis_title``, ``yaxis_title``, ``xaxis_range``,
+        ``yaxis_range`` and ``legend_title_text``, with the same meaning as
+        in :func:`mooplot.plot_eaf`.
+
+    Returns
+    -------
+        The figure that contains the plot.
+
+    Examples
+    --------
+    >>> from mooplot.matplotlib import plot_eaf
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> eaf = moocore.eaf(x[:, :-1], x[:, -1], percentiles=[0, 50, 100])
+    >>> fig = plot_eaf(eaf, title="EAF of input1.dat")
+    >>> fig.savefig("eaf.pdf")  # doctest: +SKIP
+
+    """
+    _check_layout_kwargs(layout_kwargs)
+    maximise = _parse_maximise(maximise, 2)
+    if style is None:
+        style = PlotStyle(
+            colorway=colorway,
+            fill_border_colours=fill_border_colours,
+            line_dashes=line_dashes,
+            line_width=line_width,
+        )
+    names, levels_list, points_list = _split_eaf_datasets(dataset, percentiles)
+    if isinstance(dataset, dict):
+        if isinstance(type, str):
+            type = [type] * len(names)
+        elif len(type) != len(names):
+            raise ValueError(
+                "type list must be same length as dataset dictionary"
+            )
+        legend_title_text = "Algorithm"
+    else:
+        type = [type]
+        legend_title_text = "Percentile"
+
+    extremes = _get_extremes(
+        [p for points in points_list for p in points],
+        maximise,
+        reference_point=reference_point,
+        margin=extremes_margin,
+        ranges=_get_axis_ranges(layout_kwargs),
+    )
+    layout_kwargs = {
+        "title": "2D Empirical Attainment Function",
+        "xaxis_title": "Objective 0",
+        "yaxis_title": "Objective 1",
+        "legend_title_text": legend_title_text,
+        **layout_kwargs,
+    }
+    return _plot_eaf_levels(
+        levels_list,
+        points_list,
+        names,
+        type,
+        style,
+        maximise,
+        extremes,
+        ax,
+        trace_names,
+        layout_kwargs,
+    )
+
+
+class BatchRenderer:
+    """Render many static figures reusing a single matplotlib canvas.
+
+    Creating a matplotlib figure and its canvas takes longer than drawing
+    the plots of :mod:`mooplot.matplotlib`. A :class:`BatchRenderer` creates
+    them once and clears the axes before each plot, which is useful to save
+    hundreds of figures, e.g., in reports or continuous integration.
+
+    Parameters
+    ----------
+    figsize, dpi :
+        See :class:`matplotlib.figure.Figure`.
+    savefig_kwargs :
+        Additional arguments passed to
+        :meth:`matplotlib.figure.Figure.savefig`, such as ``format`` or
+        ``bbox_inches``.
+
+    Examples
+    --------
+    >>> from mooplot.matplotlib import BatchRenderer
+    >>> renderer = BatchRenderer(figsize=(4, 3), format="png")
+    >>> x = moocore.get_dataset("input1.dat")
+    >>> for i in range(3):
+    ...     fname = f"pf_{i}.png"
+    ...     fig = renderer.plot_pf(x, fname=fname)  # doctest: +SKIP
+
+    """
+
+    def __init__(self, figsize=None, dpi=None, **savefig_kwargs):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.savefig_kwargs = savefig_kwargs
+
+    def plot_pf(self, data: ArrayLike, fname=None, **kwargs) -> Figure:
+        """Plot Pareto fronts on the shared canvas.
+
+        Parameters
+        ----------
+        data :
+            See :func:`plot_pf`.
+        fname :
+            If given, save the figure to this file.
+        kwargs :
+            Other arguments passed to :func:`plot_pf`.
+
+        Returns
+        -------
+            The shared figure, which is cleared by the next plot.
+
+        """
+        self.ax.clear()
+        plot_pf(data, ax=self.ax, **kwargs)
+        return self._save(fname)
+
+    def plot_eaf(
+        self, dataset: ArrayLike | dict, fname=None, **kwargs
+    ) -> Figure:
+        """Plot attainment surfaces on the shared canvas.
+
+        Parameters
+        ----------
+        dataset :
+            See :func:`plot_eaf`.
+        fname :
+            If given, save the figure to this file.
+        kwargs :
+            Other arguments passed to :func:`plot_eaf`.
+
+        Returns
+        -------
+            The shared figure, which is cleared by the next plot.
+
+        """
+        self.ax.clear()
+        plot_eaf(dataset, ax=self.ax, **kwargs)
+        return self._save(fname)
+
+    def _save(self, fname):
+        if fname is not None:
+            self.figure.savefig(fname, **self.savefig_kwargs)
+        return self.figure
+
+
+def _plot_eaf_levels(
+    levels_list,
+    points_list,
+    names,
+    types,
+    style,
+    maximise,
+    extremes,
+    ax,
+    trace_names,
+    layout_kwargs,
+):
+    # Draws the levels of each EAF, one artist per level, and returns the
+    # figure. The EAFs are given as in _split_eaf_datasets().
+    ax = _get_axes(ax)
+    inf_x, inf_y = extremes[1]
+    staircases_list = [
+        [_get_staircase(p, maximise, extremes) for p in points]
+        for points in points_list
+    ]
+    num_levels = [len(levels) for levels in levels_list]
+    if names == [None]:
+        trace_styles = [style._get_trace_style(num_levels[0])]
+    else:
+        trace_styles = list(zip(*style._get_2d_trace_style(num_levels)))
+
+    for name, type, levels, points, staircases, trace_style in zip(
+        names, types, levels_list, points_list, staircases_list, trace_styles
+    ):
+        type = _parse_plot_type(type, 2)
+        if type == "density":
+            raise ValueError("Plot type 'density' is only valid for plot_pf")
+        fill_colours, border_colours, dashes, widths = trace_style
+        vertices = [_hv_vertices(x, y) for x, y in staircases]
+        for i, level in enumerate(levels):
+            label = (
+                f"{int(level)}" if name is None else f"{name} - {int(level)}"
+            )
+            linestyle = _line_dashes.get(dashes[i], dashes[i])
+            # Plotly line widths are in pixels, matplotlib ones in points.
+            linewidth = 0.75 * widths[i]
+            if type == "fill":
+                # The area between this level and the next one, or up to the
+                # worst extremes for the last level.
+                next_vertices = (
+                    vertices[i + 1][::-1]
+                    if i + 1 < len(vertices)
+                    else [[inf_x, inf_y]]
+                )
+                ax.add_collection(
+                    PolyCollection(
+                        [np.vstack([vertices[i], next_vertices])],
+                        facecolors=[_to_mpl_colour(fill_colours[i])],
+                        edgecolors=[_to_mpl_colour(border_colours[i])],
+                        linestyles=linestyle,
+                        linewidths=linewidth,
+                        label=label,
+                    )
+                )
+                continue
+            c = _to_mpl_colour(fill_colours[i])
+            if "lines" in type:
+                ax.add_collection(
+                    LineCollection(
+                        [vertices[i]],
+                        colors=[c],
+                        linestyles=linestyle,
+                        linewidths=linewidth,
+                        label=label,
+                    )
+                )
+                label = None
+            if "markers" in type:
+                # The points, not clipped to the extremes as the lines.
+                ax.scatter(
+                    points[i][:, 0], points[i][:, 1], s=16, color=c, label=label
+                )
+
+    if trace_names:
+        handles = ax.get_legend_handles_labels()[0]
+        if len(trace_names) != len(handles):
+            raise ValueError(
+                f"Your names list of len {len(trace_names)} is different to the number of traces: {len(handles)}"
+            )
+        for handle, trace_name in zip(handles, trace_names):
+            handle.set_label(trace_name)
+    return _finish_axes(ax, extremes, layout_kwargs)
+
+
+def _hv_vertices(x, y):
+    # Returns the vertices of the "hv" stepped line through the points (x, y).
+    return np.column_stack([np.repeat(x, 2)[1:], np.repeat(y, 2)[:-1]])
+
+
+def _to_mpl_colour(c):
+    # The RGB values of "rgb()" and "rgba()" strings, such as the colours of
+    # mooplot, are in [0, 255] as in CSS and plotly, but matplotlib expects
+    # them in [0, 1], as parse_colour_to_nparray() returns other colours.
+    rgba = colour.parse_colour_to_nparray(c)
+    if isinstance(c, str) and c.strip().lower().startswith("rgb"):
+        rgba[:3] /= 255.0
+    return rgba
+
+
+def _check_layout_kwargs(layout_kwargs):
+    unknown = [key for key in layout_kwargs if key not in _layout_keys]
+    if unknown:
+        raise TypeError(
+            f"'{unknown[0]}' is not supported by the matplotlib backend. Allowed layout arguments are {list(_layout_keys)}"
+        )
+
+
+def _get_axes(ax):
+    if ax is None:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+    return ax
+
+
+def _finish_axes(ax, extremes, layout_kwargs):
+    # The extremes already include a margin around the data.
+    lower = extremes.min(axis=0)
+    upper = extremes.max(axis=0)
+    ax.set_xlim(lower[0], upper[0])
+    ax.set_ylim(lower[1], upper[1])
+    if layout_kwargs.get("title"):
+        ax.set_title(layout_kwargs["title"])
+    ax.set_xlabel(layout_kwargs.get("xaxis_title"))
+    ax.set_ylabel(layout_kwargs.get("yaxis_title"))
+    ax.legend(title=layout_kwargs.get("legend_title_text"))
+    return ax.figure
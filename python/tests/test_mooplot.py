@@ -29,3 +29,1109 @@ def test_plt_dta_types(test_datapath):
     mooplot.plot_pf(X, type="points,l")
     mooplot.plot_pf(X, type="point ,lines")
     mooplot.plot_pf(X, type="LiNe ,  PoInTs")
+
+
+def test_plot_pf_assume():
+    """Check that assume='nondominated,sorted' skips filtering and sorting."""
+    X = moocore.get_dataset("input1.dat")
+    X = moocore.filter_dominated_within_sets(X)
+    X = X[np.lexsort((X[:, 0], X[:, -1]))]
+    expected = mooplot.plot_pf(X, type="lines")
+    fig = mooplot.plot_pf(X, type="lines", assume="nondominated,sorted")
+    assert fig.to_json() == expected.to_json()
+    fig = mooplot.plot_pf(X, type="lines", assume="n, s")
+    assert fig.to_json() == expected.to_json()
+
+    with pytest.raises(ValueError, match="not sorted"):
+        mooplot.plot_pf(X[::-1], type="lines", assume="sorted")
+    with pytest.raises(ValueError, match="not recognised"):
+        mooplot.plot_pf(X, assume="convex")
+    # Empty items do not assume anything.
+    from mooplot._utils import _parse_assume
+
+    assert _parse_assume("nondominated,") == (True, False)
+    assert _parse_assume(",") == (False, False)
+    unsorted = X[::-1]
+    fig = mooplot.plot_pf(unsorted, type="lines", assume=",")
+    assert fig.to_json() == mooplot.plot_pf(unsorted, type="lines").to_json()
+    with pytest.raises(ValueError, match="not sorted"):
+        mooplot.plot_pf(unsorted, type="lines", assume="sorted,")
+
+
+@pytest.mark.parametrize(
+    "maximise", [[False, False], [True, False], [False, True], [True, True]]
+)
+def test_maximise(maximise):
+    """Check that maximising mirrors the plot of the minimisation problem."""
+    sign = np.where(maximise, -1.0, 1.0)
+    X = moocore.get_dataset("input1.dat")
+    X_max = X.copy()
+    X_max[:, :2] *= sign
+
+    expected = mooplot.plot_pf(X, type="lines")
+    fig = mooplot.plot_pf(X_max, type="lines", maximise=maximise)
+    assert len(fig.data) == len(expected.data)
+    for trace, exp in zip(fig.data, expected.data):
+        assert trace.name == exp.name
+        np.testing.assert_array_equal(trace.x, sign[0] * exp.x)
+        np.testing.assert_array_equal(trace.y, sign[1] * exp.y)
+
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    eaf_max = eaf.copy()
+    eaf_max[:, :2] *= sign
+    expected = mooplot.plot_eaf(eaf)
+    fig = mooplot.plot_eaf(eaf_max, maximise=maximise)
+    assert len(fig.data) == len(expected.data)
+    for trace, exp in zip(fig.data, expected.data):
+        np.testing.assert_array_equal(trace.x, sign[0] * np.asarray(exp.x))
+        np.testing.assert_array_equal(trace.y, sign[1] * np.asarray(exp.y))
+
+
+def test_finite_extremes():
+    """Check that staircases are extended up to finite extremes."""
+    X = np.array([[1, 3, 1], [2, 2, 1], [3, 1, 1]], dtype=float)
+    fig = mooplot.plot_pf(X, type="lines", extremes_margin=0.5)
+    np.testing.assert_array_equal(fig.data[0].x, [1, 1, 2, 3, 4])
+    np.testing.assert_array_equal(fig.data[0].y, [4, 3, 2, 1, 1])
+
+    fig = mooplot.plot_pf(X, type="lines", reference_point=[2.5, 2.5])
+    np.testing.assert_array_equal(fig.data[0].x, [1, 1, 2, 2.5, 2.5])
+    np.testing.assert_array_equal(fig.data[0].y, [2.5, 2.5, 2, 1, 1])
+
+    fig = mooplot.plot_pf(X, type="lines", xaxis_range=[1.5, 5])
+    np.testing.assert_array_equal(fig.data[0].x, [1.5, 1.5, 2, 3, 5])
+    assert fig.layout.xaxis.range == (1.5, 5)
+
+    with pytest.raises(ValueError, match="reference_point"):
+        mooplot.plot_pf(X, type="lines", reference_point=[1, 2, 3])
+
+    X = moocore.get_dataset("input1.dat")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    fig = mooplot.plot_eaf(eaf, reference_point=[10, 10])
+    for trace in fig.data:
+        assert np.max(trace.x) <= 10 and np.max(trace.y) <= 10
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"reference_point": [2.5, 2.5]}, {"xaxis_range": [1.5, 5]}]
+)
+def test_markers_without_extremes(kwargs):
+    """Check that markers are the points, without extremes or clipping."""
+    X = np.array([[1, 3, 1], [2, 2, 1], [3, 1, 1]], dtype=float)
+    line = mooplot.plot_pf(X, type="lines", **kwargs).data[0]
+    fig = mooplot.plot_pf(X, type="points,lines", **kwargs)
+    assert [trace.mode for trace in fig.data] == ["lines", "markers"]
+    np.testing.assert_array_equal(fig.data[0].x, line.x)
+    np.testing.assert_array_equal(fig.data[0].y, line.y)
+    np.testing.assert_array_equal(fig.data[1].x, X[:, 0])
+    np.testing.assert_array_equal(fig.data[1].y, X[:, 1])
+    assert fig.data[0].hoverinfo == "skip"
+    assert fig.data[1].legendgroup == fig.data[0].legendgroup
+
+    eaf = np.array([[1, 3, 50], [2, 2, 50], [3, 1, 50]], dtype=float)
+    fig = mooplot.plot_eaf(eaf, type="points", **kwargs)
+    assert len(fig.data) == 1
+    np.testing.assert_array_equal(fig.data[0].x, X[:, 0])
+    np.testing.assert_array_equal(fig.data[0].y, X[:, 1])
+
+    pytest.importorskip("matplotlib")
+    from mooplot.matplotlib import plot_eaf
+
+    fig = plot_eaf(eaf, type="points,lines", **kwargs)
+    (markers,) = fig.axes[0].collections[1:]
+    np.testing.assert_array_equal(markers.get_offsets(), X[:, :2])
+
+
+def test_plot_style():
+    """Check that figures created from a PlotStyle match plot_eaf()."""
+    X = moocore.get_dataset("input1.dat")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    kwargs = dict(
+        colorway="darkblue",
+        line_dashes=["dot", "dash"],
+        legend_preset="top_left",
+        title="My EAF",
+    )
+    expected = mooplot.plot_eaf(eaf, type="lines", **kwargs)
+    style = mooplot.PlotStyle(**kwargs)
+    for _ in range(2):
+        fig = mooplot.plot_eaf(eaf, type="lines", style=style)
+        assert fig.to_json() == expected.to_json()
+
+    expected = mooplot.plot_eaf(
+        {"A": eaf, "B": eaf}, xaxis_title="Time", **kwargs
+    )
+    fig = mooplot.plot_eaf(
+        {"A": eaf, "B": eaf}, style=style, xaxis_title="Time"
+    )
+    assert fig.to_json() == expected.to_json()
+    # Updates after creating the figure are still validated.
+    fig.update_layout(title="New title")
+    assert fig.layout.title.text == "New title"
+    with pytest.raises(ValueError):
+        fig.update_layout(not_a_layout_property=1)
+
+
+@pytest.mark.parametrize("private", [True, False])
+def test_make_figure_unvalidated(monkeypatch, private):
+    """Check figures created without validation, also without plotly support."""
+    import plotly.graph_objects as go
+    from mooplot._style import _make_figure_unvalidated
+
+    if not private:
+        figure = go.Figure
+
+        def strict_figure(*args, **kwargs):
+            if "_validate" in kwargs:
+                raise TypeError("unexpected keyword argument '_validate'")
+            return figure(*args, **kwargs)
+
+        monkeypatch.setattr(go, "Figure", strict_figure)
+
+    data = [dict(type="scatter", x=[1, 2], y=[2, 1], name="A")]
+    fig = _make_figure_unvalidated(data=data, layout=dict(title=dict(text="T")))
+    assert fig.data[0].name == "A"
+    assert fig.layout.title.text == "T"
+    with pytest.raises(ValueError):
+        fig.update_layout(not_a_layout_property=1)
+    with pytest.raises(ValueError):
+        fig.data[0].update(not_a_scatter_property=1)
+
+    X = moocore.get_dataset("input1.dat")
+    fig = mooplot.plot_pf(X, type="points,lines")
+    with pytest.raises(ValueError):
+        fig.data[0].update(not_a_scatter_property=1)
+
+
+def test_eafdiff():
+    """Check EAFDiff and the interactive choice of a side."""
+    A1 = moocore.get_dataset("wrots_l100w10_dat.xz")
+    A2 = moocore.get_dataset("wrots_l10w100_dat.xz")
+    diff = mooplot.EAFDiff(A1, A2)
+    with pytest.raises(ValueError, match="side"):
+        diff.choose()
+    left = diff.choose(left=True)
+    right = diff.choose(left=False)
+    assert left.shape[1] == right.shape[1] == 5
+    assert np.all(left[:, -1] > 0) and np.all(right[:, -1] > 0)
+    assert diff.choose(left=True) is left
+
+    fig = mooplot.plot_eafdiff(diff)
+    axes = {trace.xaxis for trace in fig.data}
+    assert axes == {"x", "x2"}
+
+    pytest.importorskip("ipywidgets")
+    from plotly.callbacks import Points
+
+    chosen = []
+    fig = mooplot.choose_eafdiffplot(diff, callback=chosen.append)
+    trace = next(t for t in fig.data if t.xaxis == "x2")
+    points = Points(
+        point_inds=[0], xs=[0], ys=[0], trace_name=trace.name, trace_index=0
+    )
+    trace._dispatch_on_click(points, None)
+    assert diff.left is False
+    assert chosen[0] is right
+
+
+def test_matplotlib_backend(tmp_path):
+    """Check that each set or percentile is drawn as a single artist."""
+    from matplotlib.collections import LineCollection, PolyCollection
+    from mooplot.matplotlib import BatchRenderer, plot_eaf, plot_pf
+
+    X = moocore.get_dataset("input1.dat")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    fig = plot_eaf(eaf)
+    (ax,) = fig.axes
+    assert len(ax.collections) == 3
+    assert all(isinstance(c, PolyCollection) for c in ax.collections)
+    assert [t.get_text() for t in ax.get_legend().texts] == ["0", "50", "100"]
+
+    fig = plot_eaf({"A": eaf, "B": eaf}, type="lines", percentiles=[0, 100])
+    assert len(fig.axes[0].collections) == 4
+    fig = plot_pf(X, type="lines", xaxis_range=[0, 5])
+    ax = fig.axes[0]
+    assert len(ax.collections) == len(np.unique(X[:, -1]))
+    assert all(isinstance(c, LineCollection) for c in ax.collections)
+    assert ax.get_xlim() == (0, 5)
+    for segments in (c.get_segments()[0] for c in ax.collections):
+        assert segments[:, 0].max() <= 5
+    with pytest.raises(TypeError, match="template"):
+        plot_pf(X, template="plotly")
+    # The RGB values of rgb() and rgba() strings are in [0, 255].
+    from mooplot.matplotlib import _to_mpl_colour
+
+    fig = plot_pf(X, type="lines", colorway=["rgb(1,1,1)", "rgba(0,0,1,1)"])
+    colours = [c.get_color()[0] for c in fig.axes[0].collections[:2]]
+    np.testing.assert_allclose(colours[0], [1 / 255, 1 / 255, 1 / 255, 1])
+    np.testing.assert_allclose(colours[1], [0, 0, 1 / 255, 1])
+    np.testing.assert_allclose(
+        _to_mpl_colour("rgba(255, 0, 0, 0.5)"), [1, 0, 0, 0.5]
+    )
+    np.testing.assert_allclose(_to_mpl_colour("blue"), [0, 0, 1, 1])
+
+    renderer = BatchRenderer(format="png")
+    for i in range(2):
+        fig = renderer.plot_eaf(eaf, fname=tmp_path / f"eaf{i}.png")
+        assert fig is renderer.figure
+        assert len(fig.axes[0].collections) == 3
+    assert (tmp_path / "eaf1.png").stat().st_size > 0
+
+
+def test_eaf_data():
+    """Check that EAFData selects percentiles without copying."""
+    X = moocore.get_dataset("input1.dat")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1])
+    data = mooplot.EAFData(eaf)
+    assert np.shares_memory(data.points, eaf)
+    assert np.array_equal(data.to_numpy(), eaf)
+    levels, points = data.split([10, 50, 55, 100])
+    assert levels.tolist() == [10, 50, 100]
+    assert all(np.shares_memory(p, eaf) for p in points)
+    assert np.array_equal(data[50], eaf[eaf[:, -1] == 50, :-1])
+    with pytest.raises(KeyError):
+        data[55]
+
+    selected = data.select([20, 30, 40])
+    assert np.shares_memory(selected.points, eaf)
+    expected = eaf[np.isin(eaf[:, -1], [20, 30, 40])]
+    assert np.array_equal(selected.to_numpy(), expected)
+    selected = data.select([100, 10])
+    expected = eaf[np.isin(eaf[:, -1], [10, 100])]
+    assert np.array_equal(selected.to_numpy(), expected)
+    # Unsorted input is grouped by level.
+    shuffled = mooplot.EAFData(eaf[::-1])
+    assert np.array_equal(shuffled.levels, data.levels)
+
+    percentiles = [10, 50, 100]
+    expected = mooplot.plot_eaf(eaf, percentiles=percentiles)
+    fig = mooplot.plot_eaf(data, percentiles=percentiles)
+    assert fig.to_json() == expected.to_json()
+    fig = mooplot.plot_eaf({"A": data}, percentiles=percentiles)
+    expected = mooplot.plot_eaf({"A": eaf}, percentiles=percentiles)
+    assert fig.to_json() == expected.to_json()
+
+
+def test_front_set():
+    """Check that FrontSet is a compact view of moocore.read_datasets()."""
+    X = moocore.get_dataset("input1.dat")
+    fronts = mooplot.FrontSet(X)
+    assert not hasattr(fronts, "__dict__")
+    assert np.shares_memory(fronts.points, X)
+    assert fronts.sets.dtype == np.int32
+    assert np.array_equal(fronts.to_numpy(), X)
+    assert np.array_equal(fronts[3], X[X[:, -1] == 3, :-1])
+    with pytest.raises(KeyError):
+        fronts[11]
+
+    compact = mooplot.FrontSet(X, dtype=np.float32)
+    assert compact.points.dtype == np.float32
+    assert compact.nbytes < X.nbytes / 2
+    # Sets whose rows are not consecutive are grouped by first appearance.
+    shuffled = mooplot.FrontSet(X[np.r_[10:20, 0:10, 20:35, 35 : len(X)]][::-1])
+    assert sorted(shuffled.sets) == list(range(1, 11))
+    assert np.array_equal(
+        np.sort(shuffled[1], axis=0), np.sort(fronts[1], axis=0)
+    )
+
+    filtered = fronts.filter_dominated(maximise=[True, False])
+    expected = moocore.filter_dominated_within_sets(X, maximise=[True, False])
+    assert np.array_equal(filtered.to_numpy(), expected)
+    eaf = fronts.eaf(percentiles=[0, 50, 100])
+    expected = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    assert np.array_equal(eaf.to_numpy(), expected)
+
+    for type in ("points", "lines", "fill"):
+        fig = mooplot.plot_pf(fronts, type=type)
+        expected = mooplot.plot_pf(X, type=type)
+        assert fig.to_json() == expected.to_json()
+
+    A1 = moocore.get_dataset("wrots_l100w10_dat.xz")
+    A2 = moocore.get_dataset("wrots_l10w100_dat.xz")
+    diff = mooplot.EAFDiff(mooplot.FrontSet(A1), mooplot.FrontSet(A2))
+    assert np.array_equal(diff.rectangles, mooplot.EAFDiff(A1, A2).rectangles)
+
+
+def test_concurrent_plot_eaf():
+    """Build many figures concurrently and compare them with serial ones."""
+    import asyncio
+    import copy
+    from concurrent.futures import ThreadPoolExecutor
+
+    X = moocore.get_dataset("input1.dat")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1])
+    datasets = {"A": eaf, "B": mooplot.EAFData(eaf)}
+    original = copy.deepcopy(datasets)
+    style = mooplot.PlotStyle(colorway="darkblue")
+    calls = [
+        (eaf, dict(percentiles=[10, 50, 100])),
+        (eaf, dict(type="lines", style=style)),
+        (datasets, dict(percentiles=[[10, 100], [50]], style=style)),
+        (datasets, dict(type=["fill", "lines"], percentiles=[50, 100])),
+    ]
+    expected = [mooplot.plot_eaf(x, **kw).to_json() for x, kw in calls]
+    n = 16 * len(calls)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        figs = list(
+            executor.map(
+                lambda i: mooplot.plot_eaf(calls[i % 4][0], **calls[i % 4][1]),
+                range(n),
+            )
+        )
+    for i, fig in enumerate(figs):
+        assert fig.to_json() == expected[i % 4]
+    assert list(datasets) == list(original)
+    assert np.array_equal(datasets["A"], original["A"])
+
+    async def build():
+        return await asyncio.gather(
+            *(mooplot.plot_eaf_async(x, **kw) for x, kw in calls * 4)
+        )
+
+    for i, fig in enumerate(asyncio.run(build())):
+        assert fig.to_json() == expected[i % 4]
+
+
+def test_staircase_pyramid():
+    """Serve the stepped lines of a figure through a local HTTP server."""
+    import json
+    import threading
+    import urllib.request
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    X = moocore.get_dataset("wrots_l100w10_dat.xz")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 25, 50, 75, 100])
+    fig = mooplot.plot_eaf(eaf)
+    pyramid = mooplot.StaircasePyramid(fig, max_vertices=40)
+    assert pyramid.traces == list(range(len(fig.data)))
+    coarse = pyramid.figure
+    for i in pyramid.traces:
+        assert len(coarse.data[i].x) <= 40
+        assert len(fig.data[i].x) == len(pyramid.levels[i][-1][0])
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            event = json.loads(
+                self.rfile.read(int(self.headers["Content-Length"]))
+            )
+            body = json.dumps(mooplot.handle_relayout(pyramid, event)).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def relayout(event):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/relayout",
+            data=json.dumps(event).encode(),
+            method="POST",
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def attained(x, y, queries):
+        # Whether each query point is dominated by the vertices of a line.
+        return np.any(
+            (x[:, None] <= queries[:, 0]) & (y[:, None] <= queries[:, 1]),
+            axis=0,
+        )
+
+    rng = np.random.default_rng(42)
+    try:
+        assert relayout({"xaxis.autorange": True})["level"] == 0
+        lo, hi = pyramid.bounds
+        for zoom in (1, 4, 1000):
+            span = (hi - lo) / zoom
+            corner = lo + rng.uniform(0.2, 0.6) * (hi - lo - span)
+            update = relayout(
+                {
+                    "xaxis.range[0]": corner[0],
+                    "xaxis.range[1]": corner[0] + span[0],
+                    "yaxis.range": [corner[1], corner[1] + span[1]],
+                }
+            )
+            assert update["traces"] == pyramid.traces
+            queries = corner + rng.uniform(size=(500, 2)) * span
+            for i, x, y in zip(update["traces"], update["x"], update["y"]):
+                assert len(x) <= 2 * 40
+                original = np.asarray(fig.data[i].x), np.asarray(fig.data[i].y)
+                cell = span / 20
+                # Simplified lines differ by less than one cell of the level.
+                inner = attained(*original, queries - cell)
+                outer = attained(*original, queries + cell)
+                result = attained(np.array(x), np.array(y), queries)
+                assert np.all(result >= inner) and np.all(result <= outer)
+                if update["level"] >= len(pyramid.levels[i]) - 1:
+                    assert np.array_equal(result, attained(*original, queries))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_staircase_pyramid_log():
+    """On logarithmic axes, the pyramid works in the scale of the axes."""
+    import plotly.graph_objects as go
+
+    X = moocore.get_dataset("wrots_l100w10_dat.xz")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    fig = mooplot.plot_eaf(eaf, type="lines", log_x=True, log_y=True)
+    pyramid = mooplot.StaircasePyramid(fig, max_vertices=40)
+    # The same lines in the log scale, shown on linear axes.
+    log_fig = go.Figure(fig)
+    log_fig.update_layout(xaxis_type="linear", yaxis_type="linear")
+    for trace in log_fig.data:
+        trace.update(x=np.log10(trace.x), y=np.log10(trace.y))
+    expected = mooplot.StaircasePyramid(log_fig, max_vertices=40)
+    np.testing.assert_allclose(np.log10(pyramid.bounds), expected.bounds)
+
+    lo, hi = np.log10(pyramid.bounds)
+    event = {
+        "xaxis.range": [
+            lo[0] + 0.4 * (hi[0] - lo[0]),
+            lo[0] + 0.5 * (hi[0] - lo[0]),
+        ],
+        "yaxis.range": [
+            lo[1] + 0.4 * (hi[1] - lo[1]),
+            lo[1] + 0.5 * (hi[1] - lo[1]),
+        ],
+    }
+    update = mooplot.handle_relayout(pyramid, event)
+    log_update = mooplot.handle_relayout(expected, event)
+    assert update["level"] == log_update["level"] == 4
+    for axis in "xy":
+        for values, log_values in zip(update[axis], log_update[axis]):
+            np.testing.assert_allclose(np.log10(values), log_values)
+
+
+def test_plot_pf_density():
+    """Histogram of all the points with the nondominated front of each set."""
+    X = moocore.get_dataset("input1.dat")
+    fig = mooplot.plot_pf(X, type="density", filter_dominated=False, bins=8)
+    heatmap, *lines = fig.data
+    assert heatmap.type == "heatmap"
+    assert np.array(heatmap.z).shape == (8, 8)
+    assert np.nansum(np.array(heatmap.z, dtype=float)) == len(X)
+    expected = mooplot.plot_pf(X, type="lines")
+    assert len(lines) == len(expected.data)
+    for line, front in zip(lines, expected.data):
+        # The extremes cover all the points, not only the fronts.
+        assert np.array_equal(line.x[1:-1], front.x[1:-1])
+        assert np.array_equal(line.y[1:-1], front.y[1:-1])
+    # With the default filtering, only the nondominated points are counted.
+    fig = mooplot.plot_pf(X, type="density", bins=(4, 2))
+    z = np.array(fig.data[0].z, dtype=float)
+    assert z.shape == (2, 4)
+    assert np.nansum(z) == len(mooplot.FrontSet(X).filter_dominated().points)
+
+    from mooplot.matplotlib import plot_pf
+
+    fig = plot_pf(X, type="density", filter_dominated=False, bins=8)
+    assert fig.axes[0].get_images()[0].get_array().sum() == len(X)
+    with pytest.raises(ValueError, match="2 objectives"):
+        mooplot.plot_pf(
+            moocore.get_dataset("spherical-250-10-3d.txt.xz"), type="d"
+        )
+
+
+def test_indicators():
+    """Indicators in legend labels and metadata match moocore."""
+    X = moocore.get_dataset("input1.dat")
+    ref = np.array([10.0, 10.0])
+    fig = mooplot.plot_pf(
+        X, type="lines", indicators=["hv", "IGD+"], reference_point=ref
+    )
+    sets, fronts = mooplot.FrontSet(X).filter_dominated().split()
+    reference_front = moocore.filter_dominated(X[:, :-1])
+    meta = fig.layout.meta["indicators"]
+    assert list(meta) == [str(s) for s in sets]
+    for s, front, trace in zip(sets, fronts, fig.data):
+        hv = moocore.hypervolume(front, ref=ref)
+        igd_plus = moocore.igd_plus(front, ref=reference_front)
+        assert meta[str(s)] == {"hv": hv, "igd+": igd_plus}
+        assert trace.name == f"{s} (HV: {hv:.4g}, IGD+: {igd_plus:.4g})"
+        assert trace.legendgroup == str(s)
+
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    fig = mooplot.plot_eaf(
+        {"A": eaf, "B": eaf}, indicators="hv", reference_point=ref
+    )
+    meta = fig.layout.meta["indicators"]
+    assert list(meta) == [
+        "A - 0",
+        "A - 50",
+        "A - 100",
+        "B - 0",
+        "B - 50",
+        "B - 100",
+    ]
+    assert meta["B - 50"]["hv"] == moocore.hypervolume(
+        eaf[eaf[:, 2] == 50, :2], ref=ref
+    )
+    assert fig.data[-1].name == f"B - 100 (HV: {meta['B - 100']['hv']:.4g})"
+
+    # The 3D plots name the traces "Set <set>".
+    rng = np.random.default_rng(1)
+    Y = np.column_stack([rng.random((20, 3)), np.repeat([1.0, 2.0], 10)])
+    fronts = mooplot.FrontSet(Y).filter_dominated().split()[1]
+    for type in ("points", "surface", "cube"):
+        fig = mooplot.plot_pf(
+            Y, type=type, indicators="hv", reference_point=[2, 2, 2]
+        )
+        prefix = "" if type == "points" else "Set "
+        assert [trace.name for trace in fig.data] == [
+            f"{prefix}{s} (HV: {moocore.hypervolume(f, ref=[2, 2, 2]):.4g})"
+            for s, f in zip([1, 2], fronts)
+        ]
+    fig = mooplot.plot_pf(
+        Y, type="cube", select_sets="best", reference_point=[2, 2, 2]
+    )
+    assert fig.data[0].name.startswith("best: Set ")
+
+    with pytest.raises(ValueError, match="reference_point"):
+        mooplot.plot_pf(X, indicators="hv")
+    with pytest.raises(ValueError, match="Unknown indicator"):
+        mooplot.plot_eaf(eaf, indicators=["r2"])
+
+
+def test_plot_pf_animation():
+    """Frames only update the fronts that changed."""
+    X = moocore.get_dataset("input1.dat")
+    rng = np.random.default_rng(1)
+    generation = rng.integers(0, 12, size=len(X))
+    data = np.column_stack([X[:, :-1], generation, X[:, -1]])
+    fig = mooplot.plot_pf_animation(
+        data, frame_column=-2, type="points", keyframe_interval=5
+    )
+    names = [frame.name for frame in fig.frames]
+    assert names == [str(g) for g in np.unique(generation)]
+    # Frames 0, 5 and 10 are keyframes.
+    assert [len(fig.frames[f].data) for f in (0, 5, 10)] == [10, 10, 10]
+    assert sum(len(frame.data) for frame in fig.frames) < 10 * len(names)
+
+    def expected(g):
+        # Fronts computed from scratch from the points up to generation g.
+        fronts = []
+        for s in np.unique(X[:, -1]):
+            rows = (X[:, -1] == s) & (generation <= g)
+            front = moocore.filter_dominated(X[rows, :-1])
+            fronts.append(front[np.lexsort(front.T[::-1])])
+        return fronts
+
+    def replay(frame_names):
+        state = [(trace.x, trace.y) for trace in fig.data]
+        for frame in fig.frames:
+            if frame.name in frame_names:
+                for i, trace in zip(frame.traces, frame.data):
+                    state[i] = (trace.x, trace.y)
+        return [np.column_stack(xy) for xy in state]
+
+    for f, step in enumerate(fig.layout.sliders[0].steps):
+        assert step.args[0][-1] == names[f]
+        assert step.args[0][0] == names[f - f % 5]
+        for state, front in zip(replay(step.args[0]), expected(int(names[f]))):
+            assert np.array_equal(state, front)
+
+    # The markers are the points and only the lines reach the extremes.
+    fig = mooplot.plot_pf_animation(
+        data, frame_column=-2, type="points,lines", keyframe_interval=5
+    )
+    assert len(fig.data) == 20
+    assert [trace.mode for trace in fig.data[:2]] == ["lines", "markers"]
+    for step in fig.layout.sliders[0].steps:
+        state = replay(step.args[0])
+        fronts = expected(int(step.args[0][-1]))
+        for line, markers, front in zip(state[::2], state[1::2], fronts):
+            assert np.array_equal(markers, front)
+            assert np.array_equal(line[1:-1], front)
+            assert len(line) == (len(front) + 2 if len(front) else 0)
+
+    fig = mooplot.plot_pf_animation(data, frame_column=2, type="lines")
+    assert fig.data[0].line.shape == "hv"
+    with pytest.raises(ValueError, match="set column"):
+        mooplot.plot_pf_animation(data, frame_column=3)
+
+
+def test_broadcast_style():
+    """Style arguments are expanded to one value per trace."""
+    from mooplot._utils import parse_2d_line_width, parse_line_dash
+    from mooplot.colour import parse_2d_colorway, parse_colorway
+
+    assert parse_line_dash(["dot", "dash"], 3, "solid") == [
+        "dot",
+        "dash",
+        "dot",
+    ]
+    assert parse_line_dash(None, 2, "solid") == ["solid", "solid"]
+    assert parse_2d_line_width(3, [1, 2], 2) == [[3], [3, 3]]
+    assert parse_2d_line_width([None, [1, 4]], [2, 3], 2) == [[2, 2], [1, 4, 1]]
+    red = parse_colorway("red", 1)[0]
+    assert parse_2d_colorway(["red", None], [["a"], ["blue"]], [1, 2]) == [
+        [red],
+        parse_colorway("blue", 2),
+    ]
+    # Cached results are not shared with the caller.
+    dashes = parse_line_dash("dot", 2, "solid")
+    dashes.append("dash")
+    assert parse_line_dash("dot", 2, "solid") == ["dot", "dot"]
+    with pytest.raises(ValueError, match="line dash"):
+        parse_line_dash(["dot", "zigzag"], 2, "solid")
+    with pytest.raises(ValueError, match="same length"):
+        parse_2d_line_width([1, 2, 3], [1, 1], 2)
+    with pytest.raises(TypeError):
+        parse_colorway(1.5, 2)
+    # True, 1 and 1.0 are equal but not cached as the same value.
+    from mooplot._utils import parse_line_width
+
+    assert parse_line_width(1, 2, None) == [1, 1]
+    assert parse_2d_line_width([[1]], [2], None) == [[1, 1]]
+    with pytest.raises(TypeError, match="number"):
+        parse_line_width(True, 2, None)
+    with pytest.raises(TypeError, match="number"):
+        parse_2d_line_width([[True]], [2], None)
+    width = parse_line_width(1.0, 2, None)
+    assert width == [1.0, 1.0] and isinstance(width[0], float)
+
+
+def test_cli(tmp_path, capsys):
+    import json
+    import subprocess
+    import sys
+    from mooplot._cli import main
+
+    path = str(moocore.get_dataset_path("input1.dat"))
+    status = main(
+        [
+            "eaf",
+            path,
+            str(moocore.get_dataset_path("wrots_l10w100_dat.xz")),
+            "--percentiles",
+            "0,50,100",
+            "-o",
+            str(tmp_path),
+            "-f",
+            "html,json,png",
+            "-j",
+            "0",
+        ]
+    )
+    assert status == 0
+    for stem in ("input1", "wrots_l10w100_dat"):
+        for ext in ("html", "json", "png"):
+            assert (tmp_path / f"{stem}.{ext}").stat().st_size > 0
+    assert (tmp_path / "plotly.min.js").exists()
+    fig = json.loads((tmp_path / "input1.json").read_text())
+    assert {trace["name"] for trace in fig["data"]} == {"0", "50", "100"}
+    assert "input1.dat: read" in capsys.readouterr().out
+
+    status = main(
+        ["pf", path, str(tmp_path / "missing.dat"), "-o", str(tmp_path), "-q"]
+    )
+    assert status == 1
+    assert "missing.dat" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(["pf", path, "-f", "gif"])
+
+    # The command line starts without importing plotting libraries.
+    code = "import sys, mooplot._cli; print('plotly' in sys.modules or 'pandas' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_figure_cache(tmp_path):
+    X = moocore.get_dataset("input1.dat")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    cache = mooplot.FigureCache(tmp_path)
+    fig = cache.plot_eaf(eaf, type="lines")
+    assert fig.to_json() == mooplot.plot_eaf(eaf, type="lines").to_json()
+    # Default arguments and equal copies of the data give the same key.
+    cached = cache.plot_eaf(eaf.copy(), type="lines", template="simple_white")
+    assert cached.to_json() == fig.to_json()
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.plot_eaf(eaf, type="lines", colorway=["red", "blue", "green"])
+    cache.plot_eaf(eaf, type="lines", title="EAF")
+    cache.plot_pf(X, type="lines")
+    cache.plot_pf(mooplot.FrontSet(X), type="lines")
+    assert (cache.hits, cache.misses) == (1, 5)
+    assert cache.report().startswith("1 hits, 5 misses (16.7% hit rate)")
+    # A cached figure can be modified without changing the cache.
+    cached.update_layout(title="Changed")
+    assert cache.plot_eaf(eaf, type="lines").layout.title.text != "Changed"
+
+    # The least recently used figures are evicted.
+    sizes = sorted(p.stat().st_size for p in tmp_path.iterdir())
+    cache = mooplot.FigureCache(tmp_path, max_size=sizes[-1] + sizes[-2])
+    cache.plot_pf(X, type="points")
+    assert cache.evictions > 0
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= cache.max_size
+    assert cache.plot_pf(X, type="points") is not None
+    assert cache.hits == 1
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(TypeError, match="cache key"):
+        cache.plot_pf(X, meta=object())
+
+
+@pytest.mark.parametrize("type", ["points", "lines", "fill"])
+def test_coord_dtype(type):
+    X = moocore.get_dataset("input1.dat")
+    fronts = mooplot.FrontSet(X)
+    assert fronts.astype(np.float64) is fronts
+    fronts32 = fronts.astype(np.float32)
+    assert fronts32.points.dtype == np.float32
+    assert fronts32.sets is fronts.sets and fronts32.offsets is fronts.offsets
+
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    for plot, data in ((mooplot.plot_pf, X), (mooplot.plot_eaf, eaf)):
+        fig64 = plot(data, type=type)
+        fig32 = plot(data, type=type, coord_dtype=np.float32)
+        assert len(fig32.data) == len(fig64.data)
+        for t32, t64 in zip(fig32.data, fig64.data):
+            for v32, v64 in ((t32.x, t64.x), (t32.y, t64.y)):
+                assert v32.dtype == np.float32
+                np.testing.assert_allclose(v32, v64, rtol=1e-6)
+
+
+def test_filter_dominated_n_jobs():
+    from mooplot._parallel import _get_mp_context, _parse_n_jobs
+
+    rng = np.random.default_rng(1)
+    sizes = rng.integers(1, 50, size=200)
+    data = np.column_stack(
+        [rng.random((sizes.sum(), 2)), np.repeat(np.arange(200), sizes)]
+    )
+    fronts = mooplot.FrontSet(data)
+    expected = fronts.filter_dominated(maximise=[True, False])
+    for n_jobs in (2, 3):
+        result = fronts.filter_dominated(maximise=[True, False], n_jobs=n_jobs)
+        np.testing.assert_array_equal(result.points, expected.points)
+        np.testing.assert_array_equal(result.offsets, expected.offsets)
+        np.testing.assert_array_equal(result.sets, expected.sets)
+    fig = mooplot.plot_pf(data, type="lines", n_jobs=2)
+    assert fig.to_json() == mooplot.plot_pf(data, type="lines").to_json()
+
+    assert _parse_n_jobs(None) == 1
+    assert _parse_n_jobs(-1) >= 1
+    # A single pool is kept, replaced when the number of workers changes.
+    from mooplot import _parallel
+
+    assert _get_mp_context().get_start_method() in ("forkserver", "spawn")
+    assert _parallel._executor_workers == 2
+    executor = _parallel._executor
+    fronts.filter_dominated(n_jobs=2)
+    assert _parallel._executor is executor
+    fronts.filter_dominated(n_jobs=3)
+    assert _parallel._executor is not executor
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+    _parallel._shutdown_executor()
+    assert _parallel._executor is None
+    result = fronts.filter_dominated(maximise=[True, False], n_jobs=2)
+    np.testing.assert_array_equal(result.points, expected.points)
+    with pytest.raises(ValueError, match="n_jobs"):
+        fronts.filter_dominated(n_jobs=0)
+
+
+@pytest.mark.parametrize("maximise", [False, [True, False]])
+def test_eaf_rays(maximise):
+    X = moocore.get_dataset("input1.dat")
+    data = moocore.eaf(X[:, :-1], X[:, -1])
+    sign = np.where(np.broadcast_to(maximise, 2), -1.0, 1.0)
+    data[:, :2] *= sign
+    eaf = mooplot.EAFData(data)
+    summary = eaf.rays(n_rays=16, maximise=maximise)
+    np.testing.assert_array_equal(summary.levels, eaf.levels)
+    assert summary.points.shape == (16 * len(eaf.levels), 2)
+    # Compare with the minimum over all points of the Chebyshev distance.
+    points = eaf.points * sign
+    ideal = points.min(axis=0)
+    scale = points.max(axis=0) - ideal
+    angles = np.pi / 2 * (15.5 - np.arange(16)) / 16
+    directions = np.column_stack([np.cos(angles), np.sin(angles)])
+    for level in eaf.levels:
+        scaled = (eaf[level] * sign - ideal) / scale
+        t = np.max(scaled / directions[:, None, :], axis=-1).min(axis=1)
+        expected = (ideal + t[:, None] * directions * scale) * sign
+        np.testing.assert_allclose(summary[level], expected)
+
+    fig = mooplot.plot_eaf(
+        data, type="lines", maximise=maximise, summarize="rays", n_rays=16
+    )
+    assert [len(trace.x) for trace in fig.data] == [18] * len(eaf.levels) + [2]
+    assert {trace.line.shape for trace in fig.data} == {"linear"}
+    # The indicators are computed from the attainment surfaces.
+    ref = np.where(sign > 0, 10.0, -10.0)
+    kwargs = dict(indicators="hv", reference_point=ref, maximise=maximise)
+    expected = mooplot.plot_eaf(data, percentiles=[50, 100], **kwargs)
+    fig = mooplot.plot_eaf(
+        data, percentiles=[50, 100], summarize="rays", n_rays=4, **kwargs
+    )
+    assert fig.layout.meta["indicators"] == expected.layout.meta["indicators"]
+    assert [t.name for t in fig.data] == [t.name for t in expected.data]
+    with pytest.raises(ValueError, match="summarize"):
+        mooplot.plot_eaf(data, summarize="median")
+    with pytest.raises(ValueError, match="ideal_point"):
+        eaf.rays(maximise=maximise, ideal_point=(ideal + 1) * sign)
+
+
+def test_select_sets():
+    X = moocore.get_dataset("input1.dat")
+    sets = np.unique(X[:, -1])
+    hv = np.array(
+        [moocore.hypervolume(X[X[:, -1] == s, :2], ref=[10, 10]) for s in sets]
+    )
+    order = sets[np.argsort(hv, kind="stable")]
+    fig = mooplot.plot_pf(
+        X,
+        type="lines",
+        select_sets="quantiles:[0, 0.5, 1]",
+        reference_point=[10, 10],
+    )
+    expected = {"q0": order[0], "q0.5": order[5], "q1": order[-1]}
+    assert fig.layout.meta["select_sets"] == expected
+    assert sorted(trace.name for trace in fig.data) == sorted(
+        f"{label}: {s:g}" for label, s in expected.items()
+    )
+    # Lower is better for IGD+.
+    fig = mooplot.plot_pf(X, type="points", select_sets="best,worst", by="igd+")
+    igd_plus = np.array(
+        [
+            moocore.igd_plus(
+                X[X[:, -1] == s, :2], ref=moocore.filter_dominated(X[:, :2])
+            )
+            for s in sets
+        ]
+    )
+    assert fig.layout.meta["select_sets"] == {
+        "best": sets[np.argmin(igd_plus)],
+        "worst": sets[np.argmax(igd_plus)],
+    }
+    for select_sets in ("mean", "quantiles:[0.5, 2]", "quantiles:a"):
+        with pytest.raises(ValueError, match="select_sets"):
+            mooplot.plot_pf(X, select_sets=select_sets)
+
+
+@pytest.mark.parametrize("maximise", [False, [True, False]])
+def test_reference_front(maximise):
+    from mooplot._reference import _ReferenceIndex
+
+    rng = np.random.default_rng(3)
+    sign = np.where(np.broadcast_to(maximise, 2), -1.0, 1.0)
+    t = np.sort(rng.random(40))
+    reference = np.column_stack([t, 1 - np.sqrt(t)]) * sign
+    sizes = rng.integers(1, 30, size=20)
+    data = np.column_stack(
+        [rng.random((sizes.sum(), 2)) * sign, np.repeat(np.arange(20), sizes)]
+    )
+    data[:5, :2] = reference[:5]
+    index = _ReferenceIndex(reference, np.broadcast_to(maximise, 2))
+    points = data[:, :2] * sign
+    # Compare the bisection with the comparison of all pairs.
+    result = index._query_2d(points)
+    expected = index._query_chunks(points)
+    np.testing.assert_allclose(result[0], expected[0])
+    np.testing.assert_allclose(result[1], expected[1])
+    np.testing.assert_array_equal(result[2] < 0, expected[2] < 0)
+    diff = points[:, None, :] - reference * sign
+    np.testing.assert_allclose(
+        result[0], np.sqrt((diff**2).sum(axis=-1)).min(axis=1)
+    )
+    np.testing.assert_allclose(result[1], diff.max(axis=-1).min(axis=1))
+    np.testing.assert_array_equal(result[1][:5], 0)
+
+    # Only the markers, which are the points of the sets, are annotated and
+    # not the lines, which also contain the extremes.
+    fig = mooplot.plot_pf(
+        data, type="points,lines", maximise=maximise, reference=reference
+    )
+    assert fig.data[-1].name == "Reference"
+    assert fig.data[-1].customdata is None
+    lines = [trace for trace in fig.data[:-1] if trace.mode == "lines"]
+    markers = [trace for trace in fig.data[:-1] if trace.mode == "markers"]
+    assert len(lines) == len(markers) == 20
+    assert all(trace.customdata is None for trace in lines)
+    xy = np.concatenate([np.column_stack([t.x, t.y]) for t in markers])
+    nondominated = mooplot.FrontSet(data).filter_dominated(maximise=maximise)
+    np.testing.assert_array_equal(
+        np.sort(xy, axis=0), np.sort(nondominated.points, axis=0)
+    )
+    for trace in markers:
+        assert "Distance to reference" in trace.hovertemplate
+        assert "normalized" not in trace.hovertemplate
+        xy = np.column_stack([trace.x, trace.y]) * sign
+        diff = xy[:, None, :] - reference * sign
+        np.testing.assert_allclose(
+            trace.customdata[:, 0], np.sqrt((diff**2).sum(axis=-1)).min(axis=1)
+        )
+        dominated = trace.customdata[:, 2:] * sign <= xy
+        assert np.all(dominated | np.isnan(trace.customdata[:, 2:]))
+
+    fig = mooplot.plot_pf(
+        data, maximise=maximise, reference=reference, indicators="igd+"
+    )
+    front = data[data[:, -1] == 0, :2]
+    front = front[moocore.is_nondominated(front, maximise=maximise)]
+    assert fig.layout.meta["indicators"]["0"]["igd+"] == pytest.approx(
+        moocore.igd_plus(front, ref=reference, maximise=maximise)
+    )
+    with pytest.raises(ValueError, match="reference"):
+        mooplot.plot_pf(data, reference=np.ones((3, 3)))
+
+    fig = mooplot.plot_pf(data, type="lines", reference=reference)
+    assert all(trace.customdata is None for trace in fig.data)
+    fig = mooplot.plot_pf(
+        data, type="points", reference=reference, normalize="minmax"
+    )
+    assert "Distance to reference (normalized)" in fig.data[0].hovertemplate
+
+
+def test_normalize():
+    X = moocore.get_dataset("input1.dat")
+    X[:, 1] *= 1000
+    original = X.copy()
+    fig = mooplot.plot_pf(X, type="points", normalize="minmax")
+    np.testing.assert_array_equal(X, original)
+    points = np.concatenate([np.column_stack([t.x, t.y]) for t in fig.data])
+    np.testing.assert_allclose(points.min(axis=0), 0, atol=1e-12)
+    np.testing.assert_allclose(points.max(axis=0), 1)
+    expected = mooplot.plot_pf(X, type="points")
+    front = np.concatenate([np.column_stack([t.x, t.y]) for t in expected.data])
+    lower, upper = np.array(list(fig.layout.meta["normalize"].values()))
+    np.testing.assert_allclose(points * (upper - lower) + lower, front)
+    # The tick labels show the original units.
+    yaxis = fig.layout.yaxis
+    np.testing.assert_allclose(
+        [float(t) for t in yaxis.ticktext],
+        np.asarray(yaxis.tickvals) * (upper[1] - lower[1]) + lower[1],
+    )
+    assert float(yaxis.ticktext[1]) - float(yaxis.ticktext[0]) == 2000
+
+    # The EAFs of all algorithms share the bounds, also when given as EAFData,
+    # which is not modified.
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    eaf_data = mooplot.EAFData(eaf.copy())
+    eaf_points = eaf_data.points.copy()
+    eaf_b = eaf.copy()
+    eaf_b[:, :2] *= 2
+    fig = mooplot.plot_eaf(
+        {"A": eaf_data, "B": eaf_b}, type="points", normalize="ideal-nadir"
+    )
+    np.testing.assert_array_equal(eaf_data.points, eaf_points)
+    front = moocore.filter_dominated(np.concatenate([eaf[:, :2], eaf_b[:, :2]]))
+    assert fig.layout.meta["normalize"] == dict(
+        lower=front.min(axis=0).tolist(), upper=front.max(axis=0).tolist()
+    )
+    fig = mooplot.plot_eaf(eaf, normalize=[[0, 0], [10, 10000]])
+    assert fig.layout.meta["normalize"]["upper"] == [10, 10000]
+    for normalize in ("max", [[0, 0], [0, 1]], [0, 1]):
+        with pytest.raises(ValueError, match="normalize"):
+            mooplot.plot_pf(X, normalize=normalize)
+
+
+def test_log_axes():
+    X = moocore.get_dataset("input1.dat")
+    fig = mooplot.plot_pf(X, type="lines", log_x=True, log_y=True)
+    assert fig.layout.xaxis.type == fig.layout.yaxis.type == "log"
+    # The extremes are computed from the logarithms of the values.
+    points = np.concatenate(
+        [moocore.filter_dominated(X[X[:, 2] == s, :2]) for s in range(1, 11)]
+    )
+    lower, upper = np.log10(points.min(axis=0)), np.log10(points.max(axis=0))
+    worst = 10 ** (upper + 0.05 * (upper - lower))
+    for trace in fig.data:
+        assert np.min(trace.x) > 0 and np.min(trace.y) > 0
+        assert trace.x[-1] == pytest.approx(worst[0])
+        assert trace.y[0] == pytest.approx(worst[1])
+
+    fig = mooplot.plot_pf(
+        X, type="density", filter_dominated=False, log_x=True, bins=10
+    )
+    edges = np.asarray(fig.data[0].x)
+    assert len(edges) == 11
+    np.testing.assert_allclose(
+        np.diff(np.log10(edges)), np.log10(edges[1] / edges[0])
+    )
+    assert fig.data[0].y is None and fig.data[0].dy is not None
+
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    fig = mooplot.plot_eaf(eaf, type="lines", summarize="rays", log_y=True)
+    logged = eaf.copy()
+    logged[:, 1] = np.log10(logged[:, 1])
+    rays = mooplot.EAFData(logged).rays()
+    np.testing.assert_allclose(fig.data[0].x[1:-1], rays[0][:, 0])
+    np.testing.assert_allclose(fig.data[0].y[1:-1], 10 ** rays[0][:, 1])
+    assert fig.layout.yaxis.type == "log" and fig.layout.xaxis.type is None
+
+    X[5, 1] = 0
+    with pytest.raises(ValueError, match="log_y"):
+        mooplot.plot_pf(X, filter_dominated=False, log_y=True)
+    with pytest.raises(ValueError, match="log_x"):
+        mooplot.plot_eaf(eaf, log_x=True, reference_point=[-1, 10])
+    with pytest.raises(ValueError, match="normalize"):
+        mooplot.plot_eaf(eaf, log_x=True, normalize="minmax")
+
+
+def test_report(tmp_path):
+    import json
+    import re
+
+    X = moocore.get_dataset("input1.dat")
+    eaf = moocore.eaf(X[:, :-1], X[:, -1], percentiles=[0, 50, 100])
+    figures = [mooplot.plot_eaf(eaf, type=t) for t in ("fill", "lines")]
+    figures.append(mooplot.plot_pf(X, type="lines", title="</script>"))
+    page = mooplot.report(
+        [("EAF", figures[:2]), (None, figures[2])],
+        filename=tmp_path / "report.html",
+        include_plotlyjs="directory",
+    )
+    assert (tmp_path / "report.html").read_text(encoding="utf-8") == page
+    assert (tmp_path / "plotly.min.js").stat().st_size > 0
+    assert page.count('src="plotly.min.js"') == 1
+    assert page.count("<h2>") == 1
+    scripts = dict(
+        re.findall(
+            r'<script type="application/json" id="([^"]+)">(.*?)</script>',
+            page,
+            re.S,
+        )
+    )
+    # Each distinct template is stored once and the figures refer to it.
+    shared = json.loads(scripts.pop("mooplot-shared"))
+    assert len(shared) == 2
+    assert len(scripts) == 3
+    for figure, text in zip(figures, scripts.values()):
+        stored = json.loads(text)
+        assert stored["layout"]["template"] in ({"_shared": 0}, {"_shared": 1})
+        stored["layout"]["template"] = shared[
+            stored["layout"]["template"]["_shared"]
+        ]
+        assert stored == json.loads(figure.to_json())
+
+    # The frames of animations are kept.
+    rng = np.random.default_rng(1)
+    data = np.column_stack([X[:, :-1], rng.integers(0, 3, len(X)), X[:, -1]])
+    animation = mooplot.plot_pf_animation(data, frame_column=2)
+    page = mooplot.report({"Animation": animation}, include_plotlyjs=False)
+    (text,) = re.findall(
+        r'<script type="application/json" id="mooplot-figure-0">(.*?)</script>',
+        page,
+        re.S,
+    )
+    stored = json.loads(text)
+    assert stored["frames"] == json.loads(animation.to_json())["frames"]
+    assert "Plotly.newPlot(div, figure)" in page
+    assert "frames" not in json.loads(scripts["mooplot-figure-0"])
+
+    page = mooplot.report({"Inline": figures[0]})
+    assert page.count(mooplot._report.get_plotlyjs()[:100]) == 1
+    with pytest.raises(ValueError, match="include_plotlyjs"):
+        mooplot.report({}, include_plotlyjs="plotly")